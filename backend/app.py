@@ -1,17 +1,27 @@
 import os
-from flask import Flask, send_from_directory
+from flask import Flask, current_app
 from flask_cors import CORS
 from backend.config import config
 from backend.extensions import db, migrate, limiter
 
 
-def create_app(config_name=None):
-    """Flask application factory."""
+def create_app(config_name=None, config_overrides=None):
+    """Flask application factory.
+
+    config_overrides (a dict) is applied on top of the config class, before
+    any extension reads it.
+    """
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'development')
 
-    app = Flask(__name__, static_folder='static', static_url_path='')
+    # The React build in static/ is served by serve_react, not Flask's static route
+    app = Flask(__name__, static_folder=None)
     app.config.from_object(config[config_name])
+    app.config.update(config_overrides or {})
+
+    # orjson-backed jsonify that encodes Decimal, date and datetime values itself
+    from backend.utils.json_provider import JSONProvider
+    app.json = JSONProvider(app)
 
     # Initialize CORS
     # Get allowed origins from environment or use defaults
@@ -21,14 +31,33 @@ def create_app(config_name=None):
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
+
+    # Request and SQL instrumentation; its hooks go first so request timings
+    # include the rate limit check and SQLite's write lock wait
+    if app.config['METRICS_ENABLED']:
+        from backend.middleware.metrics import init_metrics
+        with app.app_context():
+            init_metrics(app, db.engine)
+
     limiter.init_app(app)
 
+    # WAL, pragmas and write serialization for SQLite databases
+    if app.config['SQLITE_PROFILE_ENABLED'] and (app.config['SQLALCHEMY_DATABASE_URI'] or '').startswith('sqlite'):
+        from backend.utils.sqlite_profile import init_sqlite_profile
+        init_sqlite_profile(app)
+
     # Import models (so migrations detect them)
     with app.app_context():
-        from backend.models import client, project, work_session, time_allocation, login_attempt
+        from backend.models import (
+            user, client, project, work_session, time_allocation, login_attempt, daily_project_hours, catalog_version
+        )
+
+    # Scope every query on user-owned tables to the logged-in user
+    from backend.utils.tenancy import init_tenancy
+    init_tenancy()
 
     # Register blueprints
-    from backend.routes import auth, clients, projects, sessions, allocations, reports, calendar
+    from backend.routes import auth, clients, projects, sessions, allocations, reports, calendar, exports, imports, stream
     app.register_blueprint(auth.bp)
     app.register_blueprint(clients.bp)
     app.register_blueprint(projects.bp)
@@ -36,14 +65,29 @@ def create_app(config_name=None):
     app.register_blueprint(allocations.bp)
     app.register_blueprint(reports.bp)
     app.register_blueprint(calendar.bp)
+    app.register_blueprint(exports.bp)
+    app.register_blueprint(imports.bp)
+    app.register_blueprint(stream.bp)
+
+    if app.config['METRICS_ENABLED']:
+        from backend.routes import metrics
+        app.register_blueprint(metrics.bp)
+
+    # Register CLI commands
+    from backend.cli import register_commands
+    register_commands(app)
 
     # Serve React app for non-API routes
+    from backend.middleware.static_assets import init_static_assets
+    init_static_assets(app, os.path.join(app.root_path, 'static'))
+
+    # Static files skip the rate limiter: no limiter storage hit per asset, and
+    # page loads no longer use up the per-IP API budget
     @app.route('/', defaults={'path': ''})
     @app.route('/<path:path>')
+    @limiter.exempt
     def serve_react(path):
-        if path and os.path.exists(os.path.join(app.static_folder, path)):
-            return send_from_directory(app.static_folder, path)
-        return send_from_directory(app.static_folder, 'index.html')
+        return current_app.extensions['static_assets'].serve(path)
 
     return app
 
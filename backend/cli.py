@@ -0,0 +1,149 @@
+"""
+Flask CLI commands.
+
+Usage:
+    flask rollup rebuild    # recompute daily_project_hours from time_allocations
+    flask rollup verify     # report rows where the rollup disagrees with raw data
+    flask import-timesheet FILE --format toggl|harvest|ics [--user NAME] [--dry-run]
+    flask prune-login-attempts  # apply login_attempts audit log retention now
+    flask users create NAME     # add a user (prompts for the password)
+    flask users set-password NAME
+    flask users deactivate NAME
+    flask users list
+"""
+import sys
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from backend.extensions import db
+from backend.models.user import User
+from backend.services.auth_service import AuthService
+from backend.services.import_service import ImportService, ImportConflictError, IMPORT_FORMATS
+from backend.services.rollup_service import RollupService
+from backend.utils.tenancy import as_owner
+
+rollup_cli = AppGroup('rollup', help='Maintain the daily_project_hours rollup table.')
+users_cli = AppGroup('users', help='Manage the users who can log in.')
+
+
+def get_user_or_exit(username):
+    """Look up a user by name, exiting with an error if there is none."""
+    user = User.query.filter_by(username=AuthService.normalize_username(username)).first()
+    if user is None:
+        click.echo(f'No user named {username}', err=True)
+        sys.exit(1)
+    return user
+
+
+def prompt_password_hash():
+    """Prompt for a new password twice and return its bcrypt hash."""
+    password = click.prompt('Password', hide_input=True, confirmation_prompt=True)
+    if len(password) < 8:
+        click.echo('Password should be at least 8 characters long.', err=True)
+        sys.exit(1)
+    return AuthService.hash_password(password)
+
+
+@rollup_cli.command('rebuild')
+def rollup_rebuild():
+    """Recompute the rollup table from scratch."""
+    rows = RollupService.rebuild()
+    click.echo(f'Rebuilt daily_project_hours: {rows} rows')
+
+
+@rollup_cli.command('verify')
+def rollup_verify():
+    """Check the rollup table against time_allocations."""
+    mismatches = RollupService.verify()
+    if not mismatches:
+        click.echo('daily_project_hours is consistent with time_allocations')
+        return
+
+    for mismatch in mismatches:
+        click.echo(
+            f"{mismatch['date']} {mismatch['project_id']}: "
+            f"expected {mismatch['expected_hours']}h, rollup has {mismatch['rollup_hours']}h"
+        )
+    click.echo(f'{len(mismatches)} mismatched rows. Run "flask rollup rebuild" to repair.', err=True)
+    sys.exit(1)
+
+
+@click.command('import-timesheet')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'source_format', type=click.Choice(IMPORT_FORMATS), required=True)
+@click.option('--user', 'username', help='User to import for (default: DEFAULT_USERNAME).')
+@click.option('--dry-run', is_flag=True, help='Validate and report conflicts without writing.')
+@with_appcontext
+def import_timesheet(path, source_format, username, dry_run):
+    """Bulk-import sessions and allocations from a timesheet export."""
+    user = get_user_or_exit(username or current_app.config['DEFAULT_USERNAME'])
+    with open(path, encoding='utf-8-sig', newline='') as lines, as_owner(user.id):
+        try:
+            report = ImportService(source_format, dry_run=dry_run).run(lines)
+        except ImportConflictError as error:
+            click.echo(str(error), err=True)
+            sys.exit(1)
+
+    for conflict in report['conflicts']:
+        click.echo(f"line {conflict['line']}: {conflict['error']}")
+    verb = 'Would create' if dry_run else 'Created'
+    click.echo(
+        f"Read {report['rows_read']} rows. {verb} {report['sessions_created']} sessions and "
+        f"{report['allocations_created']} allocations. {report['conflict_count']} conflicts."
+    )
+
+
+@click.command('prune-login-attempts')
+@with_appcontext
+def prune_login_attempts():
+    """Delete login_attempts audit rows past retention or over the row cap."""
+    remaining = AuthService.prune_audit_log()
+    click.echo(f'login_attempts now holds {remaining} rows')
+
+
+@users_cli.command('create')
+@click.argument('username')
+@click.option('--password-hash', help='Existing bcrypt hash (e.g. from scripts/generate_password_hash.py) instead of a prompt.')
+def users_create(username, password_hash):
+    """Add a user."""
+    if User.query.filter_by(username=AuthService.normalize_username(username)).first():
+        click.echo(f'User {username} already exists', err=True)
+        sys.exit(1)
+    user = AuthService.create_user(username, password_hash or prompt_password_hash())
+    db.session.commit()
+    click.echo(f'Created user {user.username} ({user.id})')
+
+
+@users_cli.command('set-password')
+@click.argument('username')
+def users_set_password(username):
+    """Change a user's password."""
+    user = get_user_or_exit(username)
+    user.password_hash = prompt_password_hash()
+    db.session.commit()
+    click.echo(f'Password changed for {user.username}')
+
+
+@users_cli.command('deactivate')
+@click.argument('username')
+def users_deactivate(username):
+    """Stop a user from logging in; their data is kept."""
+    user = get_user_or_exit(username)
+    user.is_active = False
+    db.session.commit()
+    click.echo(f'Deactivated {user.username}')
+
+
+@users_cli.command('list')
+def users_list():
+    """List users."""
+    for user in User.query.order_by(User.username):
+        click.echo(f"{user.username}\t{user.id}\t{'active' if user.is_active else 'inactive'}")
+
+
+def register_commands(app):
+    """Register CLI command groups on the app."""
+    app.cli.add_command(rollup_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(import_timesheet)
+    app.cli.add_command(prune_login_attempts)
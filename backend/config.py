@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,7 +10,9 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    PASSWORD_HASH = os.environ.get('PASSWORD_HASH')
+    # Logins without a username sign in as this user. The migration that adds
+    # users creates it with the PASSWORD_HASH environment variable.
+    DEFAULT_USERNAME = os.environ.get('DEFAULT_USERNAME', 'admin')
 
     # Session configuration
     SESSION_COOKIE_SECURE = os.environ.get('FLASK_ENV') == 'production'
@@ -17,13 +20,53 @@ class Config:
     SESSION_COOKIE_SAMESITE = 'Lax'
     PERMANENT_SESSION_LIFETIME = 60 * 60 * 24 * 7  # 7 days
 
-    # Rate limiting
-    RATELIMIT_STORAGE_URI = os.environ.get('DATABASE_URL')
+    # SQLite engine profile (ignored for other databases)
+    SQLITE_PROFILE_ENABLED = os.environ.get('SQLITE_PROFILE_ENABLED', 'true').lower() == 'true'
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_CACHE_SIZE_KIB = int(os.environ.get('SQLITE_CACHE_SIZE_KIB', 65536))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+
+    # Rate limiting: a limits storage URI. memory:// keeps counters per process;
+    # start.sh shares a sqlite://FILE between the gunicorn workers (or use redis://...)
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI', 'memory://')
+
+    # Login throttling counters and login_attempts audit log retention
+    LOGIN_THROTTLE_STORAGE_URI = os.environ.get('LOGIN_THROTTLE_STORAGE_URI', RATELIMIT_STORAGE_URI)
+    LOGIN_AUDIT_RETENTION_DAYS = int(os.environ.get('LOGIN_AUDIT_RETENTION_DAYS', 90))
+    LOGIN_AUDIT_MAX_ROWS = int(os.environ.get('LOGIN_AUDIT_MAX_ROWS', 100000))
+
+    # bcrypt runs on this many threads per worker; logins beyond workers + queue get 429.
+    # The queue lets simultaneous logins wait their turn; by default it has a slot per
+    # gunicorn thread (THREADS, as start.sh passes it), and at least 4
+    PASSWORD_VERIFY_WORKERS = int(os.environ.get('PASSWORD_VERIFY_WORKERS', 1))
+    PASSWORD_VERIFY_QUEUE_SIZE = int(os.environ.get(
+        'PASSWORD_VERIFY_QUEUE_SIZE', max(4, int(os.environ.get('THREADS', 2)))
+    ))
+
+    # Live updates (/api/stream): a memory:// or sqlite://FILE channel shared by all workers
+    EVENT_CHANNEL_URI = os.environ.get(
+        'EVENT_CHANNEL_URI',
+        'sqlite:///' + os.path.join(tempfile.gettempdir(), 'time-tracker-events.db')
+    )
+    # Each open /api/stream holds its connection; only workers that park it cheaply
+    # (gevent, or the threaded dev server) should serve it. start.sh turns it off for
+    # other gunicorn worker classes, and the frontend then polls instead.
+    STREAM_ENABLED = os.environ.get('STREAM_ENABLED', 'true').lower() == 'true'
+    STREAM_HEARTBEAT_SECONDS = int(os.environ.get('STREAM_HEARTBEAT_SECONDS', 15))
+    STREAM_MAX_SECONDS = int(os.environ.get('STREAM_MAX_SECONDS', 600))
+
+    # Encode Decimal values (money, hours) as exact strings instead of JSON numbers
+    JSON_DECIMAL_AS_STRING = os.environ.get('JSON_DECIMAL_AS_STRING', 'false').lower() == 'true'
+
+    # Metrics (/metrics) and slow-query logging
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))
 
     @staticmethod
     def validate():
         """Validate required configuration."""
-        required = ['SECRET_KEY', 'DATABASE_URL', 'PASSWORD_HASH']
+        required = ['SECRET_KEY', 'DATABASE_URL']
         missing = [key for key in required if not os.environ.get(key)]
         if missing:
             raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
@@ -2,11 +2,12 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+import backend.utils.limiter_storage  # noqa: F401 - registers the sqlite:// limiter storage
 
 db = SQLAlchemy()
 migrate = Migrate()
+# Storage comes from RATELIMIT_STORAGE_URI; start.sh points it at a file all workers share
 limiter = Limiter(
     key_func=get_remote_address,
-    default_limits=["10000 per day", "1000 per hour"],
-    storage_uri="memory://"
+    default_limits=["10000 per day", "1000 per hour"]
 )
@@ -0,0 +1,44 @@
+"""
+Gunicorn hooks, loaded by start.sh with --config python:backend.gunicorn_conf.
+
+Workers write metrics to PROMETHEUS_MULTIPROC_DIR; a dead worker's live
+samples must be dropped so /metrics keeps aggregating only running workers.
+
+gevent workers only yield on sockets gevent has patched. psycopg2 talks to
+PostgreSQL from C, so each gevent worker installs a wait callback that makes
+it wait on the gevent hub instead of blocking every greenlet on the worker.
+"""
+from prometheus_client import multiprocess
+
+
+def make_psycopg2_cooperative():
+    """Make psycopg2 wait for the server through gevent (as psycogreen does)."""
+    try:
+        import psycopg2
+        from psycopg2 import extensions
+    except ImportError:
+        return
+    from gevent.socket import wait_read, wait_write
+
+    def wait_callback(connection, timeout=None):
+        while True:
+            state = connection.poll()
+            if state == extensions.POLL_OK:
+                return
+            if state == extensions.POLL_READ:
+                wait_read(connection.fileno(), timeout=timeout)
+            elif state == extensions.POLL_WRITE:
+                wait_write(connection.fileno(), timeout=timeout)
+            else:
+                raise psycopg2.OperationalError(f'Bad result from poll: {state!r}')
+
+    extensions.set_wait_callback(wait_callback)
+
+
+def post_fork(server, worker):
+    if server.cfg.worker_class_str == 'gevent':
+        make_psycopg2_cooperative()
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,12 +1,23 @@
 from functools import wraps
-from flask import session, jsonify
+from flask import g, session, jsonify
+from backend.services.auth_service import AuthService
 
 
 def login_required(f):
-    """Decorator to require authentication for routes."""
+    """Decorator to require authentication for routes.
+
+    The session's user must still exist and be active, so deactivating a
+    user locks out their existing sessions. Scopes the request's queries to
+    the logged-in user (see backend.utils.tenancy).
+    """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not session.get('authenticated'):
+        user_id = session.get('user_id')
+        if not user_id:
+            return jsonify({'error': 'Authentication required'}), 401
+        if not AuthService.is_active_user(user_id):
+            session.clear()
             return jsonify({'error': 'Authentication required'}), 401
+        g.owner_id = user_id
         return f(*args, **kwargs)
     return decorated_function
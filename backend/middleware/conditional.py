@@ -0,0 +1,28 @@
+import hashlib
+from flask import request, make_response
+
+
+def make_etag(*parts) -> str:
+    """Build an ETag value from version parts (counts, timestamps, ...)."""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def is_not_modified(etag: str) -> bool:
+    """Check whether the request's If-None-Match already holds this ETag."""
+    return request.if_none_match.contains(etag)
+
+
+def not_modified(etag: str):
+    """Build an empty 304 response carrying the ETag."""
+    response = make_response('', 304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def with_etag(rv, etag: str):
+    """Attach an ETag to a view return value and require revalidation on reuse."""
+    response = make_response(rv)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
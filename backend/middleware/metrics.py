@@ -0,0 +1,110 @@
+"""
+Request and SQL instrumentation exposed in the Prometheus text format.
+
+Every request records its latency, response size, SQL statement count and
+total SQL time, labelled by endpoint (blueprint.view). Statements slower than
+SLOW_QUERY_THRESHOLD_MS are logged.
+
+Under gunicorn, set PROMETHEUS_MULTIPROC_DIR (start.sh does) so each worker
+writes its samples there and /metrics aggregates all workers.
+"""
+import logging
+import os
+import time
+
+from flask import g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency until the response is returned',
+    ['endpoint', 'method', 'status'], buckets=LATENCY_BUCKETS
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Response body size (responses with a known length)',
+    ['endpoint', 'method'], buckets=SIZE_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_sql_queries', 'SQL statements executed per request',
+    ['endpoint', 'method'], buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_SQL_TIME = Histogram(
+    'http_request_sql_duration_seconds', 'Total SQL execution time per request',
+    ['endpoint', 'method'], buckets=LATENCY_BUCKETS
+)
+SLOW_QUERIES = Counter(
+    'sql_slow_queries_total', 'SQL statements slower than SLOW_QUERY_THRESHOLD_MS',
+    ['endpoint']
+)
+
+
+def endpoint_label():
+    """Label for the current request: the matched endpoint, or 'unmatched'."""
+    if has_request_context() and request.endpoint:
+        return request.endpoint
+    return 'unmatched' if has_request_context() else 'none'
+
+
+def init_metrics(app, engine):
+    """Register request hooks on app and statement timing on engine."""
+    threshold = app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_start'] = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start']
+        endpoint = endpoint_label()
+        if has_request_context() and 'sql_queries' in g:
+            g.sql_queries += 1
+            g.sql_seconds += elapsed
+        if elapsed >= threshold:
+            SLOW_QUERIES.labels(endpoint).inc()
+            logger.warning(
+                'Slow query (%.1f ms) in %s: %s',
+                elapsed * 1000, endpoint, ' '.join(statement.split())[:1000]
+            )
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        g.sql_queries = 0
+        g.sql_seconds = 0.0
+
+    @app.after_request
+    def record_request_metrics(response):
+        if 'request_started' not in g:
+            return response
+        endpoint = endpoint_label()
+        method = request.method
+        REQUEST_LATENCY.labels(endpoint, method, response.status_code).observe(
+            time.perf_counter() - g.request_started
+        )
+        # Streamed responses (exports) have no length and keep querying while streaming
+        if response.content_length is not None:
+            RESPONSE_SIZE.labels(endpoint, method).observe(response.content_length)
+        REQUEST_QUERIES.labels(endpoint, method).observe(g.sql_queries)
+        REQUEST_SQL_TIME.labels(endpoint, method).observe(g.sql_seconds)
+        return response
+
+
+def render_metrics():
+    """Render all metrics, aggregated across workers in multiprocess mode."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,122 @@
+"""
+Static file serving for the React build.
+
+The static folder is indexed once at startup. Each file's content type,
+ETag, Cache-Control and precompressed .br/.gz variants (written next to it
+by the frontend build) are resolved up front and small files are held in
+memory, so serving a request never stats or searches the filesystem.
+
+Vite's content-hashed files under assets/ are cached by browsers for a
+year. Everything else, index.html included, is revalidated with its ETag.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+from flask import Response, abort, request
+from werkzeug.utils import get_content_type
+from werkzeug.wsgi import wrap_file
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# Vite emits assets/<name>-<hash>.<ext>; the hash changes whenever the content does
+HASHED_ASSET = re.compile(r'^assets/.+-[A-Za-z0-9_-]{8,}\.\w+$')
+
+# Preferred first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+# Larger files are streamed from disk instead of kept in every worker's memory
+INLINE_MAX_BYTES = 1024 * 1024
+
+
+def _load(path):
+    """Return (bytes or path, size) for a file, reading it if it is small enough to inline."""
+    size = os.path.getsize(path)
+    if size > INLINE_MAX_BYTES:
+        return path, size
+    with open(path, 'rb') as f:
+        return f.read(), size
+
+
+def _digest(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class StaticFile:
+    """An indexed file with its precompressed variants."""
+
+    def __init__(self, path, relative):
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.content_type = get_content_type(mimetype, 'utf-8')
+        self.cache_control = IMMUTABLE if HASHED_ASSET.match(relative) else REVALIDATE
+        self.etag = _digest(path)
+        self.variants = {None: _load(path)}
+        for encoding, suffix in ENCODINGS:
+            if os.path.isfile(path + suffix):
+                self.variants[encoding] = _load(path + suffix)
+
+    def negotiate(self):
+        """Pick the best variant the client accepts (None for identity)."""
+        for encoding, _ in ENCODINGS:
+            if encoding in self.variants and request.accept_encodings[encoding] > 0:
+                return encoding
+        return None
+
+    def response(self):
+        encoding = self.negotiate()
+        body, size = self.variants[encoding]
+        # Each representation needs its own strong ETag
+        etag = self.etag if encoding is None else f'{self.etag}-{encoding}'
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        elif isinstance(body, bytes):
+            response = Response(body, content_type=self.content_type)
+        else:
+            response = Response(wrap_file(request.environ, open(body, 'rb')),
+                                content_type=self.content_type, direct_passthrough=True)
+            response.content_length = size
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = self.cache_control
+        if encoding:
+            response.content_encoding = encoding
+        if len(self.variants) > 1:
+            response.vary.add('Accept-Encoding')
+        return response
+
+
+class StaticAssets:
+    """In-memory index of the static folder."""
+
+    def __init__(self, folder):
+        self.files = {}
+        if os.path.isdir(folder):
+            for root, _, names in os.walk(folder):
+                for name in names:
+                    path = os.path.join(root, name)
+                    if any(name.endswith(suffix) and os.path.isfile(path[:-len(suffix)]) for _, suffix in ENCODINGS):
+                        continue  # A variant, served through its original
+                    relative = os.path.relpath(path, folder).replace(os.sep, '/')
+                    self.files[relative] = StaticFile(path, relative)
+        self.index = self.files.get('index.html')
+
+    def serve(self, path):
+        """Serve a static file, or index.html for client-side routes."""
+        static_file = self.files.get(path)
+        if static_file is None:
+            # A missing hashed asset is a stale reference, not a page
+            if path.startswith('assets/') or self.index is None:
+                abort(404)
+            static_file = self.index
+        return static_file.response()
+
+
+def init_static_assets(app, folder):
+    """Index the static folder for serve_react."""
+    app.extensions['static_assets'] = StaticAssets(folder)
@@ -1,7 +1,10 @@
+from backend.models.user import User
 from backend.models.client import Client
 from backend.models.project import Project
 from backend.models.work_session import WorkSession
 from backend.models.time_allocation import TimeAllocation
 from backend.models.login_attempt import LoginAttempt
+from backend.models.daily_project_hours import DailyProjectHours
+from backend.models.catalog_version import CatalogVersion
 
-__all__ = ['Client', 'Project', 'WorkSession', 'TimeAllocation', 'LoginAttempt']
+__all__ = ['User', 'Client', 'Project', 'WorkSession', 'TimeAllocation', 'LoginAttempt', 'DailyProjectHours', 'CatalogVersion']
@@ -0,0 +1,15 @@
+from backend.extensions import db
+from backend.utils.db_types import UUIDKey
+
+
+class CatalogVersion(db.Model):
+    """Per-user counter of changes to that user's clients and projects.
+
+    Every client or project write bumps its owner's row in the same
+    transaction (see CatalogService), so each worker can tell whether its
+    in-memory catalog is current with one primary-key read.
+    """
+    __tablename__ = 'catalog_version'
+
+    owner_id = db.Column(UUIDKey, db.ForeignKey('users.id'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
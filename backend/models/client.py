@@ -1,12 +1,14 @@
 from datetime import datetime, timezone
 from backend.extensions import db
+from backend.utils.tenancy import OwnedMixin
+from backend.utils.db_types import UUIDKey
 import uuid
 
 
-class Client(db.Model):
+class Client(OwnedMixin, db.Model):
     __tablename__ = 'clients'
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(255), nullable=False)
     short_name = db.Column(db.String(50), nullable=True)
     currency = db.Column(db.String(3), nullable=False)
@@ -23,26 +25,35 @@ class Client(db.Model):
     # Indexes
     __table_args__ = (
         db.CheckConstraint("currency IN ('CHF', 'EUR')", name='check_currency'),
-        db.Index('idx_clients_active', 'is_active', 'is_archived'),
+        db.Index('idx_clients_owner_active', 'owner_id', 'is_active', 'is_archived'),
+        # Serves the default (non-archived) list, newest first, without a sort
+        db.Index(
+            'idx_clients_owner_unarchived', 'owner_id', 'created_at',
+            sqlite_where=is_archived == db.false(), postgresql_where=is_archived == db.false()
+        ),
     )
 
-    def to_dict(self, include_hours_logged=False):
-        """Convert client to dictionary."""
+    def to_dict(self, include_hours_logged=False, hours_logged=None):
+        """Convert client to dictionary.
+
+        Pass a precomputed hours_logged (see get_hours_logged_for) to avoid
+        a per-client aggregate query when serializing lists.
+        """
         data = {
             'id': self.id,
             'name': self.name,
             'short_name': self.short_name,
             'currency': self.currency,
-            'default_hourly_rate': float(self.default_hourly_rate),
-            'hour_budget': float(self.hour_budget) if self.hour_budget else None,
+            'default_hourly_rate': self.default_hourly_rate,
+            'hour_budget': self.hour_budget or None,
             'is_active': self.is_active,
             'is_archived': self.is_archived,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
         if include_hours_logged:
-            data['hours_logged'] = self.get_hours_logged()
+            data['hours_logged'] = hours_logged if hours_logged is not None else self.get_hours_logged()
 
         return data
 
@@ -56,3 +67,30 @@ class Client(db.Model):
             Project.client_id == self.id
         ).scalar()
         return float(total) if total else 0.0
+
+    @staticmethod
+    def get_hours_logged_for(client_ids):
+        """Calculate total hours logged per client in a single grouped query.
+
+        Returns a dict mapping every given client id to its hours (0.0 if none).
+        """
+        from backend.models.time_allocation import TimeAllocation
+        from backend.models.project import Project
+        hours_logged = {client_id: 0.0 for client_id in client_ids}
+        if not hours_logged:
+            return hours_logged
+
+        rows = db.session.query(
+            Project.client_id,
+            db.func.sum(TimeAllocation.hours)
+        ).join(
+            Project, TimeAllocation.project_id == Project.id
+        ).filter(
+            Project.client_id.in_(list(hours_logged))
+        ).group_by(
+            Project.client_id
+        ).all()
+
+        for client_id, total in rows:
+            hours_logged[client_id] = float(total) if total else 0.0
+        return hours_logged
@@ -0,0 +1,34 @@
+from backend.extensions import db
+from backend.utils.db_types import UUIDKey
+from backend.utils.tenancy import OwnedMixin, current_owner_id
+
+
+class DailyProjectHours(OwnedMixin, db.Model):
+    """Rollup of allocated hours per project per day.
+
+    Kept current by RollupService whenever time_allocations change, so
+    reports can aggregate this small table instead of raw allocations.
+    """
+    __tablename__ = 'daily_project_hours'
+
+    owner_id = db.Column(
+        UUIDKey, db.ForeignKey('users.id'), primary_key=True, default=current_owner_id
+    )
+    date = db.Column(db.Date, primary_key=True)
+    project_id = db.Column(UUIDKey, db.ForeignKey('projects.id'), primary_key=True)
+    hours = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+
+    # Indexes
+    __table_args__ = (
+        db.Index('idx_daily_project_hours_project', 'project_id'),
+        # Lets date-range reports read hours without touching the table
+        db.Index('idx_daily_project_hours_covering', 'owner_id', 'date', 'project_id', 'hours'),
+    )
+
+    def to_dict(self):
+        """Convert rollup row to dictionary."""
+        return {
+            'date': self.date.isoformat(),
+            'project_id': self.project_id,
+            'hours': float(self.hours)
+        }
@@ -1,12 +1,13 @@
 from datetime import datetime, timezone
 from backend.extensions import db
+from backend.utils.db_types import UUIDKey
 import uuid
 
 
 class LoginAttempt(db.Model):
     __tablename__ = 'login_attempts'
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
     ip_address = db.Column(db.String(45), nullable=False)
     attempted_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     success = db.Column(db.Boolean, nullable=False, default=False)
@@ -14,6 +15,7 @@ class LoginAttempt(db.Model):
     # Indexes
     __table_args__ = (
         db.Index('idx_login_attempts_ip_time', 'ip_address', 'attempted_at'),
+        db.Index('idx_login_attempts_time', 'attempted_at'),
     )
 
     def to_dict(self):
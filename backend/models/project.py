@@ -1,13 +1,15 @@
 from datetime import datetime, timezone
 from backend.extensions import db
+from backend.utils.tenancy import OwnedMixin
+from backend.utils.db_types import UUIDKey
 import uuid
 
 
-class Project(db.Model):
+class Project(OwnedMixin, db.Model):
     __tablename__ = 'projects'
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    client_id = db.Column(db.String(36), db.ForeignKey('clients.id'), nullable=False)
+    id = db.Column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
+    client_id = db.Column(UUIDKey, db.ForeignKey('clients.id'), nullable=False)
     name = db.Column(db.String(255), nullable=False)
     short_name = db.Column(db.String(50), nullable=True)
     hourly_rate_override = db.Column(db.Numeric(10, 2), nullable=True)
@@ -24,31 +26,42 @@ class Project(db.Model):
     # Indexes
     __table_args__ = (
         db.Index('idx_projects_client', 'client_id'),
-        db.Index('idx_projects_active', 'is_active', 'is_archived'),
+        db.Index('idx_projects_owner_active', 'owner_id', 'is_active', 'is_archived'),
+        # Serves the default (non-archived) list, newest first, without a sort
+        db.Index(
+            'idx_projects_owner_unarchived', 'owner_id', 'created_at',
+            sqlite_where=is_archived == db.false(), postgresql_where=is_archived == db.false()
+        ),
     )
 
-    def to_dict(self, include_hours_logged=False):
-        """Convert project to dictionary."""
-        effective_rate = self.hourly_rate_override if self.hourly_rate_override else self.client.default_hourly_rate
+    def to_dict(self, include_hours_logged=False, hours_logged=None, client=None):
+        """Convert project to dictionary.
+
+        Pass a precomputed hours_logged (see get_hours_logged_for) to avoid
+        a per-project aggregate query when serializing lists, and the
+        client's catalog entry (see CatalogService) to avoid loading it.
+        """
+        client = client or self.client
+        effective_rate = self.hourly_rate_override if self.hourly_rate_override else client.default_hourly_rate
 
         data = {
             'id': self.id,
             'client_id': self.client_id,
-            'client_name': self.client.name,
+            'client_name': client.name,
             'name': self.name,
             'short_name': self.short_name,
-            'hourly_rate_override': float(self.hourly_rate_override) if self.hourly_rate_override else None,
-            'effective_hourly_rate': float(effective_rate),
-            'currency': self.client.currency,
-            'hour_budget': float(self.hour_budget) if self.hour_budget else None,
+            'hourly_rate_override': self.hourly_rate_override or None,
+            'effective_hourly_rate': effective_rate,
+            'currency': client.currency,
+            'hour_budget': self.hour_budget or None,
             'is_active': self.is_active,
             'is_archived': self.is_archived,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
         if include_hours_logged:
-            data['hours_logged'] = self.get_hours_logged()
+            data['hours_logged'] = hours_logged if hours_logged is not None else self.get_hours_logged()
 
         return data
 
@@ -59,3 +72,27 @@ class Project(db.Model):
             TimeAllocation.project_id == self.id
         ).scalar()
         return float(total) if total else 0.0
+
+    @staticmethod
+    def get_hours_logged_for(project_ids):
+        """Calculate total hours logged per project in a single grouped query.
+
+        Returns a dict mapping every given project id to its hours (0.0 if none).
+        """
+        from backend.models.time_allocation import TimeAllocation
+        hours_logged = {project_id: 0.0 for project_id in project_ids}
+        if not hours_logged:
+            return hours_logged
+
+        rows = db.session.query(
+            TimeAllocation.project_id,
+            db.func.sum(TimeAllocation.hours)
+        ).filter(
+            TimeAllocation.project_id.in_(list(hours_logged))
+        ).group_by(
+            TimeAllocation.project_id
+        ).all()
+
+        for project_id, total in rows:
+            hours_logged[project_id] = float(total) if total else 0.0
+        return hours_logged
@@ -1,14 +1,17 @@
 from datetime import datetime, timezone
 from backend.extensions import db
+from backend.utils.datetime_utils import ensure_naive
+from backend.utils.tenancy import OwnedMixin
+from backend.utils.db_types import UUIDKey
 import uuid
 
 
-class TimeAllocation(db.Model):
+class TimeAllocation(OwnedMixin, db.Model):
     __tablename__ = 'time_allocations'
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
     date = db.Column(db.Date, nullable=False)
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False)
+    project_id = db.Column(UUIDKey, db.ForeignKey('projects.id'), nullable=False)
     hours = db.Column(db.Numeric(5, 2), nullable=False)
     notes = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
@@ -19,19 +22,26 @@ class TimeAllocation(db.Model):
 
     # Indexes and constraints
     __table_args__ = (
-        db.Index('idx_allocations_date', 'date'),
+        # Covers date-range aggregates (owner and date filter, project grouping, hours sum)
+        db.Index('idx_allocations_owner_date_project_hours', 'owner_id', 'date', 'project_id', 'hours'),
         db.Index('idx_allocations_project', 'project_id'),
     )
 
-    def to_dict(self):
-        """Convert time allocation to dictionary."""
+    def to_dict(self, project=None):
+        """Convert time allocation to dictionary.
+
+        Pass the project's catalog entry (see CatalogService) to take the
+        project and client names from it instead of loading relationships.
+        """
+        project = project or self.project
         return {
             'id': self.id,
-            'date': self.date.isoformat(),
+            'date': self.date,
             'project_id': self.project_id,
-            'project_name': self.project.name,
-            'client_name': self.project.client.name,
-            'hours': float(self.hours),
+            'project_name': project.name,
+            'client_name': project.client.name,
+            'hours': self.hours,
             'notes': self.notes,
-            'created_at': self.created_at.isoformat()
+            # Naive like a reloaded row, also for rows serialized before commit
+            'created_at': ensure_naive(self.created_at)
         }
@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+from backend.extensions import db
+from backend.utils.db_types import UUIDKey
+import uuid
+
+
+class User(db.Model):
+    """A login. Clients, projects, sessions and allocations are owned by one user."""
+    __tablename__ = 'users'
+
+    id = db.Column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
+    username = db.Column(db.String(80), nullable=False, unique=True)
+    password_hash = db.Column(db.String(255), nullable=False)
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        """Convert user to dictionary (never includes the password hash)."""
+        return {
+            'id': self.id,
+            'username': self.username,
+            'is_active': self.is_active,
+            'created_at': self.created_at
+        }
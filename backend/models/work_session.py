@@ -1,22 +1,40 @@
 from datetime import datetime
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from backend.extensions import db
 from backend.utils.datetime_utils import ensure_naive, now_naive
+from backend.utils.db_types import UUIDKey
+from backend.utils.tenancy import OwnedMixin
 import uuid
 
 
-class WorkSession(db.Model):
+class WorkSession(OwnedMixin, db.Model):
     __tablename__ = 'work_sessions'
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
     date = db.Column(db.Date, nullable=False)
     start_time = db.Column(db.DateTime(timezone=False), nullable=False)
     end_time = db.Column(db.DateTime(timezone=False), nullable=True)
     created_at = db.Column(db.DateTime(timezone=False), default=now_naive)
     updated_at = db.Column(db.DateTime(timezone=False), default=now_naive, onupdate=now_naive)
 
-    # Indexes
+    # Indexes and constraints
     __table_args__ = (
-        db.Index('idx_sessions_date', 'date'),
+        # Serves check_overlap's "latest session starting before X on a date" seek
+        db.Index('idx_sessions_owner_date_start_end', 'owner_id', 'date', 'start_time', 'end_time'),
+        # One open session per user: clock-in/out find it with a single seek,
+        # and a concurrent second clock-in fails instead of leaving two open
+        db.Index(
+            'uq_sessions_owner_open', 'owner_id', unique=True,
+            sqlite_where=end_time.is_(None), postgresql_where=end_time.is_(None)
+        ),
+        # PostgreSQL rejects overlapping sessions of one user itself; an open
+        # session extends to infinity (owner_id equality needs btree_gist)
+        ExcludeConstraint(
+            ('owner_id', '='),
+            (db.func.tsrange(start_time, end_time, db.text("'[)'")), '&&'),
+            using='gist',
+            name='excl_sessions_no_overlap'
+        ).ddl_if(dialect='postgresql'),
     )
 
     def to_dict(self) -> dict:
@@ -28,9 +46,9 @@ class WorkSession(db.Model):
 
         return {
             'id': self.id,
-            'date': self.date.isoformat(),
-            'start_time': start.isoformat(),
-            'end_time': end.isoformat() if end else None,
+            'date': self.date,
+            'start_time': start,
+            'end_time': end,
             'duration_hours': round(duration, 2) if duration else None,
             'is_active': is_active
         }
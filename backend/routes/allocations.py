@@ -1,41 +1,86 @@
 from flask import Blueprint, request, jsonify
+from collections import defaultdict
 from datetime import datetime
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from backend.extensions import db
 from backend.models.time_allocation import TimeAllocation
 from backend.models.work_session import WorkSession
 from backend.middleware.auth_middleware import login_required
+from backend.middleware.conditional import make_etag, is_not_modified, not_modified, with_etag
+from backend.serializers import serialize_allocations
+from backend.services.calendar_service import CalendarService, get_date_totals, get_clocked_hours
+from backend.services.catalog_service import CatalogService
+from backend.services.event_service import EventService
+from backend.services.rollup_service import RollupService
+from backend.utils.sql_utils import duration_seconds
 
 bp = Blueprint('allocations', __name__, url_prefix='/api/allocations')
 
+MAX_BATCH_SIZE = 500
 
-def get_completed_hours_for_date(target_date):
-    """Calculate total hours from completed sessions for a specific date."""
-    sessions = WorkSession.query.filter_by(date=target_date).all()
-    return sum(s.get_duration_hours() for s in sessions)
 
+def get_allocations_version(target_date):
+    """Get a version stamp for everything the allocations payload of a date depends on.
 
-def get_active_session_hours(target_date, current_time=None):
-    """Get elapsed hours from any active session on the given date.
-
-    Args:
-        target_date: The date to check for active sessions
-        current_time: The client's current local time (naive datetime).
-                      If None, falls back to server's datetime.now().
+    Covers the row count and latest updated_at of the date's allocations and
+    sessions, and the catalog version for the project and client names
+    shown, in one query.
     """
-    active = WorkSession.query.filter_by(date=target_date, end_time=None).first()
-    if active:
-        now = current_time if current_time else datetime.now()
-        return (now - active.start_time).total_seconds() / 3600
-    return 0.0
+    def stamp(model, *criteria):
+        return (
+            db.select(db.func.count()).select_from(model).where(*criteria).scalar_subquery(),
+            db.select(db.func.max(model.updated_at)).where(*criteria).scalar_subquery()
+        )
+
+    *stamps, catalog_version = db.session.execute(db.select(
+        *stamp(TimeAllocation, TimeAllocation.date == target_date),
+        *stamp(WorkSession, WorkSession.date == target_date),
+        CatalogService.version_subquery()
+    )).one()
+    return (*stamps, CatalogService.remember_version(catalog_version))
+
+
+def parse_current_time(data):
+    """Parse the client's current time (naive) from a request body, or None."""
+    if data.get('current_time'):
+        try:
+            current_time = datetime.fromisoformat(data['current_time'].replace('Z', ''))
+            return current_time.replace(tzinfo=None)
+        except ValueError:
+            pass  # Fall back to server time if parsing fails
+    return None
 
 
-def get_total_allocated_for_date(target_date):
-    """Calculate total hours allocated for a specific date."""
-    total = db.session.query(db.func.sum(TimeAllocation.hours)).filter_by(
-        date=target_date
-    ).scalar()
-    return float(total) if total else 0.0
+def get_day_totals(dates, current_time=None):
+    """Get (allocated_hours, clocked_hours) for many dates with two grouped queries.
+
+    Clocked hours include elapsed time of an active session, as in create_allocation.
+    """
+    dates = list(dates)
+    allocated = dict(db.session.query(
+        TimeAllocation.date,
+        db.func.sum(TimeAllocation.hours)
+    ).filter(
+        TimeAllocation.date.in_(dates)
+    ).group_by(TimeAllocation.date).all())
+
+    sessions = db.session.query(
+        WorkSession.date,
+        db.func.sum(duration_seconds(WorkSession.start_time, WorkSession.end_time)),
+        db.func.max(db.case((WorkSession.end_time.is_(None), WorkSession.start_time)))
+    ).filter(
+        WorkSession.date.in_(dates)
+    ).group_by(WorkSession.date).all()
+
+    clocked = {
+        session_date: get_clocked_hours(float(completed_seconds or 0), active_start, current_time)
+        for session_date, completed_seconds, active_start in sessions
+    }
+
+    return {
+        target_date: (float(allocated.get(target_date) or 0), clocked.get(target_date, 0.0))
+        for target_date in dates
+    }
 
 
 @bp.route('', methods=['GET'])
@@ -51,18 +96,23 @@ def get_allocations():
     except ValueError:
         return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
 
+    # Answer revalidation requests without loading or serializing any rows
+    etag = make_etag('allocations', target_date, *get_allocations_version(target_date))
+    if is_not_modified(etag):
+        return not_modified(etag)
+
     allocations = TimeAllocation.query.filter_by(date=target_date).order_by(
         TimeAllocation.created_at
     ).all()
 
-    total_allocated = get_total_allocated_for_date(target_date)
-    completed_hours = get_completed_hours_for_date(target_date)
+    completed_seconds, _, total_allocated = get_date_totals(target_date)
+    completed_hours = completed_seconds / 3600
 
-    return jsonify({
-        'allocations': [a.to_dict() for a in allocations],
+    return with_etag((jsonify({
+        'allocations': serialize_allocations(allocations),
         'total_allocated': round(total_allocated, 2),
         'completed_hours': round(completed_hours, 2)
-    }), 200
+    }), 200), etag)
 
 
 @bp.route('', methods=['POST'])
@@ -87,18 +137,17 @@ def create_allocation():
     if hours <= 0:
         return jsonify({'error': 'Hours must be positive'}), 400
 
+    if not isinstance(data['project_id'], str):
+        return jsonify({'error': 'Invalid project_id'}), 400
+    if data['project_id'] not in CatalogService.get().projects:
+        return jsonify({'error': 'Project not found'}), 400
+
     # Parse client's current time for accurate active session calculation
-    current_time = None
-    if data.get('current_time'):
-        try:
-            current_time = datetime.fromisoformat(data['current_time'].replace('Z', ''))
-            current_time = current_time.replace(tzinfo=None)
-        except ValueError:
-            pass  # Fall back to server time if parsing fails
+    current_time = parse_current_time(data)
 
     # Check if allocation would exceed clocked time (includes active session)
-    total_allocated = get_total_allocated_for_date(allocation_date)
-    total_clocked = get_completed_hours_for_date(allocation_date) + get_active_session_hours(allocation_date, current_time)
+    completed_seconds, active_start, total_allocated = get_date_totals(allocation_date)
+    total_clocked = get_clocked_hours(completed_seconds, active_start, current_time)
 
     if total_allocated + float(hours) > total_clocked:
         return jsonify({
@@ -113,9 +162,121 @@ def create_allocation():
     )
 
     db.session.add(allocation)
+    RollupService.record_allocation(allocation)
     db.session.commit()
+    CalendarService.invalidate(allocation_date)
+
+    allocation_data = serialize_allocations([allocation])[0]
+    EventService.publish('allocation.created', allocation_date, allocation=allocation_data)
+    return jsonify({'allocation': allocation_data}), 201
+
+
+@bp.route('/batch', methods=['POST'])
+@login_required
+def create_allocations_batch():
+    """Create many time allocations atomically.
 
-    return jsonify({'allocation': allocation.to_dict()}), 201
+    Body: {"allocations": [{"date", "project_id", "hours", "notes"?}, ...], "current_time"?}
+    Each date's new total is validated against its clocked time once. Either
+    every allocation is created or, on any error, none are.
+    """
+    data = request.get_json() or {}
+    items = data.get('allocations')
+
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'allocations must be a non-empty list'}), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'A batch cannot contain more than {MAX_BATCH_SIZE} allocations'}), 400
+
+    # Validate every item before touching the database
+    parsed = []
+    errors = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'error': 'allocation must be an object'})
+            continue
+        missing = [field for field in ('date', 'project_id', 'hours') if field not in item]
+        if missing:
+            errors.append({'index': index, 'error': f'{missing[0]} is required'})
+            continue
+        try:
+            allocation_date = datetime.strptime(item['date'], '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            errors.append({'index': index, 'error': 'Invalid date format. Use YYYY-MM-DD'})
+            continue
+        try:
+            hours = Decimal(str(item['hours']))
+        except InvalidOperation:
+            errors.append({'index': index, 'error': 'Invalid hours'})
+            continue
+        # NaN and Infinity parse, but NaN cannot be compared
+        if not hours.is_finite():
+            errors.append({'index': index, 'error': 'Invalid hours'})
+            continue
+        if hours <= 0:
+            errors.append({'index': index, 'error': 'Hours must be positive'})
+            continue
+        if not isinstance(item['project_id'], str):
+            errors.append({'index': index, 'error': 'Invalid project_id'})
+            continue
+        parsed.append((index, allocation_date, item['project_id'], hours, item.get('notes')))
+
+    if errors:
+        return jsonify({'error': 'Invalid allocations', 'errors': errors}), 400
+
+    known_projects = CatalogService.get().projects
+    errors = [
+        {'index': index, 'error': 'Project not found'}
+        for index, _, project_id, _, _ in parsed if project_id not in known_projects
+    ]
+    if errors:
+        return jsonify({'error': 'Invalid allocations', 'errors': errors}), 400
+
+    # Check each date's total once against clocked time (includes active session)
+    requested = defaultdict(Decimal)
+    for _, allocation_date, _, hours, _ in parsed:
+        requested[allocation_date] += hours
+
+    day_totals = get_day_totals(requested, parse_current_time(data))
+    errors = []
+    for allocation_date, hours in sorted(requested.items()):
+        total_allocated, total_clocked = day_totals[allocation_date]
+        if total_allocated + float(hours) > total_clocked:
+            errors.append({
+                'date': allocation_date.isoformat(),
+                'error': f'Cannot allocate {hours}h. Only {round(total_clocked - total_allocated, 2)}h remaining for this date.'
+            })
+    if errors:
+        return jsonify({'error': 'Allocations exceed clocked time', 'errors': errors}), 400
+
+    allocations = [
+        TimeAllocation(date=allocation_date, project_id=project_id, hours=hours, notes=notes)
+        for _, allocation_date, project_id, hours, notes in parsed
+    ]
+
+    rollup_deltas = defaultdict(Decimal)
+    for allocation in allocations:
+        rollup_deltas[(allocation.date, allocation.project_id)] += allocation.hours
+
+    try:
+        db.session.add_all(allocations)
+        for (allocation_date, project_id), hours in rollup_deltas.items():
+            RollupService.add_hours(allocation_date, project_id, hours)
+        db.session.flush()
+        # Serialize before commit expires the rows, so nothing is reloaded per row
+        created = serialize_allocations(allocations)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for allocation_date in requested:
+        CalendarService.invalidate(allocation_date)
+        EventService.publish('allocation.created', allocation_date, allocations=[
+            allocation for allocation in created if allocation['date'] == allocation_date
+        ])
+
+    return jsonify({'allocations': created}), 201
 
 
 @bp.route('/<allocation_id>', methods=['PUT'])
@@ -124,6 +285,7 @@ def update_allocation(allocation_id):
     """Update a time allocation."""
     allocation = TimeAllocation.query.get_or_404(allocation_id)
     data = request.get_json()
+    old_project_id, old_hours = allocation.project_id, allocation.hours
 
     # Update hours if provided
     if 'hours' in data:
@@ -134,17 +296,11 @@ def update_allocation(allocation_id):
             return jsonify({'error': 'Hours must be positive'}), 400
 
         # Parse client's current time for accurate active session calculation
-        current_time = None
-        if data.get('current_time'):
-            try:
-                current_time = datetime.fromisoformat(data['current_time'].replace('Z', ''))
-                current_time = current_time.replace(tzinfo=None)
-            except ValueError:
-                pass  # Fall back to server time if parsing fails
+        current_time = parse_current_time(data)
 
         # Check if new allocation would exceed clocked time (includes active session)
-        total_allocated = get_total_allocated_for_date(allocation.date)
-        total_clocked = get_completed_hours_for_date(allocation.date) + get_active_session_hours(allocation.date, current_time)
+        completed_seconds, active_start, total_allocated = get_date_totals(allocation.date)
+        total_clocked = get_clocked_hours(completed_seconds, active_start, current_time)
 
         # Subtract old allocation and add new one
         new_total_allocated = total_allocated - float(allocation.hours) + float(new_hours)
@@ -158,14 +314,23 @@ def update_allocation(allocation_id):
 
     # Update project if provided
     if 'project_id' in data:
+        if not isinstance(data['project_id'], str):
+            return jsonify({'error': 'Invalid project_id'}), 400
+        if data['project_id'] not in CatalogService.get().projects:
+            return jsonify({'error': 'Project not found'}), 400
         allocation.project_id = data['project_id']
 
     # Update notes if provided
     if 'notes' in data:
         allocation.notes = data['notes']
 
+    RollupService.move_hours(allocation.date, old_project_id, old_hours, allocation)
     db.session.commit()
-    return jsonify({'allocation': allocation.to_dict()}), 200
+    CalendarService.invalidate(allocation.date)
+
+    allocation_data = serialize_allocations([allocation])[0]
+    EventService.publish('allocation.updated', allocation.date, allocation=allocation_data)
+    return jsonify({'allocation': allocation_data}), 200
 
 
 @bp.route('/<allocation_id>', methods=['DELETE'])
@@ -173,8 +338,12 @@ def update_allocation(allocation_id):
 def delete_allocation(allocation_id):
     """Delete a time allocation."""
     allocation = TimeAllocation.query.get_or_404(allocation_id)
+    allocation_date = allocation.date
 
+    RollupService.remove_allocation(allocation)
     db.session.delete(allocation)
     db.session.commit()
+    CalendarService.invalidate(allocation_date)
+    EventService.publish('allocation.deleted', allocation_date, allocation_id=allocation_id)
 
     return '', 204
@@ -1,5 +1,5 @@
-from flask import Blueprint, request, jsonify, session
-from backend.services.auth_service import AuthService
+from flask import Blueprint, current_app, request, jsonify, session
+from backend.services.auth_service import AuthService, PasswordVerifierBusy
 from backend.extensions import limiter
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
@@ -8,9 +8,14 @@ bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 @bp.route('/login', methods=['POST'])
 @limiter.limit("5 per minute")
 def login():
-    """Login endpoint with password verification and brute force protection."""
+    """Login endpoint with password verification and brute force protection.
+
+    Body: {"username"?, "password"}. Without a username, logs in as
+    DEFAULT_USERNAME, so single-user installs keep a password-only login.
+    """
     data = request.get_json()
     password = data.get('password')
+    username = data.get('username') or current_app.config['DEFAULT_USERNAME']
 
     if not password:
         return jsonify({'error': 'Password is required'}), 400
@@ -31,20 +36,32 @@ def login():
 
     # Verify password
     try:
-        if AuthService.verify_password(password):
-            # Success - create session
+        user = AuthService.authenticate(username, password)
+        if user:
+            # Success - create a fresh session for this user
+            session.clear()
             session.permanent = True
-            session['authenticated'] = True
+            session['user_id'] = user.id
+            session['username'] = user.username
 
             # Record successful attempt and clear failed attempts
             AuthService.record_login_attempt(ip_address, success=True)
             AuthService.clear_failed_attempts(ip_address)
 
-            return jsonify({'message': 'Login successful'}), 200
+            return jsonify({
+                'message': 'Login successful',
+                'user': {'id': user.id, 'username': user.username},
+                'live_updates': current_app.config['STREAM_ENABLED']
+            }), 200
         else:
             # Failed - record attempt
             AuthService.record_login_attempt(ip_address, success=False)
-            return jsonify({'error': 'Invalid password'}), 401
+            return jsonify({'error': 'Invalid username or password'}), 401
+    except PasswordVerifierBusy:
+        # Saturated before hashing; not a failed attempt, so nothing is recorded
+        return jsonify({'error': 'Too many login attempts in progress. Please try again shortly.'}), 429, {
+            'Retry-After': '1'
+        }
     except ValueError as e:
         return jsonify({'error': str(e)}), 500
 
@@ -58,6 +75,18 @@ def logout():
 
 @bp.route('/me', methods=['GET'])
 def me():
-    """Check authentication status."""
-    is_authenticated = session.get('authenticated', False)
-    return jsonify({'authenticated': is_authenticated}), 200
+    """Check authentication status.
+
+    live_updates tells the frontend whether to open /api/stream or poll.
+    """
+    live_updates = current_app.config['STREAM_ENABLED']
+    if not session.get('user_id'):
+        return jsonify({'authenticated': False, 'user': None, 'live_updates': live_updates}), 200
+    if not AuthService.is_active_user(session['user_id']):
+        session.clear()
+        return jsonify({'authenticated': False, 'user': None, 'live_updates': live_updates}), 200
+    return jsonify({
+        'authenticated': True,
+        'user': {'id': session['user_id'], 'username': session.get('username')},
+        'live_updates': live_updates
+    }), 200
@@ -1,9 +1,47 @@
-from flask import Blueprint
+from flask import Blueprint, request, jsonify
+from datetime import datetime, timedelta
+from backend.middleware.auth_middleware import login_required
+from backend.services.calendar_service import CalendarService
+from backend.utils.datetime_utils import month_bounds, parse_month
 
 bp = Blueprint('calendar', __name__, url_prefix='/api/calendar')
 
+MAX_RANGE_DAYS = 366
+
 
 @bp.route('', methods=['GET'])
+@login_required
 def get_calendar():
-    """Get calendar data - to be implemented in Phase 5."""
-    return {'days': []}, 200
+    """Get per-day clocked, allocated and unallocated hours.
+
+    Query either ?month=YYYY-MM (defaults to the current month) or
+    ?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD (inclusive).
+    """
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+
+    if start_date or end_date:
+        if not start_date or not end_date:
+            return jsonify({'error': 'start_date and end_date parameters are required'}), 400
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d').date()
+            end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        if end < start:
+            return jsonify({'error': 'end_date must not be before start_date'}), 400
+        if (end - start).days >= MAX_RANGE_DAYS:
+            return jsonify({'error': f'Date range cannot exceed {MAX_RANGE_DAYS} days'}), 400
+    else:
+        month_str = request.args.get('month') or datetime.now().strftime('%Y-%m')
+        try:
+            start, next_month = month_bounds(*parse_month(month_str))
+        except ValueError:
+            return jsonify({'error': 'Invalid month format. Use YYYY-MM'}), 400
+        end = next_month - timedelta(days=1)
+
+    return jsonify({
+        'start_date': start,
+        'end_date': end,
+        'days': CalendarService.get_days(start, end)
+    }), 200
@@ -3,6 +3,8 @@ from backend.extensions import db
 from backend.models.client import Client
 from backend.models.time_allocation import TimeAllocation
 from backend.middleware.auth_middleware import login_required
+from backend.services.catalog_service import CatalogService
+from backend.serializers import serialize_clients
 from decimal import Decimal
 
 bp = Blueprint('clients', __name__, url_prefix='/api/clients')
@@ -20,7 +22,7 @@ def get_clients():
 
     clients = query.order_by(Client.created_at.desc()).all()
     return jsonify({
-        'clients': [client.to_dict(include_hours_logged=True) for client in clients]
+        'clients': serialize_clients(clients, include_hours_logged=True)
     }), 200
 
 
@@ -49,6 +51,7 @@ def create_client():
     )
 
     db.session.add(client)
+    CatalogService.bump_version()
     db.session.commit()
 
     return jsonify({'client': client.to_dict()}), 201
@@ -59,7 +62,7 @@ def create_client():
 def get_client(client_id):
     """Get a specific client."""
     client = Client.query.get_or_404(client_id)
-    return jsonify({'client': client.to_dict(include_hours_logged=True)}), 200
+    return jsonify({'client': serialize_clients([client], include_hours_logged=True)[0]}), 200
 
 
 @bp.route('/<client_id>', methods=['PUT'])
@@ -85,8 +88,9 @@ def update_client(client_id):
     if 'is_active' in data:
         client.is_active = data['is_active']
 
+    CatalogService.bump_version()
     db.session.commit()
-    return jsonify({'client': client.to_dict(include_hours_logged=True)}), 200
+    return jsonify({'client': serialize_clients([client], include_hours_logged=True)[0]}), 200
 
 
 @bp.route('/<client_id>/archive', methods=['PUT'])
@@ -95,6 +99,7 @@ def archive_client(client_id):
     """Archive a client."""
     client = Client.query.get_or_404(client_id)
     client.is_archived = True
+    CatalogService.bump_version()
     db.session.commit()
     return jsonify({'client': client.to_dict()}), 200
 
@@ -105,6 +110,7 @@ def restore_client(client_id):
     """Restore an archived client."""
     client = Client.query.get_or_404(client_id)
     client.is_archived = False
+    CatalogService.bump_version()
     db.session.commit()
     return jsonify({'client': client.to_dict()}), 200
 
@@ -124,5 +130,6 @@ def delete_client(client_id):
         return jsonify({'error': 'Cannot delete client with logged time. Archive instead.'}), 400
 
     db.session.delete(client)
+    CatalogService.bump_version()
     db.session.commit()
     return '', 204
@@ -0,0 +1,70 @@
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from datetime import datetime
+from backend.middleware.auth_middleware import login_required
+from backend.services.export_service import (
+    ExportService, EXPORT_FORMATS, ALLOCATION_FIELDS, SESSION_FIELDS
+)
+
+bp = Blueprint('exports', __name__, url_prefix='/api/exports')
+
+
+def parse_export_args():
+    """Parse start_date, end_date and format query parameters.
+
+    Returns:
+        (start, end, export_format, error_response)
+    """
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    export_format = request.args.get('format', 'csv').lower()
+
+    if not start_date or not end_date:
+        return None, None, None, (jsonify({'error': 'start_date and end_date parameters are required'}), 400)
+
+    try:
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    except ValueError:
+        return None, None, None, (jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400)
+
+    if export_format not in EXPORT_FORMATS:
+        return None, None, None, (jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400)
+
+    return start, end, export_format, None
+
+
+def stream_export(name, rows, fields, export_format, start, end):
+    """Build a streaming attachment response for an export."""
+    filename = f'{name}_{start.isoformat()}_{end.isoformat()}.{export_format}'
+    return Response(
+        stream_with_context(ExportService.encode(rows, fields, export_format)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
+@bp.route('/allocations', methods=['GET'])
+@login_required
+def export_allocations():
+    """Stream time allocations for a date range as CSV or NDJSON."""
+    start, end, export_format, error = parse_export_args()
+    if error:
+        return error
+
+    rows = ExportService.iter_allocations(start, end)
+    return stream_export('allocations', rows, ALLOCATION_FIELDS, export_format, start, end)
+
+
+@bp.route('/sessions', methods=['GET'])
+@login_required
+def export_sessions():
+    """Stream work sessions for a date range as CSV or NDJSON."""
+    start, end, export_format, error = parse_export_args()
+    if error:
+        return error
+
+    rows = ExportService.iter_sessions(start, end)
+    return stream_export('sessions', rows, SESSION_FIELDS, export_format, start, end)
@@ -0,0 +1,35 @@
+import io
+from flask import Blueprint, request, jsonify
+from backend.middleware.auth_middleware import login_required
+from backend.services.import_service import ImportService, ImportConflictError, IMPORT_FORMATS
+
+bp = Blueprint('imports', __name__, url_prefix='/api/imports')
+
+
+@bp.route('', methods=['POST'])
+@login_required
+def import_timesheet():
+    """Import a Toggl/Harvest CSV or ICS timesheet uploaded as multipart 'file'.
+
+    Query parameters: format (toggl, harvest or ics) and dry_run (true/false).
+    Returns the import report; with dry_run nothing is written. Returns 409
+    if a concurrent change conflicts with the import.
+    """
+    source_format = request.args.get('format', '').lower()
+    dry_run = request.args.get('dry_run', 'false').lower() == 'true'
+
+    if source_format not in IMPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(IMPORT_FORMATS)}"}), 400
+
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({'error': 'file is required'}), 400
+
+    lines = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+    try:
+        report = ImportService(source_format, dry_run=dry_run).run(lines)
+    except ImportConflictError as error:
+        return jsonify({'error': str(error)}), 409
+
+    status = 200 if dry_run else 201
+    return jsonify(report), status
@@ -0,0 +1,21 @@
+import hmac
+from flask import Blueprint, Response, current_app, request, jsonify
+from backend.middleware.metrics import render_metrics
+
+bp = Blueprint('metrics', __name__)
+
+
+@bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose request and SQL metrics in the Prometheus text format.
+
+    If METRICS_TOKEN is configured, scrapers must send it as a bearer token.
+    """
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return jsonify({'error': 'Authentication required'}), 401
+
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
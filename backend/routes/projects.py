@@ -3,6 +3,8 @@ from backend.extensions import db
 from backend.models.project import Project
 from backend.models.time_allocation import TimeAllocation
 from backend.middleware.auth_middleware import login_required
+from backend.services.catalog_service import CatalogService
+from backend.serializers import serialize_projects
 from decimal import Decimal
 
 bp = Blueprint('projects', __name__, url_prefix='/api/projects')
@@ -23,7 +25,7 @@ def get_projects():
 
     projects = query.order_by(Project.created_at.desc()).all()
     return jsonify({
-        'projects': [project.to_dict(include_hours_logged=True) for project in projects]
+        'projects': serialize_projects(projects, include_hours_logged=True)
     }), 200
 
 
@@ -39,6 +41,11 @@ def create_project():
         if field not in data:
             return jsonify({'error': f'{field} is required'}), 400
 
+    if not isinstance(data['client_id'], str):
+        return jsonify({'error': 'Invalid client_id'}), 400
+    if data['client_id'] not in CatalogService.get().clients:
+        return jsonify({'error': 'Client not found'}), 400
+
     project = Project(
         client_id=data['client_id'],
         name=data['name'],
@@ -48,6 +55,7 @@ def create_project():
     )
 
     db.session.add(project)
+    CatalogService.bump_version()
     db.session.commit()
 
     return jsonify({'project': project.to_dict()}), 201
@@ -58,7 +66,7 @@ def create_project():
 def get_project(project_id):
     """Get a specific project."""
     project = Project.query.get_or_404(project_id)
-    return jsonify({'project': project.to_dict(include_hours_logged=True)}), 200
+    return jsonify({'project': serialize_projects([project], include_hours_logged=True)[0]}), 200
 
 
 @bp.route('/<project_id>', methods=['PUT'])
@@ -80,8 +88,9 @@ def update_project(project_id):
     if 'is_active' in data:
         project.is_active = data['is_active']
 
+    CatalogService.bump_version()
     db.session.commit()
-    return jsonify({'project': project.to_dict(include_hours_logged=True)}), 200
+    return jsonify({'project': serialize_projects([project], include_hours_logged=True)[0]}), 200
 
 
 @bp.route('/<project_id>/archive', methods=['PUT'])
@@ -90,6 +99,7 @@ def archive_project(project_id):
     """Archive a project."""
     project = Project.query.get_or_404(project_id)
     project.is_archived = True
+    CatalogService.bump_version()
     db.session.commit()
     return jsonify({'project': project.to_dict()}), 200
 
@@ -100,6 +110,7 @@ def restore_project(project_id):
     """Restore an archived project."""
     project = Project.query.get_or_404(project_id)
     project.is_archived = False
+    CatalogService.bump_version()
     db.session.commit()
     return jsonify({'project': project.to_dict()}), 200
 
@@ -117,5 +128,6 @@ def delete_project(project_id):
         return jsonify({'error': 'Cannot delete project with logged time. Archive instead.'}), 400
 
     db.session.delete(project)
+    CatalogService.bump_version()
     db.session.commit()
     return '', 204
@@ -1,11 +1,13 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
-from sqlalchemy import func, extract
+from sqlalchemy import func
 from backend.extensions import db
-from backend.models.time_allocation import TimeAllocation
-from backend.models.project import Project
-from backend.models.client import Client
+from backend.models.daily_project_hours import DailyProjectHours
 from backend.middleware.auth_middleware import login_required
+from backend.services.billing_service import BillingService
+from backend.services.catalog_service import CatalogService
+from backend.utils.datetime_utils import month_bounds, parse_month
+from backend.utils.sql_utils import month_label
 
 bp = Blueprint('reports', __name__, url_prefix='/api/reports')
 
@@ -13,48 +15,71 @@ bp = Blueprint('reports', __name__, url_prefix='/api/reports')
 @bp.route('/monthly-summary', methods=['GET'])
 @login_required
 def get_monthly_summary():
-    """Get monthly summary report with hours and income by project."""
-    year = request.args.get('year', type=int)
-    month = request.args.get('month', type=int)
+    """Get monthly summary report with hours and income by project.
 
-    if not year or not month:
-        return jsonify({'error': 'Year and month parameters are required'}), 400
+    Single month: ?year=&month=
+    Range mode:   ?start_month=YYYY-MM&end_month=YYYY-MM (inclusive), returning
+                  one row per month and project, each tagged with 'month'.
+    """
+    start_month = request.args.get('start_month')
+    end_month = request.args.get('end_month')
+    range_mode = bool(start_month or end_month)
 
-    # Query time allocations for the specified month
-    results = db.session.query(
-        Project.name.label('project_name'),
-        Client.currency.label('currency'),
-        func.sum(TimeAllocation.hours).label('total_hours'),
-        Project.hourly_rate_override,
-        Client.default_hourly_rate
-    ).join(
-        Project, TimeAllocation.project_id == Project.id
-    ).join(
-        Client, Project.client_id == Client.id
-    ).filter(
-        extract('year', TimeAllocation.date) == year,
-        extract('month', TimeAllocation.date) == month
-    ).group_by(
-        Project.id,
-        Project.name,
-        Client.currency,
-        Project.hourly_rate_override,
-        Client.default_hourly_rate
-    ).all()
+    try:
+        if range_mode:
+            if not start_month or not end_month:
+                return jsonify({'error': 'start_month and end_month parameters are required (YYYY-MM)'}), 400
+            start, _ = month_bounds(*parse_month(start_month))
+            _, end = month_bounds(*parse_month(end_month))
+            if end <= start:
+                return jsonify({'error': 'end_month must not be before start_month'}), 400
+        else:
+            year = request.args.get('year', type=int)
+            month = request.args.get('month', type=int)
+            if not year or not month:
+                return jsonify({'error': 'Year and month parameters are required'}), 400
+            start, end = month_bounds(year, month)
+    except ValueError:
+        return jsonify({'error': 'Invalid month. Use YYYY-MM (or year and month 1-12)'}), 400
+
+    columns = [
+        DailyProjectHours.project_id,
+        func.sum(DailyProjectHours.hours).label('total_hours')
+    ]
+    group_by = [DailyProjectHours.project_id]
+    if range_mode:
+        month_column = month_label(DailyProjectHours.date)
+        columns.insert(0, month_column.label('month'))
+        group_by.insert(0, month_column)
+
+    # Query the daily rollup over a half-open date range so the date index applies;
+    # names, currencies and rates come from the catalog instead of joins
+    results = db.session.query(*columns).filter(
+        DailyProjectHours.date >= start,
+        DailyProjectHours.date < end
+    ).group_by(*group_by).all()
+    projects = CatalogService.get().projects
 
     # Calculate income for each project
     report_data = []
     for row in results:
-        effective_rate = float(row.hourly_rate_override) if row.hourly_rate_override else float(row.default_hourly_rate)
+        project = projects[row.project_id]
+        effective_rate = float(project.effective_hourly_rate)
         total_hours = float(row.total_hours)
         income = total_hours * effective_rate
 
-        report_data.append({
-            'project_name': row.project_name,
+        item = {
+            'project_name': project.name,
             'hours': total_hours,
             'income': round(income, 2),
-            'currency': row.currency
-        })
+            'currency': project.client.currency
+        }
+        if range_mode:
+            item = {'month': row.month, **item}
+        report_data.append(item)
+
+    if range_mode:
+        report_data.sort(key=lambda item: (item['month'], item['project_name']))
 
     return jsonify(report_data), 200
 
@@ -75,37 +100,31 @@ def get_daily_hours():
     except ValueError:
         return {'error': 'Invalid date format. Use YYYY-MM-DD'}, 400
 
-    # Query time allocations for the date range
+    # Query the daily rollup for the date range; names come from the catalog
     results = db.session.query(
-        TimeAllocation.date,
-        Project.name.label('project_name'),
-        Client.name.label('client_name'),
-        func.sum(TimeAllocation.hours).label('total_hours')
-    ).join(
-        Project, TimeAllocation.project_id == Project.id
-    ).join(
-        Client, Project.client_id == Client.id
+        DailyProjectHours.date,
+        DailyProjectHours.project_id,
+        func.sum(DailyProjectHours.hours).label('total_hours')
     ).filter(
-        TimeAllocation.date >= start,
-        TimeAllocation.date <= end
+        DailyProjectHours.date >= start,
+        DailyProjectHours.date <= end
     ).group_by(
-        TimeAllocation.date,
-        Project.id,
-        Project.name,
-        Client.id,
-        Client.name
+        DailyProjectHours.date,
+        DailyProjectHours.project_id
     ).order_by(
-        TimeAllocation.date
+        DailyProjectHours.date
     ).all()
+    projects = CatalogService.get().projects
 
     # Format results
     report_data = []
     for row in results:
+        project = projects[row.project_id]
         report_data.append({
-            'date': row.date.isoformat(),
-            'project_name': row.project_name,
-            'client_name': row.client_name,
-            'hours': float(row.total_hours)
+            'date': row.date,
+            'project_name': project.name,
+            'client_name': project.client.name,
+            'hours': row.total_hours
         })
 
     return jsonify(report_data), 200
@@ -114,8 +133,20 @@ def get_daily_hours():
 @bp.route('/summary', methods=['GET'])
 @login_required
 def get_summary():
-    """Get billing summary report - to be implemented in Phase 6."""
-    return jsonify({'message': 'Not yet implemented'}), 501
+    """Get billing summary with hours, rates, income and budget use per client and project."""
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+
+    if not start_date or not end_date:
+        return jsonify({'error': 'start_date and end_date parameters are required'}), 400
+
+    try:
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+    return jsonify(BillingService.get_summary(start, end)), 200
 
 
 @bp.route('/daily-summary', methods=['GET'])
@@ -133,24 +164,22 @@ def get_daily_summary():
     except ValueError:
         return {'error': 'Invalid date format. Use YYYY-MM-DD'}, 400
 
-    # Query time allocations for the specific date
+    # Query the daily rollup for the specific date
     results = db.session.query(
-        Project.name.label('project_name'),
-        func.sum(TimeAllocation.hours).label('total_hours')
-    ).join(
-        Project, TimeAllocation.project_id == Project.id
+        DailyProjectHours.project_id,
+        func.sum(DailyProjectHours.hours).label('total_hours')
     ).filter(
-        TimeAllocation.date == target_date
+        DailyProjectHours.date == target_date
     ).group_by(
-        Project.id,
-        Project.name
+        DailyProjectHours.project_id
     ).all()
+    projects = CatalogService.get().projects
 
     # Format results
     report_data = []
     for row in results:
         report_data.append({
-            'project_name': row.project_name,
+            'project_name': projects[row.project_id].name,
             'hours': float(row.total_hours)
         })
 
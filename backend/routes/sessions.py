@@ -1,10 +1,14 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
-from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
 from backend.extensions import db
 from backend.models.work_session import WorkSession
 from backend.middleware.auth_middleware import login_required
+from backend.middleware.conditional import make_etag, is_not_modified, not_modified, with_etag
+from backend.services.calendar_service import CalendarService
+from backend.services.event_service import EventService
 from backend.utils.datetime_utils import parse_datetime_naive, ensure_naive, now_naive
+from backend.utils.sql_utils import begin_write_transaction
 
 bp = Blueprint('sessions', __name__, url_prefix='/api/sessions')
 
@@ -13,49 +17,56 @@ def check_overlap(start_time, end_time, session_date, exclude_session_id=None):
     """
     Check if a session overlaps with any existing sessions on the same date.
     Returns True if there's an overlap, False otherwise.
+
+    Sessions on a date never overlap each other, so only one candidate needs
+    checking: the latest session starting before the new end time. It is a
+    single seek on idx_sessions_date_start_end instead of a scan of the date.
     """
-    query = WorkSession.query.filter(WorkSession.date == session_date)
+    query = db.session.query(WorkSession.start_time, WorkSession.end_time).filter(
+        WorkSession.date == session_date
+    )
 
     if exclude_session_id:
         query = query.filter(WorkSession.id != exclude_session_id)
 
-    # Check for overlaps:
-    # Two sessions overlap if:
-    # (start1 < end2) AND (end1 > start2)
-    # For active sessions (end_time is None), we need special handling
-
+    # An active session (end_time is None) extends indefinitely
     if end_time:
-        # Completed session - check against all sessions
-        overlap = query.filter(
-            or_(
-                # Overlaps with completed sessions
-                and_(
-                    WorkSession.end_time.isnot(None),
-                    WorkSession.start_time < end_time,
-                    WorkSession.end_time > start_time
-                ),
-                # Overlaps with active sessions
-                and_(
-                    WorkSession.end_time.is_(None),
-                    WorkSession.start_time < end_time
-                )
-            )
-        ).first()
-    else:
-        # Active session - check against all sessions
-        overlap = query.filter(
-            or_(
-                # Overlaps with completed sessions
-                and_(
-                    WorkSession.end_time.isnot(None),
-                    WorkSession.end_time > start_time
-                ),
-                # Overlaps with other active sessions
-                WorkSession.end_time.is_(None)
-            )
-        ).first()
-
-    return overlap is not None
+        query = query.filter(WorkSession.start_time < end_time)
+
+    candidate = query.order_by(WorkSession.start_time.desc()).first()
+    if candidate is None:
+        return False
+
+    # Two sessions overlap if (start1 < end2) AND (end1 > start2)
+    candidate_start, candidate_end = candidate
+    return candidate_start >= start_time or candidate_end is None or candidate_end > start_time
+
+
+def commit_session_change():
+    """
+    Commit pending session changes.
+
+    Returns False (after rolling back) if the database rejected the change,
+    i.e. a concurrent write slipped past check_overlap: PostgreSQL's exclusion
+    constraint caught an overlap, or the unique index on open sessions caught
+    a second clock-in.
+    """
+    try:
+        db.session.commit()
+        return True
+    except IntegrityError:
+        db.session.rollback()
+        return False
+
+
+def get_sessions_version(target_date):
+    """Get (row count, latest updated_at) of sessions on a date in one indexed query."""
+    return db.session.query(
+        db.func.count(WorkSession.id),
+        db.func.max(WorkSession.updated_at)
+    ).filter(
+        WorkSession.date == target_date
+    ).one()
 
 
 @bp.route('', methods=['GET'])
@@ -71,6 +82,11 @@ def get_sessions():
     except ValueError:
         return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
 
+    # Answer revalidation requests without loading or serializing any rows
+    etag = make_etag('sessions', target_date, *get_sessions_version(target_date))
+    if is_not_modified(etag):
+        return not_modified(etag)
+
     sessions = WorkSession.query.filter_by(date=target_date).order_by(WorkSession.start_time).all()
 
     # Calculate completed hours (active sessions return 0 from get_duration_hours)
@@ -79,11 +95,11 @@ def get_sessions():
     # Find active session
     active_session = next((s for s in sessions if s.end_time is None), None)
 
-    return jsonify({
+    return with_etag((jsonify({
         'sessions': [s.to_dict() for s in sessions],
         'completed_hours': round(completed_hours, 2),
         'active_session': active_session.to_dict() if active_session else None
-    }), 200
+    }), 200), etag)
 
 
 @bp.route('/clock-in', methods=['POST'])
@@ -91,6 +107,7 @@ def get_sessions():
 def clock_in():
     """Clock in - start a new work session."""
     data = request.get_json() or {}
+    begin_write_transaction()
 
     # Check if already clocked in
     active_session = WorkSession.query.filter_by(end_time=None).first()
@@ -116,9 +133,13 @@ def clock_in():
     )
 
     db.session.add(session)
-    db.session.commit()
+    if not commit_session_change():
+        return jsonify({'error': 'This session overlaps with an existing session'}), 400
+    CalendarService.invalidate(session_date)
 
-    return jsonify({'session': session.to_dict()}), 201
+    session_data = session.to_dict()
+    EventService.publish('session.started', session_date, session=session_data)
+    return jsonify({'session': session_data}), 201
 
 
 @bp.route('/clock-out', methods=['POST'])
@@ -126,6 +147,7 @@ def clock_in():
 def clock_out():
     """Clock out - end the active work session."""
     data = request.get_json() or {}
+    begin_write_transaction()
 
     # Find active session
     active_session = WorkSession.query.filter_by(end_time=None).first()
@@ -148,9 +170,13 @@ def clock_out():
         return jsonify({'error': 'This session overlaps with an existing session'}), 400
 
     active_session.end_time = end_time
-    db.session.commit()
+    if not commit_session_change():
+        return jsonify({'error': 'This session overlaps with an existing session'}), 400
+    CalendarService.invalidate(active_session.date)
 
-    return jsonify({'session': active_session.to_dict()}), 200
+    session_data = active_session.to_dict()
+    EventService.publish('session.stopped', active_session.date, session=session_data)
+    return jsonify({'session': session_data}), 200
 
 
 @bp.route('', methods=['POST'])
@@ -176,6 +202,7 @@ def create_session():
         return jsonify({'error': 'End time must be after start time'}), 400
 
     # Check for overlaps
+    begin_write_transaction()
     if check_overlap(start_time, end_time, session_date):
         return jsonify({'error': 'This session overlaps with an existing session'}), 400
 
@@ -186,40 +213,54 @@ def create_session():
     )
 
     db.session.add(session)
-    db.session.commit()
+    if not commit_session_change():
+        return jsonify({'error': 'This session overlaps with an existing session'}), 400
+    CalendarService.invalidate(session_date)
 
-    return jsonify({'session': session.to_dict()}), 201
+    session_data = session.to_dict()
+    EventService.publish('session.created', session_date, session=session_data)
+    return jsonify({'session': session_data}), 201
 
 
 @bp.route('/<session_id>', methods=['PUT'])
 @login_required
 def update_session(session_id):
     """Update a work session."""
+    begin_write_transaction()
     session = WorkSession.query.get_or_404(session_id)
     data = request.get_json()
 
+    # Validate the new times as locals: assigning them first would autoflush the
+    # UPDATE during check_overlap, before commit_session_change can catch a rejection
+    start_time, end_time = session.start_time, session.end_time
     if 'start_time' in data:
         try:
-            session.start_time = parse_datetime_naive(data['start_time'])
+            start_time = parse_datetime_naive(data['start_time'])
         except ValueError:
             return jsonify({'error': 'Invalid start_time format'}), 400
 
     if 'end_time' in data:
         try:
-            session.end_time = parse_datetime_naive(data['end_time'])
+            end_time = parse_datetime_naive(data['end_time'])
         except ValueError:
             return jsonify({'error': 'Invalid end_time format'}), 400
 
     # Validate end time is after start time
-    if session.end_time and session.end_time <= session.start_time:
+    if end_time and end_time <= start_time:
         return jsonify({'error': 'End time must be after start time'}), 400
 
     # Check for overlaps (excluding the current session being updated)
-    if check_overlap(session.start_time, session.end_time, session.date, session.id):
+    if check_overlap(start_time, end_time, session.date, session.id):
         return jsonify({'error': 'This session overlaps with an existing session'}), 400
 
-    db.session.commit()
-    return jsonify({'session': session.to_dict()}), 200
+    session.start_time, session.end_time = start_time, end_time
+    if not commit_session_change():
+        return jsonify({'error': 'This session overlaps with an existing session'}), 400
+    CalendarService.invalidate(session.date)
+
+    session_data = session.to_dict()
+    EventService.publish('session.updated', session.date, session=session_data)
+    return jsonify({'session': session_data}), 200
 
 
 @bp.route('/<session_id>', methods=['DELETE'])
@@ -227,8 +268,11 @@ def update_session(session_id):
 def delete_session(session_id):
     """Delete a work session."""
     session = WorkSession.query.get_or_404(session_id)
+    session_date = session.date
 
     db.session.delete(session)
     db.session.commit()
+    CalendarService.invalidate(session_date)
+    EventService.publish('session.deleted', session_date, session_id=session_id)
 
     return '', 204
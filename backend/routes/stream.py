@@ -0,0 +1,59 @@
+import time
+from flask import Blueprint, Response, current_app, g, jsonify, request
+from backend.middleware.auth_middleware import login_required
+from backend.services.event_service import EventService
+
+bp = Blueprint('stream', __name__, url_prefix='/api/stream')
+
+# How long EventSource waits before reconnecting after the stream ends
+RETRY_MS = 3000
+
+
+def format_event(event_id, name, data):
+    return f'id: {event_id}\nevent: {name}\ndata: {data}\n\n'
+
+
+@bp.route('', methods=['GET'])
+@login_required
+def stream():
+    """Server-Sent Events stream of the user's session, allocation and day-total changes.
+
+    Starts with a `ready` event; clients should refetch on it, since events
+    published while they were disconnected may no longer be buffered. A
+    reconnecting EventSource sends Last-Event-ID and receives the buffered
+    events after it. The stream ends after STREAM_MAX_SECONDS and the
+    client reconnects, which re-checks the session cookie. Returns 404 when
+    STREAM_ENABLED is off; an EventSource does not retry after that.
+    """
+    if not current_app.config['STREAM_ENABLED']:
+        return jsonify({'error': 'Live updates are disabled'}), 404
+
+    channel = EventService.channel()
+    owner_id = g.owner_id
+    heartbeat = current_app.config['STREAM_HEARTBEAT_SECONDS']
+    lifetime = current_app.config['STREAM_MAX_SECONDS']
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    # Ids from before a restart of an in-memory channel are meaningless
+    after = channel.last_id if last_event_id is None else min(last_event_id, channel.last_id)
+
+    # Runs after the request context is gone: no database or app access in here
+    def generate(after):
+        deadline = time.monotonic() + lifetime
+        yield f'retry: {RETRY_MS}\n' + format_event(after, 'ready', '{}')
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            for event_id, event_owner_id, name, data in channel.wait(after, heartbeat):
+                after = event_id
+                if event_owner_id == owner_id:
+                    yield format_event(event_id, name, data)
+                    last_sent = time.monotonic()
+            if time.monotonic() - last_sent >= heartbeat:
+                # Comments keep proxies from timing out the connection and detect gone clients
+                yield ': keepalive\n\n'
+                last_sent = time.monotonic()
+
+    response = Response(generate(after), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Ask nginx-style proxies not to buffer the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,11 @@
+# Serializers module
+#
+# Batch serializers turn lists of model rows into API dictionaries with a fixed
+# number of queries: client and project details come from the in-process
+# catalog (CatalogService) and hours totals from one grouped aggregate,
+# instead of lazy loads and sums per row.
+from backend.serializers.clients import serialize_clients
+from backend.serializers.projects import serialize_projects
+from backend.serializers.allocations import serialize_allocations
+
+__all__ = ['serialize_clients', 'serialize_projects', 'serialize_allocations']
@@ -0,0 +1,10 @@
+from backend.services.catalog_service import CatalogService
+
+
+def serialize_allocations(allocations):
+    """Serialize allocations, taking project and client names from the catalog.
+
+    Runs no queries beyond the catalog's per-request version check.
+    """
+    projects = CatalogService.get().projects
+    return [allocation.to_dict(project=projects.get(allocation.project_id)) for allocation in allocations]
@@ -0,0 +1,13 @@
+from backend.models.client import Client
+
+
+def serialize_clients(clients, include_hours_logged=False):
+    """Serialize clients, computing hours_logged with one grouped query."""
+    if not include_hours_logged:
+        return [client.to_dict() for client in clients]
+
+    hours_logged = Client.get_hours_logged_for([client.id for client in clients])
+    return [
+        client.to_dict(include_hours_logged=True, hours_logged=hours_logged[client.id])
+        for client in clients
+    ]
@@ -0,0 +1,24 @@
+from backend.models.project import Project
+from backend.services.catalog_service import CatalogService
+
+
+def serialize_projects(projects, include_hours_logged=False):
+    """Serialize projects with their clients from the catalog and hours totals in bulk.
+
+    Runs at most one query regardless of the number of projects, the
+    grouped hours aggregate, besides the catalog's per-request version check.
+    """
+    clients = CatalogService.get().clients
+
+    if not include_hours_logged:
+        return [project.to_dict(client=clients.get(project.client_id)) for project in projects]
+
+    hours_logged = Project.get_hours_logged_for([project.id for project in projects])
+    return [
+        project.to_dict(
+            include_hours_logged=True,
+            hours_logged=hours_logged[project.id],
+            client=clients.get(project.client_id)
+        )
+        for project in projects
+    ]
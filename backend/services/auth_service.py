@@ -1,48 +1,159 @@
+import threading
+import time
 import bcrypt
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from flask import current_app
+from limits import RateLimitItemPerMinute
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
 from backend.extensions import db
+from backend.models.catalog_version import CatalogVersion
 from backend.models.login_attempt import LoginAttempt
+from backend.models.user import User
+
+
+def native_thread_pool(workers: int):
+    """A thread pool of OS threads, also under gevent's monkey-patching.
+
+    Patched threads are greenlets on one OS thread, so bcrypt would stall
+    every other request in a gevent worker while it hashes.
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        monkey = None
+    if monkey is not None and monkey.is_module_patched('threading'):
+        from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+        return NativeThreadPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+
+
+class PasswordVerifierBusy(Exception):
+    """Raised when every password verification slot is taken."""
+
+
+class PasswordVerifier:
+    """Runs bcrypt checks on a small thread pool with a bounded backlog.
+
+    At most `workers + queue_size` verifications are in flight per process;
+    callers beyond that are rejected before any hashing. Queued callers wait
+    on their own request thread, so simultaneous logins are served in turn.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self._executor = native_thread_pool(workers)
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def check(self, password: bytes, password_hash: bytes) -> bool:
+        if not self._slots.acquire(blocking=False):
+            raise PasswordVerifierBusy()
+        try:
+            return self._executor.submit(bcrypt.checkpw, password, password_hash).result()
+        finally:
+            self._slots.release()
 
 
 class AuthService:
-    """Service for handling authentication logic."""
+    """Service for handling authentication logic.
+
+    Rate-limit and lockout decisions use sliding-window counters in
+    LOGIN_THROTTLE_STORAGE_URI, so a login never counts rows. The
+    login_attempts table is an append-only audit log, pruned to
+    LOGIN_AUDIT_RETENTION_DAYS and at most LOGIN_AUDIT_MAX_ROWS rows.
+    """
 
     LOCKOUT_THRESHOLD = 10  # Failed attempts before lockout
     LOCKOUT_DURATION_MINUTES = 30
     RATE_LIMIT_WINDOW_MINUTES = 1
     RATE_LIMIT_MAX_ATTEMPTS = 5
+    PRUNE_INTERVAL_SECONDS = 3600
+
+    # bcrypt hash of a throwaway password, checked for unknown usernames
+    DUMMY_HASH = '$2b$12$nTmv3RMA47ln5.B8HCUu3ut6UqCtvYrJEQySZ8xfyqT.0YfJnSJuq'
+
+    RATE_LIMIT = RateLimitItemPerMinute(RATE_LIMIT_MAX_ATTEMPTS, RATE_LIMIT_WINDOW_MINUTES)
+    LOCKOUT = RateLimitItemPerMinute(LOCKOUT_THRESHOLD, LOCKOUT_DURATION_MINUTES)
+
+    _last_pruned = 0.0
+
+    @staticmethod
+    def _verifier() -> PasswordVerifier:
+        """Get the app's password verifier, creating it on first use."""
+        verifier = current_app.extensions.get('password_verifier')
+        if verifier is None:
+            verifier = current_app.extensions.setdefault('password_verifier', PasswordVerifier(
+                current_app.config['PASSWORD_VERIFY_WORKERS'],
+                current_app.config['PASSWORD_VERIFY_QUEUE_SIZE']
+            ))
+        return verifier
+
+    @staticmethod
+    def normalize_username(username: str) -> str:
+        """Usernames are matched case-insensitively and stored lowercase."""
+        return username.strip().lower()
+
+    @staticmethod
+    def authenticate(username: str, password: str):
+        """Return the active user with this username and password, or None.
+
+        Unknown users are checked against a dummy hash, so response times do
+        not reveal which usernames exist.
+
+        Raises:
+            PasswordVerifierBusy: if the verification pool is saturated
+        """
+        user = User.query.filter_by(username=AuthService.normalize_username(username), is_active=True).first()
+        password_hash = user.password_hash if user and user.password_hash else AuthService.DUMMY_HASH
+
+        matches = AuthService._verifier().check(password.encode('utf-8'), password_hash.encode('utf-8'))
+        return user if matches and user and user.password_hash else None
+
+    @staticmethod
+    def is_active_user(user_id) -> bool:
+        """Whether user_id is an existing, active user (a primary-key read)."""
+        return bool(db.session.execute(
+            db.select(User.is_active).where(User.id == user_id)
+        ).scalar())
 
     @staticmethod
-    def verify_password(password: str) -> bool:
-        """Verify password against stored hash."""
-        password_hash = current_app.config.get('PASSWORD_HASH')
-        if not password_hash:
-            raise ValueError("PASSWORD_HASH not configured")
+    def hash_password(password: str) -> str:
+        """Hash a password with bcrypt's default cost."""
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
-        password_bytes = password.encode('utf-8')
-        hash_bytes = password_hash.encode('utf-8')
+    @staticmethod
+    def create_user(username: str, password_hash: str) -> User:
+        """Create a user with a bcrypt hash and an empty catalog (no commit)."""
+        user = User(username=AuthService.normalize_username(username), password_hash=password_hash)
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(CatalogVersion(owner_id=user.id, version=0))
+        return user
 
-        return bcrypt.checkpw(password_bytes, hash_bytes)
+    @staticmethod
+    def _throttle() -> SlidingWindowCounterRateLimiter:
+        """Get the app's sliding-window counter limiter, creating it on first use."""
+        throttle = current_app.extensions.get('login_throttle')
+        if throttle is None:
+            storage = storage_from_string(current_app.config['LOGIN_THROTTLE_STORAGE_URI'])
+            throttle = current_app.extensions.setdefault(
+                'login_throttle', SlidingWindowCounterRateLimiter(storage)
+            )
+        return throttle
 
     @staticmethod
     def check_rate_limit(ip_address: str) -> tuple[bool, int]:
         """
-        Check if IP address has exceeded rate limit.
+        Count a login attempt against the IP address's rate limit.
+
+        Attempts over the limit are rejected and not counted.
 
         Returns:
             (is_allowed, attempts_remaining)
         """
-        window_start = datetime.utcnow() - timedelta(minutes=AuthService.RATE_LIMIT_WINDOW_MINUTES)
-
-        recent_attempts = LoginAttempt.query.filter(
-            LoginAttempt.ip_address == ip_address,
-            LoginAttempt.attempted_at >= window_start
-        ).count()
-
-        attempts_remaining = max(0, AuthService.RATE_LIMIT_MAX_ATTEMPTS - recent_attempts)
-        is_allowed = recent_attempts < AuthService.RATE_LIMIT_MAX_ATTEMPTS
-
+        throttle = AuthService._throttle()
+        is_allowed = throttle.hit(AuthService.RATE_LIMIT, 'login', ip_address)
+        attempts_remaining = throttle.get_window_stats(AuthService.RATE_LIMIT, 'login', ip_address).remaining
         return is_allowed, attempts_remaining
 
     @staticmethod
@@ -53,44 +164,53 @@ class AuthService:
         Returns:
             (is_locked_out, minutes_remaining)
         """
-        lockout_window = datetime.utcnow() - timedelta(minutes=AuthService.LOCKOUT_DURATION_MINUTES)
-
-        failed_attempts = LoginAttempt.query.filter(
-            LoginAttempt.ip_address == ip_address,
-            LoginAttempt.success == False,
-            LoginAttempt.attempted_at >= lockout_window
-        ).count()
+        throttle = AuthService._throttle()
+        if throttle.test(AuthService.LOCKOUT, 'login-failures', ip_address):
+            return False, 0
 
-        if failed_attempts >= AuthService.LOCKOUT_THRESHOLD:
-            # Find the oldest failed attempt in the window
-            oldest_attempt = LoginAttempt.query.filter(
-                LoginAttempt.ip_address == ip_address,
-                LoginAttempt.success == False,
-                LoginAttempt.attempted_at >= lockout_window
-            ).order_by(LoginAttempt.attempted_at.asc()).first()
-
-            if oldest_attempt:
-                lockout_end = oldest_attempt.attempted_at + timedelta(minutes=AuthService.LOCKOUT_DURATION_MINUTES)
-                minutes_remaining = int((lockout_end - datetime.utcnow()).total_seconds() / 60) + 1
-                return True, max(0, minutes_remaining)
-
-        return False, 0
+        reset_time = throttle.get_window_stats(AuthService.LOCKOUT, 'login-failures', ip_address).reset_time
+        minutes_remaining = int((reset_time - time.time()) / 60) + 1
+        return True, max(0, minutes_remaining)
 
     @staticmethod
     def record_login_attempt(ip_address: str, success: bool):
-        """Record a login attempt in the database."""
-        attempt = LoginAttempt(
+        """Record a login attempt: count failures and append to the audit log."""
+        if not success:
+            AuthService._throttle().hit(AuthService.LOCKOUT, 'login-failures', ip_address)
+
+        db.session.add(LoginAttempt(
             ip_address=ip_address,
             success=success
-        )
-        db.session.add(attempt)
+        ))
+        if time.monotonic() - AuthService._last_pruned >= AuthService.PRUNE_INTERVAL_SECONDS:
+            AuthService._last_pruned = time.monotonic()
+            AuthService._prune()
         db.session.commit()
 
     @staticmethod
     def clear_failed_attempts(ip_address: str):
-        """Clear failed login attempts for an IP address after successful login."""
-        LoginAttempt.query.filter(
-            LoginAttempt.ip_address == ip_address,
-            LoginAttempt.success == False
-        ).delete()
+        """Reset an IP address's failure count after a successful login."""
+        AuthService._throttle().clear(AuthService.LOCKOUT, 'login-failures', ip_address)
+
+    @staticmethod
+    def _prune():
+        """Delete audit rows past retention, then the oldest rows over the row cap."""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=current_app.config['LOGIN_AUDIT_RETENTION_DAYS'])
+        db.session.execute(db.delete(LoginAttempt).where(LoginAttempt.attempted_at < cutoff))
+
+        # attempted_at of the newest row that no longer fits under the cap
+        overflow = db.select(LoginAttempt.attempted_at).order_by(
+            LoginAttempt.attempted_at.desc()
+        ).offset(current_app.config['LOGIN_AUDIT_MAX_ROWS']).limit(1).scalar_subquery()
+        db.session.execute(db.delete(LoginAttempt).where(LoginAttempt.attempted_at <= overflow))
+
+    @staticmethod
+    def prune_audit_log() -> int:
+        """Apply audit log retention now.
+
+        Returns:
+            Number of login_attempts rows left
+        """
+        AuthService._prune()
         db.session.commit()
+        return db.session.query(db.func.count(LoginAttempt.id)).scalar()
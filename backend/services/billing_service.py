@@ -0,0 +1,157 @@
+from decimal import Decimal
+from sqlalchemy import func
+from backend.extensions import db
+from backend.models.client import Client
+from backend.models.daily_project_hours import DailyProjectHours
+from backend.models.project import Project
+
+CENT = Decimal('0.01')
+
+
+def to_decimal(value) -> Decimal:
+    """Convert a numeric DB value (Decimal, float or None) to a 2-place Decimal."""
+    if value is None:
+        return Decimal('0.00')
+    return Decimal(str(value)).quantize(CENT)
+
+
+def budget_used_percent(hours_logged: Decimal, hour_budget):
+    """Percentage of an hour budget consumed, or None without a budget."""
+    if not hour_budget:
+        return None
+    return float((hours_logged * 100 / Decimal(str(hour_budget))).quantize(CENT))
+
+
+class BillingService:
+    """Service for the billing summary report."""
+
+    @staticmethod
+    def _project_totals(start, end):
+        """
+        Aggregate per-project hours and income for a date range in one query.
+
+        The effective rate (project override, else client default) and income
+        are computed in SQL over a range scan of the daily rollup. Lifetime
+        hours for budget consumption are summed only for projects of clients
+        with hours in the range; rows cover each of those projects (hours is
+        None without hours in the range), ordered by currency, client and project.
+        """
+        range_hours = db.select(
+            DailyProjectHours.project_id, func.sum(DailyProjectHours.hours).label('hours')
+        ).where(
+            DailyProjectHours.date.between(start, end)
+        ).group_by(DailyProjectHours.project_id).subquery()
+
+        billed_clients = db.select(Project.client_id).join(range_hours, range_hours.c.project_id == Project.id)
+        billed_projects = db.select(Project.id).where(Project.client_id.in_(billed_clients))
+        lifetime_hours = db.select(
+            DailyProjectHours.project_id, func.sum(DailyProjectHours.hours).label('hours')
+        ).where(
+            DailyProjectHours.project_id.in_(billed_projects)
+        ).group_by(DailyProjectHours.project_id).subquery()
+
+        effective_rate = func.coalesce(Project.hourly_rate_override, Client.default_hourly_rate)
+        return db.session.execute(db.select(
+            Client.id.label('client_id'),
+            Client.name.label('client_name'),
+            Client.currency,
+            Client.hour_budget.label('client_hour_budget'),
+            Project.id.label('project_id'),
+            Project.name.label('project_name'),
+            Project.hour_budget.label('project_hour_budget'),
+            effective_rate.label('effective_rate'),
+            range_hours.c.hours,
+            (range_hours.c.hours * effective_rate).label('income'),
+            lifetime_hours.c.hours.label('hours_logged')
+        ).join(
+            Client, Project.client_id == Client.id
+        ).join(
+            lifetime_hours, lifetime_hours.c.project_id == Project.id
+        ).outerjoin(
+            range_hours, range_hours.c.project_id == Project.id
+        ).order_by(
+            Client.currency,
+            Client.name,
+            Project.name
+        )).all()
+
+    @staticmethod
+    def get_summary(start, end) -> dict:
+        """
+        Build the billing summary for start <= date <= end.
+
+        Returns:
+            Per-currency totals, each with per-client totals and per-project rows.
+            Clients and projects without hours in the range are omitted.
+        """
+        currencies = {}
+        for row in BillingService._project_totals(start, end):
+            currency = currencies.setdefault(row.currency, {
+                'currency': row.currency,
+                'hours': Decimal('0.00'),
+                'income': Decimal('0.00'),
+                'clients': {}
+            })
+            client = currency['clients'].setdefault(row.client_id, {
+                'client_id': row.client_id,
+                'client_name': row.client_name,
+                'hours': Decimal('0.00'),
+                'income': Decimal('0.00'),
+                'hours_logged': Decimal('0.00'),
+                'hour_budget': row.client_hour_budget,
+                'projects': []
+            })
+
+            hours = to_decimal(row.hours)
+            income = to_decimal(row.income)
+            hours_logged = to_decimal(row.hours_logged)
+
+            client['hours_logged'] += hours_logged
+            if not hours:
+                continue
+
+            client['hours'] += hours
+            client['income'] += income
+            currency['hours'] += hours
+            currency['income'] += income
+            client['projects'].append({
+                'project_id': row.project_id,
+                'project_name': row.project_name,
+                'hours': hours,
+                'effective_hourly_rate': to_decimal(row.effective_rate),
+                'income': income,
+                'hour_budget': row.project_hour_budget or None,
+                'hours_logged': hours_logged,
+                'budget_used_percent': budget_used_percent(hours_logged, row.project_hour_budget)
+            })
+
+        summary = []
+        for currency in currencies.values():
+            clients = []
+            for client in currency['clients'].values():
+                if not client['projects']:
+                    continue
+                clients.append({
+                    'client_id': client['client_id'],
+                    'client_name': client['client_name'],
+                    'hours': client['hours'],
+                    'effective_hourly_rate': (client['income'] / client['hours']).quantize(CENT),
+                    'income': client['income'],
+                    'hour_budget': client['hour_budget'] or None,
+                    'hours_logged': client['hours_logged'],
+                    'budget_used_percent': budget_used_percent(client['hours_logged'], client['hour_budget']),
+                    'projects': client['projects']
+                })
+            if clients:
+                summary.append({
+                    'currency': currency['currency'],
+                    'hours': currency['hours'],
+                    'income': currency['income'],
+                    'clients': clients
+                })
+
+        return {
+            'start_date': start,
+            'end_date': end,
+            'currencies': summary
+        }
@@ -0,0 +1,196 @@
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import case, func
+from backend.extensions import db
+from backend.models.daily_project_hours import DailyProjectHours
+from backend.models.time_allocation import TimeAllocation
+from backend.models.work_session import WorkSession
+from backend.utils.datetime_utils import month_bounds
+from backend.utils.sql_utils import duration_seconds
+from backend.utils.tenancy import current_owner_id
+
+
+def get_date_totals(target_date):
+    """Get (completed_seconds, active_start, allocated_hours) for a date in one statement.
+
+    Each value is a scalar subquery over the date's index, so no ORM rows are
+    loaded. completed_seconds skips an active session (NULL end_time), whose
+    start_time is returned separately as active_start (None if there is none).
+    """
+    completed_seconds, active_start, allocated_hours = db.session.execute(db.select(
+        db.select(
+            db.func.sum(duration_seconds(WorkSession.start_time, WorkSession.end_time))
+        ).where(WorkSession.date == target_date).scalar_subquery(),
+        db.select(
+            db.func.max(WorkSession.start_time)
+        ).where(WorkSession.date == target_date, WorkSession.end_time.is_(None)).scalar_subquery(),
+        db.select(
+            db.func.sum(TimeAllocation.hours)
+        ).where(TimeAllocation.date == target_date).scalar_subquery()
+    )).one()
+    return (
+        float(completed_seconds) if completed_seconds else 0.0,
+        active_start,
+        float(allocated_hours) if allocated_hours else 0.0
+    )
+
+
+def get_clocked_hours(completed_seconds, active_start, current_time=None):
+    """Add elapsed hours of an active session to completed session time.
+
+    Args:
+        current_time: The client's current local time (naive datetime).
+                      If None, falls back to server's datetime.now().
+    """
+    hours = completed_seconds / 3600
+    if active_start is not None:
+        now = current_time if current_time else datetime.now()
+        hours += (now - active_start).total_seconds() / 3600
+    return hours
+
+
+class CalendarService:
+    """Service for per-day calendar totals, cached per month.
+
+    Each cached (owner, year, month) maps date -> (clocked_hours, allocated_hours,
+    has_active_session) for days with any data. The cache is per process, so
+    each entry is stored with the month's version stamp (see _month_versions)
+    and reloaded when another worker's write has changed it. Write paths also
+    call invalidate(date) after committing to drop the local entry early.
+    """
+
+    _cache = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def invalidate(target_date):
+        """Drop the current owner's cached month containing target_date."""
+        with CalendarService._lock:
+            CalendarService._cache.pop((current_owner_id(), target_date.year, target_date.month), None)
+
+    @staticmethod
+    def clear():
+        """Drop all cached months."""
+        with CalendarService._lock:
+            CalendarService._cache.clear()
+
+    @staticmethod
+    def _months_between(start, end):
+        """List (year, month) pairs touched by the inclusive range start..end."""
+        months = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return months
+
+    @staticmethod
+    def _month_versions(months):
+        """
+        Get a version stamp per (year, month) in one query.
+
+        Covers the row count and latest updated_at of the month's sessions and
+        allocations, like get_allocations_version does for a single date.
+        """
+        columns = []
+        for year, month in months:
+            start, end = month_bounds(year, month)
+            for model in (WorkSession, TimeAllocation):
+                criteria = (model.date >= start, model.date < end)
+                columns += [
+                    db.select(func.count()).select_from(model).where(*criteria).scalar_subquery(),
+                    db.select(func.max(model.updated_at)).where(*criteria).scalar_subquery()
+                ]
+        row = db.session.execute(db.select(*columns)).one()
+        return {month: tuple(row[index * 4:index * 4 + 4]) for index, month in enumerate(months)}
+
+    @staticmethod
+    def _load_totals(start, end):
+        """
+        Aggregate per-day totals for start <= date < end with two grouped queries.
+
+        Returns:
+            dict of date -> (clocked_hours, allocated_hours, has_active_session)
+        """
+        sessions = db.session.query(
+            WorkSession.date,
+            func.sum(duration_seconds(WorkSession.start_time, WorkSession.end_time)).label('seconds'),
+            func.sum(case((WorkSession.end_time.is_(None), 1), else_=0)).label('active')
+        ).filter(
+            WorkSession.date >= start,
+            WorkSession.date < end
+        ).group_by(WorkSession.date).all()
+
+        allocations = db.session.query(
+            DailyProjectHours.date,
+            func.sum(DailyProjectHours.hours).label('hours')
+        ).filter(
+            DailyProjectHours.date >= start,
+            DailyProjectHours.date < end
+        ).group_by(DailyProjectHours.date).all()
+
+        totals = {}
+        for row in sessions:
+            # SUM skips active sessions (NULL end_time), matching completed-hours semantics
+            clocked = float(row.seconds) / 3600 if row.seconds else 0.0
+            totals[row.date] = (clocked, 0.0, bool(row.active))
+        for row in allocations:
+            clocked, _, active = totals.get(row.date, (0.0, 0.0, False))
+            totals[row.date] = (clocked, float(row.hours), active)
+        return totals
+
+    @staticmethod
+    def get_days(start, end):
+        """
+        Get calendar entries for every day in the inclusive range start..end.
+
+        Months whose version stamp changed (or that were never cached) are
+        loaded together in one pair of queries.
+        """
+        owner_id = current_owner_id()
+        versions = {
+            (owner_id, *month): version
+            for month, version in CalendarService._month_versions(
+                CalendarService._months_between(start, end)
+            ).items()
+        }
+        months = list(versions)
+
+        with CalendarService._lock:
+            cached = {
+                key: entry for key, entry in
+                ((key, CalendarService._cache.get(key)) for key in months)
+                if entry and entry[0] == versions[key]
+            }
+        missing = [key for key in months if key not in cached]
+
+        if missing:
+            load_start, _ = month_bounds(*missing[0][1:])
+            _, load_end = month_bounds(*missing[-1][1:])
+            totals = CalendarService._load_totals(load_start, load_end)
+
+            per_month = {key: {} for key in missing}
+            for day, values in totals.items():
+                key = (owner_id, day.year, day.month)
+                if key in per_month:
+                    per_month[key][day] = values
+
+            with CalendarService._lock:
+                for key, days in per_month.items():
+                    CalendarService._cache[key] = cached[key] = (versions[key], days)
+
+        days = []
+        current = start
+        while current <= end:
+            clocked, allocated, active = cached[(owner_id, current.year, current.month)][1].get(
+                current, (0.0, 0.0, False)
+            )
+            days.append({
+                'date': current,
+                'clocked_hours': round(clocked, 2),
+                'allocated_hours': round(allocated, 2),
+                'unallocated_hours': round(max(0.0, clocked - allocated), 2),
+                'has_active_session': active
+            })
+            current += timedelta(days=1)
+        return days
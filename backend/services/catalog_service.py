@@ -0,0 +1,122 @@
+from collections import namedtuple
+from flask import current_app, g, has_request_context
+from backend.extensions import db
+from backend.models.catalog_version import CatalogVersion
+from backend.models.client import Client
+from backend.models.project import Project
+from backend.utils.tenancy import current_owner_id
+
+CatalogClient = namedtuple(
+    'CatalogClient',
+    'id name short_name currency default_hourly_rate hour_budget is_active is_archived'
+)
+CatalogProject = namedtuple(
+    'CatalogProject',
+    'id client_id client name short_name hourly_rate_override effective_hourly_rate '
+    'hour_budget is_active is_archived'
+)
+
+
+class Catalog:
+    """Immutable snapshot of one user's clients and projects, keyed by id."""
+
+    __slots__ = ('version', 'clients', 'projects')
+
+    def __init__(self, version, clients, projects):
+        self.version = version
+        self.clients = clients
+        self.projects = projects
+
+
+class CatalogService:
+    """Service for the in-process client/project catalog cache.
+
+    Allocation serialization, reports and imports read names, currencies and
+    rates from the catalog instead of joining clients and projects. Each
+    worker keeps one snapshot per user and checks it against the user's
+    catalog_version row once per request, a primary-key read; client and
+    project writes call bump_version() before committing, so every worker
+    reloads on its next request after the commit.
+    """
+
+    @staticmethod
+    def version_subquery():
+        """The catalog version as a scalar subquery, to read it alongside another query."""
+        return db.select(CatalogVersion.version).where(
+            CatalogVersion.owner_id == current_owner_id()
+        ).scalar_subquery()
+
+    @staticmethod
+    def remember_version(version) -> int:
+        """Use a version read through version_subquery() for the rest of the request."""
+        version = version or 0
+        if has_request_context():
+            g.catalog_version = version
+        return version
+
+    @staticmethod
+    def current_version() -> int:
+        """Read the committed catalog version, once per request."""
+        if has_request_context() and 'catalog_version' in g:
+            return g.catalog_version
+        version = db.session.execute(db.select(CatalogService.version_subquery())).scalar()
+        return CatalogService.remember_version(version)
+
+    @staticmethod
+    def bump_version():
+        """Mark the catalog changed; call before committing a client or project write."""
+        table = CatalogVersion.__table__
+        updated = db.session.execute(
+            table.update().where(table.c.owner_id == current_owner_id()).values(version=table.c.version + 1)
+        ).rowcount
+        if not updated:
+            # Users created outside AuthService.create_user start without the row
+            db.session.execute(table.insert().values(owner_id=current_owner_id(), version=1))
+        if has_request_context():
+            g.pop('catalog_version', None)
+            # Later reads in this request see uncommitted changes; never cache them
+            g.catalog_dirty = True
+
+    @staticmethod
+    def get() -> Catalog:
+        """Get the current catalog, reloading it if another worker changed it."""
+        owner_id = current_owner_id()
+        version = CatalogService.current_version()
+        if owner_id is None or (has_request_context() and g.get('catalog_dirty')):
+            return CatalogService._load(version)
+
+        catalogs = current_app.extensions.setdefault('catalog', {})
+        catalog = catalogs.get(owner_id)
+        if catalog is None or catalog.version != version:
+            catalog = catalogs[owner_id] = CatalogService._load(version)
+        return catalog
+
+    @staticmethod
+    def _load(version) -> Catalog:
+        """Load the owner's clients and projects with two plain selects."""
+        clients = {
+            row.id: CatalogClient(*row)
+            for row in db.session.execute(db.select(
+                Client.id, Client.name, Client.short_name, Client.currency, Client.default_hourly_rate,
+                Client.hour_budget, Client.is_active, Client.is_archived
+            ))
+        }
+        projects = {}
+        for row in db.session.execute(db.select(
+            Project.id, Project.client_id, Project.name, Project.short_name, Project.hourly_rate_override,
+            Project.hour_budget, Project.is_active, Project.is_archived
+        )):
+            client = clients[row.client_id]
+            projects[row.id] = CatalogProject(
+                id=row.id,
+                client_id=row.client_id,
+                client=client,
+                name=row.name,
+                short_name=row.short_name,
+                hourly_rate_override=row.hourly_rate_override,
+                effective_hourly_rate=row.hourly_rate_override or client.default_hourly_rate,
+                hour_budget=row.hour_budget,
+                is_active=row.is_active,
+                is_archived=row.is_archived
+            )
+        return Catalog(version, clients, projects)
@@ -0,0 +1,53 @@
+import logging
+import sqlite3
+from flask import current_app
+from backend.services.calendar_service import get_date_totals
+from backend.utils.event_channel import channel_from_uri
+from backend.utils.tenancy import current_owner_id
+
+logger = logging.getLogger(__name__)
+
+
+class EventService:
+    """Service for publishing live-update events to /api/stream.
+
+    Write paths call publish() after committing. Every event concerns one
+    day of the current user and carries that day's totals as of the write,
+    so open trackers can update without refetching. Events go through the
+    EVENT_CHANNEL_URI channel, which fans them out to the user's streams in
+    every worker.
+    """
+
+    @staticmethod
+    def channel():
+        """Get the app's event channel, creating it on first use."""
+        channel = current_app.extensions.get('event_channel')
+        if channel is None:
+            channel = current_app.extensions.setdefault(
+                'event_channel', channel_from_uri(current_app.config['EVENT_CHANNEL_URI'])
+            )
+        return channel
+
+    @staticmethod
+    def get_day_totals(target_date) -> dict:
+        """Totals for a day, shaped like the sessions and allocations responses."""
+        completed_seconds, active_start, total_allocated = get_date_totals(target_date)
+        return {
+            'completed_hours': round(completed_seconds / 3600, 2),
+            'total_allocated': round(total_allocated, 2),
+            'active_session_start': active_start
+        }
+
+    @staticmethod
+    def publish(name, target_date, **data):
+        """
+        Publish an event about target_date, e.g. publish('session.started', date, session=...).
+
+        A failed notification is logged, never raised: the write it reports
+        has already been committed.
+        """
+        payload = {'date': target_date, **data, 'totals': EventService.get_day_totals(target_date)}
+        try:
+            EventService.channel().publish(current_owner_id(), name, current_app.json.dumps_line(payload))
+        except (sqlite3.Error, OSError):
+            logger.warning('Could not publish %s event', name, exc_info=True)
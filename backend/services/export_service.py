@@ -0,0 +1,160 @@
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+from flask import current_app
+from sqlalchemy import and_, or_, select
+from backend.extensions import db
+from backend.models.client import Client
+from backend.models.project import Project
+from backend.models.time_allocation import TimeAllocation
+from backend.models.work_session import WorkSession
+from backend.utils.datetime_utils import ensure_naive
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+ALLOCATION_FIELDS = ['id', 'date', 'client_name', 'project_name', 'hours', 'notes']
+SESSION_FIELDS = ['id', 'date', 'start_time', 'end_time', 'duration_hours']
+
+
+def csv_value(value):
+    """Format a row value for CSV the way the JSON encoder would."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class ExportService:
+    """Service for streaming large date-range exports.
+
+    Rows are read in keyset-paginated pages (ordered by a unique key, each page
+    starting after the last key of the previous one) as plain result rows, never
+    ORM objects, and encoded one line at a time. Memory use depends on the page
+    size, not on the size of the date range.
+    """
+
+    PAGE_SIZE = 1000
+
+    @staticmethod
+    def _paginate(build_query, key_columns):
+        """
+        Yield rows from build_query() page by page using keyset pagination.
+
+        build_query(after) must return a select ordered by key_columns and
+        filtered to rows after the given key tuple (or unfiltered when None).
+        """
+        after = None
+        while True:
+            stmt = build_query(after).limit(ExportService.PAGE_SIZE).execution_options(
+                yield_per=ExportService.PAGE_SIZE
+            )
+            count = 0
+            for row in db.session.execute(stmt):
+                count += 1
+                after = tuple(getattr(row, column.key) for column in key_columns)
+                yield row
+            if count < ExportService.PAGE_SIZE:
+                return
+
+    @staticmethod
+    def _after(key_columns, after):
+        """Build '(col1, col2) > (v1, v2)' portably as nested OR/AND."""
+        (first, *rest), (value, *rest_values) = key_columns, after
+        if not rest:
+            return first > value
+        return or_(first > value, and_(first == value, ExportService._after(rest, rest_values)))
+
+    @staticmethod
+    def iter_allocations(start, end):
+        """Yield allocation dicts for start <= date <= end, ordered by date."""
+        key_columns = [TimeAllocation.date, TimeAllocation.id]
+
+        def build_query(after):
+            stmt = select(
+                TimeAllocation.id,
+                TimeAllocation.date,
+                Client.name.label('client_name'),
+                Project.name.label('project_name'),
+                TimeAllocation.hours,
+                TimeAllocation.notes
+            ).join(
+                Project, TimeAllocation.project_id == Project.id
+            ).join(
+                Client, Project.client_id == Client.id
+            ).where(
+                TimeAllocation.date >= start,
+                TimeAllocation.date <= end
+            ).order_by(*key_columns)
+            if after is not None:
+                stmt = stmt.where(ExportService._after(key_columns, after))
+            return stmt
+
+        for row in ExportService._paginate(build_query, key_columns):
+            yield {
+                'id': row.id,
+                'date': row.date,
+                'client_name': row.client_name,
+                'project_name': row.project_name,
+                'hours': row.hours,
+                'notes': row.notes
+            }
+
+    @staticmethod
+    def iter_sessions(start, end):
+        """Yield work session dicts for start <= date <= end, ordered by start time."""
+        key_columns = [WorkSession.start_time, WorkSession.id]
+
+        def build_query(after):
+            stmt = select(
+                WorkSession.id,
+                WorkSession.date,
+                WorkSession.start_time,
+                WorkSession.end_time
+            ).where(
+                WorkSession.date >= start,
+                WorkSession.date <= end
+            ).order_by(*key_columns)
+            if after is not None:
+                stmt = stmt.where(ExportService._after(key_columns, after))
+            return stmt
+
+        for row in ExportService._paginate(build_query, key_columns):
+            start_time = ensure_naive(row.start_time)
+            end_time = ensure_naive(row.end_time)
+            duration = (end_time - start_time).total_seconds() / 3600 if end_time else None
+            yield {
+                'id': row.id,
+                'date': row.date,
+                'start_time': start_time,
+                'end_time': end_time,
+                'duration_hours': round(duration, 2) if duration is not None else None
+            }
+
+    @staticmethod
+    def encode(rows, fields, export_format):
+        """Encode row dicts as CSV (with header) or NDJSON, one chunk per row."""
+        if export_format == 'ndjson':
+            dumps = current_app.json.dumps_line
+            for row in rows:
+                yield dumps(row) + '\n'
+            return
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+
+        def flush():
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
+        writer.writeheader()
+        yield flush()
+        for row in rows:
+            writer.writerow({key: csv_value(value) for key, value in row.items()})
+            yield flush()
@@ -0,0 +1,363 @@
+import csv
+import uuid
+from bisect import bisect_left, insort
+from collections import defaultdict, namedtuple
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+from sqlalchemy.exc import IntegrityError
+from backend.extensions import db
+from backend.models.time_allocation import TimeAllocation
+from backend.models.work_session import WorkSession
+from backend.services.calendar_service import CalendarService
+from backend.services.catalog_service import CatalogService
+from backend.services.rollup_service import RollupService
+from backend.utils.datetime_utils import parse_datetime_naive
+from backend.utils.sql_utils import begin_write_transaction
+
+# One timesheet row, normalized. start/end are None for hours-only sources (Harvest).
+ImportEntry = namedtuple('ImportEntry', 'line date start end client project hours notes')
+
+IMPORT_FORMATS = ('toggl', 'harvest', 'ics')
+
+OPEN_END = datetime.max
+
+
+class ImportRowError(ValueError):
+    """A row that cannot be parsed; parsers yield these in place of entries."""
+
+
+class ImportConflictError(RuntimeError):
+    """The database rejected the import's rows because of a concurrent write; nothing was written."""
+
+
+def _hours_between(start, end) -> Decimal:
+    return (Decimal(int((end - start).total_seconds())) / 3600).quantize(Decimal('0.01'))
+
+
+def parse_toggl(lines):
+    """Yield entries from a Toggl Track detailed CSV export."""
+    for line, row in enumerate(csv.DictReader(lines), start=2):
+        try:
+            start = datetime.strptime(f"{row['Start date']} {row['Start time']}", '%Y-%m-%d %H:%M:%S')
+            end = datetime.strptime(f"{row['End date']} {row['End time']}", '%Y-%m-%d %H:%M:%S')
+        except (KeyError, TypeError, ValueError):
+            yield line, ImportRowError('Invalid or missing Start/End date and time')
+            continue
+        yield line, ImportEntry(
+            line, start.date(), start, end, (row.get('Client') or '').strip(),
+            (row.get('Project') or '').strip(), _hours_between(start, end),
+            row.get('Description') or None
+        )
+
+
+def parse_harvest(lines):
+    """Yield entries from a Harvest detailed time CSV export (hours only)."""
+    for line, row in enumerate(csv.DictReader(lines), start=2):
+        try:
+            entry_date = datetime.strptime(row['Date'], '%Y-%m-%d').date()
+            hours = Decimal(row['Hours']).quantize(Decimal('0.01'))
+        except (KeyError, TypeError, ValueError, InvalidOperation):
+            yield line, ImportRowError('Invalid or missing Date/Hours')
+            continue
+        yield line, ImportEntry(
+            line, entry_date, None, None, (row.get('Client') or '').strip(),
+            (row.get('Project') or '').strip(), hours, row.get('Notes') or None
+        )
+
+
+def _ics_datetime(value):
+    """Parse an ICS DATE-TIME value as naive local time (zone suffixes are dropped)."""
+    value = value.strip()
+    if len(value) >= 15:
+        return parse_datetime_naive(
+            f'{value[0:4]}-{value[4:6]}-{value[6:8]}T{value[9:11]}:{value[11:13]}:{value[13:15]}'
+        )
+    raise ValueError(f'Unsupported DATE-TIME value: {value}')
+
+
+def _ics_unfold(lines):
+    """Yield (line_number, logical_line) with RFC 5545 continuation lines joined."""
+    current, current_line = None, 0
+    for number, raw in enumerate(lines, start=1):
+        raw = raw.rstrip('\r\n')
+        if raw[:1] in (' ', '\t') and current is not None:
+            current += raw[1:]
+            continue
+        if current is not None:
+            yield current_line, current
+        current, current_line = raw, number
+    if current is not None:
+        yield current_line, current
+
+
+def parse_ics(lines):
+    """Yield entries from VEVENTs of an iCalendar file.
+
+    The SUMMARY names the project as 'Client / Project', 'Client: Project'
+    or just the project name; DESCRIPTION becomes the notes.
+    """
+    event, start_line = None, 0
+    for line, content in _ics_unfold(lines):
+        if content == 'BEGIN:VEVENT':
+            event, start_line = {}, line
+            continue
+        if event is None:
+            continue
+        if content == 'END:VEVENT':
+            try:
+                start = _ics_datetime(event['DTSTART'])
+                end = _ics_datetime(event['DTEND'])
+            except (KeyError, ValueError):
+                yield start_line, ImportRowError('VEVENT needs DTSTART and DTEND date-times')
+                event = None
+                continue
+            summary = event.get('SUMMARY', '').replace('\\,', ',').strip()
+            client, project = '', summary
+            for separator in (' / ', ': '):
+                if separator in summary:
+                    client, project = (part.strip() for part in summary.split(separator, 1))
+                    break
+            notes = event.get('DESCRIPTION', '').replace('\\n', '\n').replace('\\,', ',') or None
+            yield start_line, ImportEntry(
+                start_line, start.date(), start, end, client, project, _hours_between(start, end), notes
+            )
+            event = None
+            continue
+        name, _, value = content.partition(':')
+        event[name.split(';', 1)[0].upper()] = value
+
+
+PARSERS = {
+    'toggl': parse_toggl,
+    'harvest': parse_harvest,
+    'ics': parse_ics,
+}
+
+
+class ProjectResolver:
+    """Maps client/project names from a timesheet to project ids using the cached catalog."""
+
+    def __init__(self):
+        self.by_client_and_name = {}
+        by_name = defaultdict(set)
+        for project in CatalogService.get().projects.values():
+            for client_key in filter(None, (project.client.name, project.client.short_name)):
+                for project_key in filter(None, (project.name, project.short_name)):
+                    self.by_client_and_name[(client_key.lower(), project_key.lower())] = project.id
+            for project_key in filter(None, (project.name, project.short_name)):
+                by_name[project_key.lower()].add(project.id)
+        # Project names alone only resolve when unambiguous
+        self.by_name = {key: ids.pop() for key, ids in by_name.items() if len(ids) == 1}
+
+    def resolve(self, client, project):
+        project_key = project.lower()
+        if client:
+            return self.by_client_and_name.get((client.lower(), project_key))
+        return self.by_name.get(project_key)
+
+
+class DayState:
+    """In-memory view of one date: session intervals plus clocked/allocated hours."""
+
+    __slots__ = ('intervals', 'clocked', 'allocated')
+
+    def __init__(self):
+        self.intervals = []  # sorted (start, end) with OPEN_END for active sessions
+        self.clocked = Decimal('0')
+        self.allocated = Decimal('0')
+
+    def overlaps(self, start, end):
+        """Check [start, end) against known intervals in O(log n)."""
+        index = bisect_left(self.intervals, (start, start))
+        if index > 0 and self.intervals[index - 1][1] > start:
+            return True
+        return index < len(self.intervals) and self.intervals[index][0] < end
+
+    def add(self, start, end):
+        insort(self.intervals, (start, end))
+
+    def first_gap(self, not_before, duration):
+        """Return the earliest start >= not_before where duration fits, or None."""
+        candidate = not_before
+        for start, end in self.intervals:
+            if end <= candidate:
+                continue
+            if start >= candidate + duration:
+                break
+            if end == OPEN_END:
+                return None
+            candidate = end
+        return candidate
+
+
+class ImportService:
+    """Service for bulk timesheet imports.
+
+    The file is parsed as a stream and processed in chunks. Existing sessions
+    and allocation totals are loaded once per new date (two queries per chunk),
+    overlaps and clocked-time limits are checked in memory, and accepted rows
+    are bulk-inserted with executemany in a single transaction. Unless it is a
+    dry run, that transaction holds the write lock from the first load, and
+    run() raises ImportConflictError if a concurrent write still gets in.
+    """
+
+    CHUNK_SIZE = 5000
+    MAX_REPORTED_CONFLICTS = 1000
+    DAY_START = time(9, 0)
+
+    def __init__(self, source_format, dry_run=False):
+        if source_format not in PARSERS:
+            raise ValueError(f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+        self.parse = PARSERS[source_format]
+        self.dry_run = dry_run
+        self.resolver = ProjectResolver()
+        self.days = {}
+        self.sessions = []
+        self.allocations = []
+        self.untimed = defaultdict(list)
+        self.rows_read = 0
+        self.conflict_count = 0
+        self.conflicts = []
+
+    def conflict(self, line, error):
+        self.conflict_count += 1
+        if len(self.conflicts) < self.MAX_REPORTED_CONFLICTS:
+            self.conflicts.append({'line': line, 'error': error})
+
+    def _load_days(self, dates):
+        """Load existing sessions and allocated hours for dates not seen yet."""
+        new_dates = [d for d in dates if d not in self.days]
+        if not new_dates:
+            return
+        for new_date in new_dates:
+            self.days[new_date] = DayState()
+
+        # Hold the SQLite write lock from the first overlap check to the commit
+        if not self.dry_run:
+            begin_write_transaction()
+
+        sessions = db.session.query(
+            WorkSession.date, WorkSession.start_time, WorkSession.end_time
+        ).filter(WorkSession.date.in_(new_dates)).all()
+        for session_date, start, end in sessions:
+            day = self.days[session_date]
+            day.add(start, end or OPEN_END)
+            if end:
+                day.clocked += _hours_between(start, end)
+
+        allocated = db.session.query(
+            TimeAllocation.date, db.func.sum(TimeAllocation.hours)
+        ).filter(TimeAllocation.date.in_(new_dates)).group_by(TimeAllocation.date).all()
+        for allocation_date, hours in allocated:
+            self.days[allocation_date].allocated = Decimal(str(hours or 0))
+
+    def _accept_session(self, day, entry_date, start, end):
+        day.add(start, end)
+        day.clocked += _hours_between(start, end)
+        self.sessions.append({
+            'id': str(uuid.uuid4()), 'date': entry_date, 'start_time': start, 'end_time': end
+        })
+
+    def _accept_allocation(self, day, entry, project_id):
+        day.allocated += entry.hours
+        self.allocations.append({
+            'id': str(uuid.uuid4()), 'date': entry.date, 'project_id': project_id,
+            'hours': entry.hours, 'notes': entry.notes
+        })
+
+    def _process_chunk(self, chunk):
+        self._load_days({entry.date for entry, _ in chunk})
+        for entry, project_id in chunk:
+            day = self.days[entry.date]
+            if entry.start is None:
+                self.untimed[entry.date].append((entry, project_id))
+                continue
+            if day.overlaps(entry.start, entry.end):
+                self.conflict(entry.line, f'Session {entry.start.isoformat()} - {entry.end.isoformat()} overlaps an existing session')
+                continue
+            self._accept_session(day, entry.date, entry.start, entry.end)
+            self._accept_allocation(day, entry, project_id)
+
+    def _process_untimed(self):
+        """Fit one synthesized session per date around hours-only entries."""
+        for entry_date, entries in sorted(self.untimed.items()):
+            day = self.days[entry_date]
+            hours = sum((entry.hours for entry, _ in entries), Decimal('0'))
+            shortfall = day.allocated + hours - day.clocked
+            if shortfall > 0:
+                duration = timedelta(seconds=int(shortfall * 3600))
+                start = day.first_gap(datetime.combine(entry_date, self.DAY_START), duration)
+                end = start + duration if start else None
+                if end is None or end > datetime.combine(entry_date + timedelta(days=1), time()):
+                    for entry, _ in entries:
+                        self.conflict(entry.line, f'No room on {entry_date.isoformat()} for {hours}h of unclocked time')
+                    continue
+                self._accept_session(day, entry_date, start, end)
+            for entry, project_id in entries:
+                self._accept_allocation(day, entry, project_id)
+
+    def _write(self):
+        """Bulk-insert accepted rows and apply rollup deltas, then commit once."""
+        try:
+            for start in range(0, len(self.sessions), self.CHUNK_SIZE):
+                db.session.execute(db.insert(WorkSession), self.sessions[start:start + self.CHUNK_SIZE])
+            for start in range(0, len(self.allocations), self.CHUNK_SIZE):
+                db.session.execute(db.insert(TimeAllocation), self.allocations[start:start + self.CHUNK_SIZE])
+
+            deltas = defaultdict(Decimal)
+            for allocation in self.allocations:
+                deltas[(allocation['date'], allocation['project_id'])] += allocation['hours']
+            RollupService.add_hours_bulk(deltas)
+            db.session.commit()
+        except IntegrityError as error:
+            # PostgreSQL's overlap constraint caught a session written since the check
+            db.session.rollback()
+            raise ImportConflictError(
+                'A session was added while importing and overlaps the import; nothing was imported'
+            ) from error
+        except Exception:
+            db.session.rollback()
+            raise
+        CalendarService.clear()
+
+    def run(self, lines) -> dict:
+        """
+        Import a timesheet from an iterable of text lines.
+
+        Returns:
+            Report with row counts and conflicts (capped at MAX_REPORTED_CONFLICTS).
+            Nothing is written when dry_run is set.
+        """
+        chunk = []
+        for line, entry in self.parse(lines):
+            self.rows_read += 1
+            if isinstance(entry, ImportRowError):
+                self.conflict(line, str(entry))
+                continue
+            if entry.hours <= 0:
+                self.conflict(line, 'Duration must be positive')
+                continue
+            project_id = self.resolver.resolve(entry.client, entry.project)
+            if project_id is None:
+                label = f'{entry.client} / {entry.project}' if entry.client else entry.project
+                self.conflict(line, f'Unknown project: {label}')
+                continue
+            chunk.append((entry, project_id))
+            if len(chunk) >= self.CHUNK_SIZE:
+                self._process_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._process_chunk(chunk)
+        self._process_untimed()
+
+        if not self.dry_run:
+            self._write()
+
+        return {
+            'dry_run': self.dry_run,
+            'rows_read': self.rows_read,
+            'sessions_created': len(self.sessions),
+            'allocations_created': len(self.allocations),
+            'conflict_count': self.conflict_count,
+            'conflicts': self.conflicts
+        }
@@ -0,0 +1,160 @@
+from decimal import Decimal
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from backend.extensions import db
+from backend.models.daily_project_hours import DailyProjectHours
+from backend.models.time_allocation import TimeAllocation
+from backend.utils.sql_utils import dialect_name
+from backend.utils.tenancy import current_owner_id
+
+
+class RollupService:
+    """Service for maintaining the daily_project_hours rollup table.
+
+    Every write to time_allocations must be mirrored here before the session
+    commits, so the rollup changes in the same transaction as the allocation.
+    Writes go to the current owner's rows (see backend.utils.tenancy).
+    """
+
+    @staticmethod
+    def add_hours(target_date, project_id, hours):
+        """Add (or, with negative hours, subtract) hours to a rollup row."""
+        RollupService.add_hours_bulk({(target_date, project_id): hours})
+
+    @staticmethod
+    def add_hours_bulk(deltas):
+        """Apply many hour deltas, given as {(date, project_id): hours}, with executemany."""
+        owner_id = current_owner_id()
+        params = [
+            {'owner_id': owner_id, 'date': target_date, 'project_id': project_id, 'hours': Decimal(str(hours))}
+            for (target_date, project_id), hours in deltas.items()
+            if Decimal(str(hours)) != 0
+        ]
+        if not params:
+            return
+
+        table = DailyProjectHours.__table__
+        dialect = dialect_name()
+
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.owner_id, table.c.date, table.c.project_id],
+                set_={'hours': table.c.hours + stmt.excluded.hours}
+            )
+            db.session.execute(stmt, params)
+        else:
+            for param in params:
+                updated = db.session.execute(
+                    table.update().where(
+                        table.c.owner_id == owner_id,
+                        table.c.date == param['date'],
+                        table.c.project_id == param['project_id']
+                    ).values(hours=table.c.hours + param['hours'])
+                ).rowcount
+                if not updated:
+                    db.session.execute(table.insert().values(**param))
+
+        negative = [param for param in params if param['hours'] < 0]
+        if negative:
+            # Drop emptied rows so the rollup matches a rebuild from scratch
+            db.session.execute(
+                table.delete().where(
+                    table.c.owner_id == owner_id,
+                    table.c.date == db.bindparam('target_date'),
+                    table.c.project_id == db.bindparam('target_project_id'),
+                    table.c.hours <= 0
+                ),
+                [{'target_date': param['date'], 'target_project_id': param['project_id']} for param in negative]
+            )
+
+    @staticmethod
+    def record_allocation(allocation):
+        """Add a new allocation's hours to the rollup."""
+        RollupService.add_hours(allocation.date, allocation.project_id, allocation.hours)
+
+    @staticmethod
+    def remove_allocation(allocation):
+        """Remove a deleted allocation's hours from the rollup."""
+        RollupService.add_hours(allocation.date, allocation.project_id, -Decimal(str(allocation.hours)))
+
+    @staticmethod
+    def move_hours(old_date, old_project_id, old_hours, allocation):
+        """Move hours from an allocation's previous state to its current one."""
+        if (old_date, old_project_id, Decimal(str(old_hours))) == (
+            allocation.date, allocation.project_id, Decimal(str(allocation.hours))
+        ):
+            return
+        RollupService.add_hours(old_date, old_project_id, -Decimal(str(old_hours)))
+        RollupService.add_hours(allocation.date, allocation.project_id, allocation.hours)
+
+    @staticmethod
+    def _aggregate_allocations():
+        """Select (owner_id, date, project_id, hours) summed from raw allocations."""
+        return db.session.query(
+            TimeAllocation.owner_id,
+            TimeAllocation.date,
+            TimeAllocation.project_id,
+            func.sum(TimeAllocation.hours).label('hours')
+        ).group_by(
+            TimeAllocation.owner_id,
+            TimeAllocation.date,
+            TimeAllocation.project_id
+        )
+
+    @staticmethod
+    def rebuild() -> int:
+        """Recompute the rollup from time_allocations, for every user unless scoped to one.
+
+        Returns:
+            Number of rollup rows
+        """
+        table = DailyProjectHours.__table__
+        aggregate = RollupService._aggregate_allocations()
+
+        # Core statements are not scoped automatically (see backend.utils.tenancy)
+        delete = table.delete()
+        if current_owner_id() is not None:
+            delete = delete.where(table.c.owner_id == current_owner_id())
+            aggregate = aggregate.filter(TimeAllocation.owner_id == current_owner_id())
+        aggregate = aggregate.subquery()
+        db.session.execute(delete)
+        db.session.execute(
+            table.insert().from_select(
+                ['owner_id', 'date', 'project_id', 'hours'],
+                db.select(aggregate.c.owner_id, aggregate.c.date, aggregate.c.project_id, aggregate.c.hours)
+            )
+        )
+        db.session.commit()
+        return db.session.query(func.count()).select_from(DailyProjectHours).scalar()
+
+    @staticmethod
+    def verify() -> list[dict]:
+        """
+        Compare the rollup against a fresh aggregate of time_allocations.
+
+        Returns:
+            One entry per mismatched (date, project_id); empty if consistent
+        """
+        expected = {
+            (row.date, row.project_id): Decimal(str(row.hours))
+            for row in RollupService._aggregate_allocations()
+        }
+        actual = {
+            (row.date, row.project_id): Decimal(str(row.hours))
+            for row in DailyProjectHours.query
+        }
+
+        mismatches = []
+        for key in sorted(expected.keys() | actual.keys()):
+            expected_hours = expected.get(key, Decimal('0'))
+            actual_hours = actual.get(key, Decimal('0'))
+            if expected_hours.quantize(Decimal('0.01')) != actual_hours.quantize(Decimal('0.01')):
+                mismatches.append({
+                    'date': key[0].isoformat(),
+                    'project_id': key[1],
+                    'expected_hours': float(expected_hours),
+                    'rollup_hours': float(actual_hours)
+                })
+        return mismatches
@@ -4,7 +4,7 @@ Datetime utilities for consistent timezone handling.
 This project stores all user-facing datetimes as naive local time (no timezone info).
 These utilities ensure consistent parsing and formatting across the codebase.
 """
-from datetime import datetime
+from datetime import date, datetime
 
 
 def parse_datetime_naive(iso_string: str) -> datetime:
@@ -37,3 +37,22 @@ def ensure_naive(dt: datetime) -> datetime:
 def now_naive() -> datetime:
     """Return current time as naive datetime."""
     return datetime.now()
+
+
+def month_bounds(year: int, month: int) -> tuple[date, date]:
+    """
+    Return the half-open date range [first day, first day of next month).
+
+    Comparing a date column against these bounds keeps the filter sargable,
+    unlike extract('year'/'month', ...) which defeats date indexes.
+    Raises ValueError for an invalid month.
+    """
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def parse_month(month_string: str) -> tuple[int, int]:
+    """Parse a 'YYYY-MM' string into (year, month). Raises ValueError if invalid."""
+    parsed = datetime.strptime(month_string, '%Y-%m')
+    return parsed.year, parsed.month
@@ -0,0 +1,52 @@
+"""
+Column types shared by the models.
+"""
+import uuid
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+NIL_UUID = '00000000-0000-0000-0000-000000000000'
+
+
+def _key_bytes(value):
+    """The 16 bytes of a UUID string, or None if it is not one."""
+    if isinstance(value, uuid.UUID):
+        return value.bytes
+    try:
+        key = bytes.fromhex(value.replace('-', ''))
+    except (AttributeError, ValueError):
+        return None
+    return key if len(key) == 16 else None
+
+
+class UUIDKey(TypeDecorator):
+    """UUID key that application code sees as a canonical 36-character string.
+
+    Stored as native uuid on PostgreSQL and as a 16-byte BLOB elsewhere,
+    so keys, foreign keys and every index containing them take 16 bytes
+    instead of 36 characters. Values that are not UUIDs (a malformed id in
+    a URL, say) bind to a key no row has, so they find nothing, as they did
+    when keys were text.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        key = _key_bytes(value)
+        if dialect.name == 'postgresql':
+            return str(uuid.UUID(bytes=key)) if key else NIL_UUID
+        return key if key else str(value).encode()
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == 'postgresql':
+            return value
+        hex_key = value.hex()
+        return f'{hex_key[:8]}-{hex_key[8:12]}-{hex_key[12:16]}-{hex_key[16:20]}-{hex_key[20:]}'
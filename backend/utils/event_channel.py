@@ -0,0 +1,177 @@
+"""
+Notification channels that fan live-update events out to /api/stream.
+
+Writes publish an event after they commit; every open stream waits on its
+process's channel and relays the events of its own user. Events carry an
+increasing id so reconnecting clients (Last-Event-ID) receive what they
+missed, as long as it is still buffered.
+
+- memory:// keeps events inside one process (development server, a single
+  gunicorn worker).
+- sqlite:///PATH appends events to a small SQLite file shared by all
+  workers. One poller thread per process watches PRAGMA data_version, a
+  cheap counter that changes when another connection commits, and reads new
+  rows only then, so an event published by one worker reaches streams held
+  by the others within POLL_INTERVAL_SECONDS.
+
+Both use threading primitives only, so under gunicorn's gevent worker
+waiting streams are parked greenlets rather than blocked threads.
+"""
+import collections
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_created ON events (created_at);
+"""
+
+
+class MemoryEventChannel:
+    """Events published and consumed within one process."""
+
+    BUFFER_SIZE = 500
+
+    def __init__(self):
+        self._events = collections.deque(maxlen=self.BUFFER_SIZE)
+        self._condition = threading.Condition()
+        self._last_id = 0
+
+    @property
+    def last_id(self):
+        """Id of the newest event seen by this process."""
+        return self._last_id
+
+    def _append(self, event_id, owner_id, name, data):
+        with self._condition:
+            self._events.append((event_id, owner_id, name, data))
+            self._last_id = event_id
+            self._condition.notify_all()
+
+    def publish(self, owner_id, name, data):
+        """Publish an event for owner_id's streams; data is its JSON-encoded payload."""
+        with self._condition:
+            self._append(self._last_id + 1, owner_id, name, data)
+
+    def wait(self, after_id, timeout):
+        """Return buffered (id, owner_id, name, data) events newer than after_id, waiting up to timeout for one."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._last_id > after_id, timeout)
+            return [event for event in self._events if event[0] > after_id]
+
+
+class SQLiteEventChannel(MemoryEventChannel):
+    """Events shared by all worker processes through a SQLite file."""
+
+    POLL_INTERVAL_SECONDS = 0.25
+    RETENTION_SECONDS = 300
+    BUSY_TIMEOUT_SECONDS = 5
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._writer = None
+        self._writer_pid = None
+        self._writer_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._poller_pid = None
+        self._poller_lock = threading.Lock()
+        self._next_prune = 0.0
+        # The poller starts at the current end of the log, not at its retained history
+        with self._writer_lock:
+            self._last_id = self._writer_connection().execute(
+                'SELECT coalesce(max(id), 0) FROM events'
+            ).fetchone()[0]
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(
+            self.path, timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False
+        )
+        connection.execute('PRAGMA journal_mode=WAL')
+        # Events are transient; losing the last few on power failure is fine
+        connection.execute('PRAGMA synchronous=OFF')
+        columns = {row[1] for row in connection.execute('PRAGMA table_info(events)')}
+        if columns and 'owner_id' not in columns:
+            # Written before events carried their owner; they are only buffered, never needed
+            connection.execute('DROP TABLE events')
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _writer_connection(self):
+        """The process's publishing connection, reopened after a fork. Callers hold _writer_lock."""
+        if self._writer is None or self._writer_pid != os.getpid():
+            self._writer, self._writer_pid = self._open(), os.getpid()
+        return self._writer
+
+    @property
+    def last_id(self):
+        """Id of the newest event in the file, which the poller may not have read yet."""
+        self._ensure_poller()
+        with self._writer_lock:
+            head = self._writer_connection().execute('SELECT coalesce(max(id), 0) FROM events').fetchone()[0]
+        return max(head, self._last_id)
+
+    def publish(self, owner_id, name, data):
+        now = time.time()
+        with self._writer_lock:
+            connection = self._writer_connection()
+            connection.execute(
+                'INSERT INTO events (owner_id, name, data, created_at) VALUES (?, ?, ?, ?)',
+                (owner_id, name, data, now)
+            )
+            if now >= self._next_prune:
+                self._next_prune = now + 60
+                connection.execute('DELETE FROM events WHERE created_at < ?', (now - self.RETENTION_SECONDS,))
+        self._wake.set()
+
+    def _ensure_poller(self):
+        if self._poller_pid == os.getpid():
+            return
+        with self._poller_lock:
+            if self._poller_pid != os.getpid():
+                threading.Thread(target=self._poll, name='event-channel-poller', daemon=True).start()
+                self._poller_pid = os.getpid()
+
+    def _poll(self):
+        connection = self._open()
+        version = None
+        while True:
+            self._wake.wait(self.POLL_INTERVAL_SECONDS)
+            self._wake.clear()
+            try:
+                current = connection.execute('PRAGMA data_version').fetchone()[0]
+                if current == version:
+                    continue
+                version = current
+                rows = connection.execute(
+                    'SELECT id, owner_id, name, data FROM events WHERE id > ? ORDER BY id', (self._last_id,)
+                ).fetchall()
+            except sqlite3.Error:
+                continue
+            for row in rows:
+                self._append(*row)
+
+    def wait(self, after_id, timeout):
+        self._ensure_poller()
+        return super().wait(after_id, timeout)
+
+
+def channel_from_uri(uri):
+    """Create a channel from memory:// or sqlite:///PATH (as in SQLAlchemy URLs)."""
+    scheme, _, path = uri.partition('://')
+    if scheme == 'memory':
+        return MemoryEventChannel()
+    if scheme == 'sqlite':
+        return SQLiteEventChannel(path[1:] if path.startswith('/') else path)
+    raise ValueError(f'Unsupported event channel URI: {uri}')
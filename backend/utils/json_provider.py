@@ -0,0 +1,68 @@
+"""
+JSON provider for jsonify and request.get_json.
+
+Encodes with orjson when it is installed and falls back to the stdlib json
+module otherwise. Both paths encode Decimal, date and datetime values
+themselves, so models and services return column values as they are:
+dates and datetimes become ISO 8601 strings and Decimals become numbers,
+or strings when JSON_DECIMAL_AS_STRING is set so money amounts stay exact.
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson encoding and native Decimal/date handling."""
+
+    def default(self, o):
+        if isinstance(o, Decimal):
+            return str(o) if self._app.config['JSON_DECIMAL_AS_STRING'] else float(o)
+        # Only reached for time and by the stdlib path; orjson encodes dates itself
+        if isinstance(o, (datetime, date, time)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def _pretty(self):
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    def _orjson_option(self, option=0):
+        option |= orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self._pretty():
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        """Serialize to a JSON string; stdlib json handles any json.dumps arguments."""
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_option()).decode()
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def dumps_line(self, obj):
+        """Serialize to one line of JSON, keys in insertion order (for NDJSON)."""
+        if orjson is not None:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps(obj, default=self.default, ensure_ascii=self.ensure_ascii)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_option(orjson.OPT_APPEND_NEWLINE))
+        return self._app.response_class(body, mimetype=self.mimetype)
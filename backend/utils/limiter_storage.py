@@ -0,0 +1,252 @@
+"""
+SQLite-file storage backend for Flask-Limiter (and the limits library).
+
+Registers the ``sqlite://`` storage scheme, e.g.
+RATELIMIT_STORAGE_URI=sqlite:////data/ratelimit.db. Every gunicorn worker
+opens the same file, so counters are shared across workers and survive
+restarts without needing Redis. Fixed-window increments are a single
+upsert; moving and sliding windows read and write inside one
+BEGIN IMMEDIATE transaction, so concurrent workers cannot both take the
+last slot.
+
+The file is separate from the application database so limiter writes never
+wait on application transactions. Counters are not worth an fsync, so the
+file runs with synchronous=OFF in WAL mode. Each process shares one
+connection behind a lock, so gevent workers do not open one per greenlet.
+"""
+import functools
+import os
+import sqlite3
+import threading
+import time
+from math import floor
+
+from limits.storage import MovingWindowSupport, SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS window_entries (
+    key TEXT NOT NULL,
+    at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_window_entries_key_at ON window_entries (key, at);
+CREATE INDEX IF NOT EXISTS idx_window_entries_expires ON window_entries (expires_at);
+"""
+
+INCR = """
+INSERT INTO counters (key, value, expires_at) VALUES (:key, :amount, :now + :expiry)
+ON CONFLICT (key) DO UPDATE SET
+    value = CASE WHEN expires_at <= :now THEN excluded.value ELSE value + excluded.value END,
+    expires_at = CASE WHEN expires_at <= :now THEN excluded.expires_at ELSE expires_at END
+RETURNING value
+"""
+
+
+def locked(method):
+    """Run a storage method holding the process connection's lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class SQLiteStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Rate limit storage in a SQLite file shared by all worker processes."""
+
+    STORAGE_SCHEME = ['sqlite']
+
+    PURGE_INTERVAL_SECONDS = 60
+    BUSY_TIMEOUT_SECONDS = 5
+
+    def __init__(self, uri, wrap_exceptions=False, **options):
+        # sqlite:////abs/path.db is absolute, sqlite:///rel/path.db relative (as in SQLAlchemy)
+        path = uri.split('://', 1)[1]
+        self.path = path[1:] if path.startswith('/') else path
+        self._lock = threading.RLock()
+        self._connection_handle = None
+        self._pid = None
+        self._next_purge = 0.0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self):
+        """Get this process's connection, opening a new one after a fork. Callers hold the lock."""
+        connection = self._connection_handle
+        if connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            connection.executescript(SCHEMA)
+            self._connection_handle = connection
+            self._pid = os.getpid()
+        return connection
+
+    def _execute(self, sql, params=()):
+        now = time.time()
+        if now >= self._next_purge:
+            self._next_purge = now + self.PURGE_INTERVAL_SECONDS
+            self.purge_expired()
+        return self._connection().execute(sql, params)
+
+    @locked
+    def purge_expired(self):
+        """Delete expired counters and window entries."""
+        connection = self._connection()
+        now = time.time()
+        connection.execute('DELETE FROM counters WHERE expires_at <= ?', (now,))
+        connection.execute('DELETE FROM window_entries WHERE expires_at <= ?', (now,))
+
+    @locked
+    def incr(self, key, expiry, amount=1):
+        # fetchall() steps RETURNING statements to completion, ending their implicit transaction
+        rows = self._execute(INCR, {'key': key, 'amount': amount, 'expiry': expiry, 'now': time.time()}).fetchall()
+        return rows[0][0]
+
+    @locked
+    def decr(self, key, amount=1):
+        rows = self._execute(
+            'UPDATE counters SET value = max(value - ?, 0) WHERE key = ? AND expires_at > ? RETURNING value',
+            (amount, key, time.time())
+        ).fetchall()
+        return rows[0][0] if rows else 0
+
+    @locked
+    def get(self, key):
+        row = self._execute(
+            'SELECT value FROM counters WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    @locked
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._execute(
+            'SELECT expires_at FROM counters WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    @locked
+    def check(self):
+        try:
+            self._execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @locked
+    def reset(self):
+        connection = self._connection()
+        cleared = connection.execute('SELECT count(*) FROM counters').fetchone()[0]
+        cleared += connection.execute('SELECT count(DISTINCT key) FROM window_entries').fetchone()[0]
+        connection.execute('DELETE FROM counters')
+        connection.execute('DELETE FROM window_entries')
+        return cleared
+
+    @locked
+    def clear(self, key):
+        self._execute('DELETE FROM counters WHERE key = ?', (key,))
+        self._execute('DELETE FROM window_entries WHERE key = ?', (key,))
+
+    def _transaction(self):
+        """Begin a write transaction holding the file's write lock."""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        return connection
+
+    @locked
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+
+        now = time.time()
+        connection = self._transaction()
+        try:
+            connection.execute('DELETE FROM window_entries WHERE key = ? AND at <= ?', (key, now - expiry))
+            acquired = connection.execute(
+                'SELECT count(*) FROM window_entries WHERE key = ?', (key,)
+            ).fetchone()[0]
+            if acquired + amount > limit:
+                connection.execute('ROLLBACK')
+                return False
+            connection.executemany(
+                'INSERT INTO window_entries (key, at, expires_at) VALUES (?, ?, ?)',
+                [(key, now, now + expiry)] * amount
+            )
+            connection.execute('COMMIT')
+            return True
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            raise
+
+    @locked
+    def get_moving_window(self, key, limit, expiry):
+        now = time.time()
+        start, acquired = self._execute(
+            'SELECT min(at), count(*) FROM ('
+            '  SELECT at FROM window_entries WHERE key = ? AND at > ? ORDER BY at DESC LIMIT ?'
+            ')',
+            (key, now - expiry, limit)
+        ).fetchone()
+        return (start, acquired) if acquired else (now, 0)
+
+    def _sliding_window_info(self, connection, key, expiry, now):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        counts = dict(connection.execute(
+            'SELECT key, value FROM counters WHERE key IN (?, ?) AND expires_at > ?',
+            (previous_key, current_key, now)
+        ).fetchall())
+        previous_count = counts.get(previous_key, 0)
+        current_count = counts.get(current_key, 0)
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    @locked
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+
+        now = time.time()
+        connection = self._transaction()
+        try:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window_info(
+                connection, key, expiry, now
+            )
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                connection.execute('ROLLBACK')
+                return False
+            # The current window's counter must outlive it to serve as the next previous window
+            _, current_key = self.sliding_window_keys(key, expiry, now)
+            connection.execute(INCR, {'key': current_key, 'amount': amount, 'expiry': 2 * expiry, 'now': now}).fetchall()
+            connection.execute('COMMIT')
+            return True
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            raise
+
+    @locked
+    def get_sliding_window(self, key, expiry):
+        return self._sliding_window_info(self._connection(), key, expiry, time.time())
+
+    @locked
+    def clear_sliding_window(self, key, expiry):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.clear(previous_key)
+        self.clear(current_key)
@@ -0,0 +1,44 @@
+"""
+Dialect-aware SQL expressions.
+
+The app runs on both SQLite and PostgreSQL; these helpers pick the right SQL
+for the current database so date arithmetic can stay inside the query.
+"""
+from sqlalchemy import func, text
+from backend.extensions import db
+
+
+def dialect_name() -> str:
+    """Return the dialect name ('sqlite', 'postgresql', ...) of the session's bind."""
+    return db.session.get_bind().dialect.name
+
+
+def month_label(column):
+    """SQL expression formatting a date column as 'YYYY-MM'."""
+    if dialect_name() == 'postgresql':
+        return func.to_char(column, 'YYYY-MM')
+    return func.strftime('%Y-%m', column)
+
+
+def duration_seconds(start_column, end_column):
+    """SQL expression for the number of seconds between two timestamp columns."""
+    if dialect_name() == 'postgresql':
+        return func.extract('epoch', end_column - start_column)
+    # julianday() is a float day count; round to milliseconds to drop float noise
+    return func.round((func.julianday(end_column) - func.julianday(start_column)) * 86400, 3)
+
+
+def begin_write_transaction():
+    """
+    Start the current transaction holding the database write lock.
+
+    On SQLite this issues BEGIN IMMEDIATE, so check-then-write sequences from
+    concurrent workers run one at a time instead of interleaving. It must run
+    before the transaction's first write; it is a no-op on other databases,
+    which enforce invariants with constraints instead.
+    """
+    if dialect_name() != 'sqlite':
+        return
+    dbapi_connection = db.session.connection().connection.dbapi_connection
+    if not dbapi_connection.in_transaction:
+        db.session.execute(text('BEGIN IMMEDIATE'))
@@ -0,0 +1,80 @@
+"""
+Per-user data scoping.
+
+Clients, projects, work sessions, allocations and the daily rollup belong to
+one user through an owner_id column (OwnedMixin). login_required puts the
+logged-in user's id on flask.g, and from then on:
+
+- every ORM SELECT, UPDATE and DELETE involving an owned model gets
+  "owner_id = :owner" for each appearance of the model, including
+  subqueries, joins and relationship loads;
+- new rows default to that owner.
+
+Every composite index on owned tables leads with owner_id, so one user's
+queries seek within their own slice of each index and never read another
+user's rows.
+
+Inside a request without a logged-in user, owned models match no rows.
+Outside requests (CLI commands, migrations) statements are unscoped unless
+the command scopes them with as_owner(). Core statements on Table objects
+are never scoped and must filter on owner_id themselves.
+"""
+from contextlib import contextmanager
+from functools import lru_cache
+from flask import g, has_app_context, has_request_context
+from sqlalchemy import event, false
+from sqlalchemy.orm import Session, declared_attr, with_loader_criteria
+from backend.extensions import db
+from backend.utils.db_types import UUIDKey
+
+
+def current_owner_id():
+    """Id of the user that statements are scoped to, or None."""
+    return g.get('owner_id') if has_app_context() else None
+
+
+@contextmanager
+def as_owner(owner_id):
+    """Scope statements inside the block to owner_id (for CLI commands and scripts)."""
+    previous = g.get('owner_id')
+    g.owner_id = owner_id
+    try:
+        yield
+    finally:
+        g.owner_id = previous
+
+
+class OwnedMixin:
+    """Model mixin for rows that belong to one user."""
+
+    @declared_attr
+    def owner_id(cls):
+        return db.Column(UUIDKey, db.ForeignKey('users.id'), nullable=False, default=current_owner_id)
+
+
+@lru_cache(maxsize=1024)
+def _owner_criteria(owner_id):
+    """The loader option scoping owned models to owner_id; immutable, so built once per owner."""
+    if owner_id is None:
+        return with_loader_criteria(OwnedMixin, lambda cls: false(), include_aliases=True)
+    return with_loader_criteria(OwnedMixin, lambda cls: cls.owner_id == owner_id, include_aliases=True)
+
+
+def _scope_to_owner(state):
+    """do_orm_execute hook adding the owner criteria to ORM statements."""
+    if not (state.is_select or state.is_update or state.is_delete):
+        return
+    # Lazy and column loads inherit the criteria from the statement that loaded the parent
+    if state.is_column_load or state.is_relationship_load:
+        return
+
+    owner_id = current_owner_id()
+    if owner_id is None and not has_request_context():
+        return
+    state.statement = state.statement.options(_owner_criteria(owner_id))
+
+
+def init_tenancy():
+    """Scope ORM statements on owned models to the current owner."""
+    if not event.contains(Session, 'do_orm_execute', _scope_to_owner):
+        event.listen(Session, 'do_orm_execute', _scope_to_owner)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Show that GET /api/clients runs a constant number of queries.
+
+Usage:
+    python -m benchmarks.client_hours [--sizes 10,100,500]
+
+Seeds N clients (each with a project and a few allocations) and reports the
+number of SQL statements and wall time for a single GET /api/clients.
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from benchmarks.harness import authenticated_client, count_queries, create_benchmark_app, owner_context
+
+
+def seed_clients(app, count):
+    """Insert `count` clients with one project and three allocations each."""
+    from backend.extensions import db
+    from backend.models import Client, Project, TimeAllocation
+
+    with owner_context(app):
+        for i in range(count):
+            client = Client(name=f'Client {i}', currency='CHF', default_hourly_rate=Decimal('100'))
+            project = Project(client=client, name=f'Project {i}')
+            db.session.add_all([client, project])
+            for day in range(3):
+                db.session.add(TimeAllocation(
+                    date=date(2026, 1, 1) + timedelta(days=day),
+                    project=project,
+                    hours=Decimal('1.5')
+                ))
+        db.session.commit()
+
+
+def run(sizes):
+    print(f"{'clients':>8} {'queries':>8} {'ms':>8}")
+    for size in sizes:
+        app = create_benchmark_app()
+        seed_clients(app, size)
+        client = authenticated_client(app)
+
+        with count_queries(app) as counter:
+            started = time.perf_counter()
+            response = client.get('/api/clients')
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+        assert response.status_code == 200, response.get_data(as_text=True)
+        assert len(response.get_json()['clients']) == size
+        print(f'{size:>8} {counter.count:>8} {elapsed_ms:>8.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,500', help='Comma-separated client counts')
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(',')])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmarks.suite JSON result files.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold 20]
+
+Prints p50/p95 latency and SQL statement counts side by side for every
+(database, size, scenario) present in both files. Exits with status 1 if any
+scenario's p50 grew by more than --threshold percent or runs more statements.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    """Map (database, size, scenario) -> result for a results file."""
+    with open(path) as f:
+        report = json.load(f)
+    results = {}
+    for run in report['runs']:
+        for result in run['results']:
+            results[(run['database'], run['size'], result['scenario'])] = result
+    return report['meta'], results
+
+
+def change(old, new):
+    return (new - old) * 100 / old if old else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed p50 growth in percent')
+    args = parser.parse_args()
+
+    baseline_meta, baseline = load(args.baseline)
+    current_meta, current = load(args.current)
+    print(f"baseline {baseline_meta.get('commit')}  current {current_meta.get('commit')}")
+    print(f"{'database':<10} {'size':<7} {'scenario':<48} {'p50 ms':>22} {'p95 ms':>15} {'sql':>9}")
+
+    regressions = []
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        p50_change = change(old['p50_ms'], new['p50_ms'])
+        regressed = p50_change > args.threshold or new['queries'] > old['queries']
+        if regressed:
+            regressions.append(key)
+        database, size, name = key
+        print(
+            f"{database:<10} {size:<7} {name:<48} "
+            f"{old['p50_ms']:>7.2f} {new['p50_ms']:>7.2f}{p50_change:>+6.0f}% "
+            f"{old['p95_ms']:>7.2f} {new['p95_ms']:>7.2f} "
+            f"{old['queries']:>4} {new['queries']:>4}"
+            f"{'  REGRESSED' if regressed else ''}"
+        )
+
+    for key in sorted(baseline.keys() ^ current.keys()):
+        print(f"{'/'.join(key)} only in {'baseline' if key in baseline else 'current'}")
+
+    if regressions:
+        print(f'{len(regressions)} regression(s)', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
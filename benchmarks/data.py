@@ -0,0 +1,144 @@
+"""
+Seeded synthetic data for benchmarks.
+
+Generates clients, projects and years of work sessions and allocations with
+the shape of a real freelancer's timesheet: most weekdays worked, one to three
+sessions a day, and the clocked time split over a few of the projects active
+that quarter. The same seed always produces the same rows.
+"""
+import random
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from decimal import ROUND_FLOOR, Decimal
+
+from benchmarks.harness import owner_context
+
+DataSize = namedtuple('DataSize', ['clients', 'projects', 'years'])
+
+SIZES = {
+    'small': DataSize(clients=5, projects=15, years=1),
+    'medium': DataSize(clients=20, projects=80, years=3),
+    'large': DataSize(clients=50, projects=250, years=10),
+}
+
+Dataset = namedtuple('Dataset', [
+    'size', 'start', 'end', 'client_ids', 'project_ids', 'counts', 'busiest_date'
+])
+
+END_DATE = date(2026, 6, 30)
+WORKDAY_PROBABILITY = 0.9
+QUARTER_ACTIVE_PROJECTS = 6
+QUARTER_HOUR = Decimal('0.25')
+
+
+def _split(total, parts, rng):
+    """Split a Decimal total into `parts` positive quarter-hour amounts."""
+    quarters = int(total / QUARTER_HOUR)
+    parts = max(1, min(parts, quarters))
+    cuts = sorted(rng.sample(range(1, quarters), parts - 1)) if parts > 1 else []
+    bounds = [0] + cuts + [quarters]
+    return [QUARTER_HOUR * (high - low) for low, high in zip(bounds, bounds[1:])]
+
+
+def _workday(day, projects, rng):
+    """Build (sessions, allocations) rows for one worked day."""
+    sessions = []
+    clocked = Decimal('0')
+    cursor = datetime.combine(day, time(8)) + timedelta(minutes=15 * rng.randint(0, 6))
+    for _ in range(rng.choice((1, 2, 2, 3))):
+        length = timedelta(minutes=15 * rng.randint(6, 16))
+        sessions.append({'date': day, 'start_time': cursor, 'end_time': cursor + length})
+        clocked += Decimal(length.total_seconds()) / 3600
+        cursor += length + timedelta(minutes=15 * rng.randint(1, 4))
+
+    # Allocate most of the clocked time, in quarter hours, over a few projects
+    quarters = (clocked * Decimal(rng.uniform(0.8, 1.0)) / QUARTER_HOUR).to_integral_value(ROUND_FLOOR)
+    allocatable = quarters * QUARTER_HOUR
+    allocations = []
+    if allocatable > 0:
+        chosen = rng.sample(projects, min(len(projects), rng.randint(1, 4)))
+        for project_id, hours in zip(chosen, _split(allocatable, len(chosen), rng)):
+            allocations.append({'date': day, 'project_id': project_id, 'hours': hours, 'notes': None})
+    return sessions, allocations
+
+
+def generate(app, size, seed=0, end=END_DATE):
+    """
+    Insert a synthetic dataset of the given DataSize and rebuild the rollup.
+
+    Returns:
+        Dataset describing the generated range and ids
+    """
+    from backend.extensions import db
+    from backend.models import Client, Project, TimeAllocation, WorkSession
+    from backend.services.rollup_service import RollupService
+
+    rng = random.Random(seed)
+    start = end.replace(year=end.year - size.years) + timedelta(days=1)
+    stamp = datetime.combine(start, time(9))
+
+    clients = [{
+        'id': str(uuid.UUID(int=rng.getrandbits(128))),
+        'name': f'Client {i:03d}',
+        'currency': rng.choice(('CHF', 'EUR')),
+        'default_hourly_rate': Decimal(rng.randrange(60, 180, 5)),
+        'hour_budget': Decimal(rng.randrange(200, 2000, 50)) if rng.random() < 0.3 else None,
+        'is_active': True,
+        'is_archived': False,
+        'created_at': stamp,
+        'updated_at': stamp
+    } for i in range(size.clients)]
+    projects = [{
+        'id': str(uuid.UUID(int=rng.getrandbits(128))),
+        'client_id': clients[i % len(clients)]['id'],
+        'name': f'Project {i:04d}',
+        'hourly_rate_override': Decimal(rng.randrange(60, 180, 5)) if rng.random() < 0.2 else None,
+        'hour_budget': Decimal(rng.randrange(20, 400, 10)) if rng.random() < 0.4 else None,
+        'is_active': True,
+        'is_archived': False,
+        'created_at': stamp,
+        'updated_at': stamp
+    } for i in range(size.projects)]
+    project_ids = [project['id'] for project in projects]
+
+    sessions, allocations = [], []
+    day, active = start, []
+    busiest_date, busiest = start, -1
+    while day <= end:
+        if not active or (day.day == 1 and day.month % 3 == 1):
+            active = rng.sample(project_ids, min(len(project_ids), QUARTER_ACTIVE_PROJECTS))
+        if day.weekday() < 5 and rng.random() < WORKDAY_PROBABILITY:
+            day_sessions, day_allocations = _workday(day, active, rng)
+            sessions.extend(day_sessions)
+            allocations.extend(day_allocations)
+            if len(day_allocations) > busiest:
+                busiest_date, busiest = day, len(day_allocations)
+        day += timedelta(days=1)
+
+    for row in sessions + allocations:
+        row['id'] = str(uuid.UUID(int=rng.getrandbits(128)))
+        row['created_at'] = row['updated_at'] = datetime.combine(row['date'], time(18))
+
+    with owner_context(app):
+        db.session.execute(db.insert(Client), clients)
+        db.session.execute(db.insert(Project), projects)
+        db.session.execute(db.insert(WorkSession), sessions)
+        db.session.execute(db.insert(TimeAllocation), allocations)
+        db.session.commit()
+        RollupService.rebuild()
+
+    return Dataset(
+        size=size,
+        start=start,
+        end=end,
+        client_ids=[client['id'] for client in clients],
+        project_ids=project_ids,
+        counts={
+            'clients': len(clients),
+            'projects': len(projects),
+            'work_sessions': len(sessions),
+            'time_allocations': len(allocations)
+        },
+        busiest_date=busiest_date
+    )
@@ -0,0 +1,141 @@
+"""
+Shared helpers for benchmark scripts.
+
+Benchmarks run the real Flask app against a throwaway database and drive it
+through the Flask test client, so they measure the same code paths as production.
+Benchmarks that need real concurrency start gunicorn with start_gunicorn().
+"""
+import http.client
+import json
+import os
+import socket
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+
+import bcrypt
+from sqlalchemy import event
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+
+def create_benchmark_app(database_url=None, bcrypt_rounds=4):
+    """Create an app bound to a scratch database with all tables created.
+
+    Defaults to a fresh SQLite file in a temporary directory. The default
+    user (DEFAULT_USERNAME) is created with BENCHMARK_PASSWORD, hashed at
+    bcrypt_rounds; cheap by default, pass 12 to measure real login cost.
+    """
+    if database_url is None:
+        database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='tt-bench-'), 'bench.db')
+
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+    from backend.app import create_app
+    from backend.extensions import db
+    from backend.services.auth_service import AuthService
+
+    # Fresh limiter and login counters, so runs never inherit each other's limits or lockouts
+    limits_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='tt-bench-'), 'limits.db')
+    app = create_app('development', config_overrides={
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'RATELIMIT_ENABLED': False,
+        'RATELIMIT_STORAGE_URI': limits_url,
+        'LOGIN_THROTTLE_STORAGE_URI': limits_url,
+    })
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        password_hash = bcrypt.hashpw(BENCHMARK_PASSWORD.encode(), bcrypt.gensalt(bcrypt_rounds)).decode()
+        user = AuthService.create_user(app.config['DEFAULT_USERNAME'], password_hash)
+        db.session.commit()
+        app.config['BENCHMARK_USER_ID'] = user.id
+    return app
+
+
+@contextmanager
+def owner_context(app):
+    """App context whose ORM statements and new rows belong to the benchmark user."""
+    from backend.utils.tenancy import as_owner
+
+    with app.app_context(), as_owner(app.config['BENCHMARK_USER_ID']):
+        yield
+
+
+def log_in(client, app):
+    """Put the benchmark user's login on a test client's session."""
+    with client.session_transaction() as session:
+        session['user_id'] = app.config['BENCHMARK_USER_ID']
+        session['username'] = app.config['DEFAULT_USERNAME']
+
+
+def authenticated_client(app):
+    """Return a test client with an authenticated session."""
+    client = app.test_client()
+    log_in(client, app)
+    return client
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@contextmanager
+def count_queries(app):
+    """Context manager yielding a QueryCounter for statements run inside it."""
+    from backend.extensions import db
+
+    with app.app_context():
+        engine = db.engine
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter)
+
+
+def free_port():
+    """Return a TCP port that is free on the loopback interface."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def http_request(port, method, path, body=None, headers=None, source='127.0.0.1'):
+    """Send one JSON request to a local server; returns (status, Set-Cookie header)."""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60, source_address=(source, 0))
+    try:
+        connection.request(method, path, body=json.dumps(body) if body is not None else None,
+                           headers={'Content-Type': 'application/json', **(headers or {})})
+        response = connection.getresponse()
+        response.read()
+        return response.status, response.getheader('Set-Cookie')
+    finally:
+        connection.close()
+
+
+def start_gunicorn(port, env, workers=1, threads=1, worker_class='gthread'):
+    """Start gunicorn serving the production app and wait until it answers."""
+    server = subprocess.Popen(
+        ['gunicorn', '--workers', str(workers), '--threads', str(threads), '--worker-class', worker_class,
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', "backend.app:create_app('production')"],
+        env={**os.environ, **env}
+    )
+    for _ in range(100):
+        try:
+            http_request(port, 'GET', '/api/auth/me')
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError('gunicorn did not start')
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Compare UUID keys stored as 36-character text with 16-byte blobs on SQLite.
+
+Usage:
+    python -m benchmarks.key_storage [--size large] [--users 10] [--repeat 40]
+
+Seeds `users` copies of a synthetic dataset (one per user), then makes a
+second copy of the database with every key and foreign key rewritten as
+text, as it was before keys became 16-byte blobs. Both copies are vacuumed,
+then compared on the size of each table and index (from dbstat), and on
+throughput of two queries run through sqlite3 directly so only storage
+differs: a join of one user's allocations to their projects and clients,
+and primary-key lookups of allocations (best of five rounds each).
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+import uuid
+
+from benchmarks.data import SIZES, generate
+from benchmarks.harness import create_benchmark_app
+
+# Every UUID key and foreign key column, per table
+KEY_COLUMNS = {
+    'users': ['id'],
+    'clients': ['id', 'owner_id'],
+    'projects': ['id', 'client_id', 'owner_id'],
+    'work_sessions': ['id', 'owner_id'],
+    'time_allocations': ['id', 'project_id', 'owner_id'],
+    'daily_project_hours': ['owner_id', 'project_id'],
+    'catalog_version': ['owner_id'],
+    'login_attempts': ['id'],
+}
+
+JOIN_QUERY = """
+    SELECT c.id, SUM(a.hours)
+    FROM time_allocations a
+    JOIN projects p ON p.id = a.project_id
+    JOIN clients c ON c.id = p.client_id
+    WHERE a.owner_id = ?
+    GROUP BY c.id
+"""
+LOOKUP_QUERY = 'SELECT hours FROM time_allocations WHERE id = ?'
+
+
+def seed(path, size, users):
+    """Seed `users` datasets into a fresh database at path."""
+    from backend.extensions import db
+    from backend.services.auth_service import AuthService
+
+    app = create_benchmark_app('sqlite:///' + path)
+    for index in range(users):
+        if index:
+            with app.app_context():
+                user = AuthService.create_user(f'user{index}', 'x')
+                db.session.commit()
+                app.config['BENCHMARK_USER_ID'] = user.id
+        generate(app, SIZES[size], seed=index)
+    with app.app_context():
+        db.engine.dispose()
+
+
+def rewrite_keys_as_text(path):
+    """Rewrite every blob key in the database at path as its 36-character text form."""
+    with sqlite3.connect(path) as connection:
+        connection.create_function(
+            'key_text', 1, lambda value: str(uuid.UUID(bytes=value)) if value else value, deterministic=True
+        )
+        for table, columns in KEY_COLUMNS.items():
+            assignments = ', '.join(f'{column} = key_text({column})' for column in columns)
+            connection.execute(f'UPDATE {table} SET {assignments}')
+
+
+def object_sizes(connection):
+    """Bytes used by each table and index."""
+    connection.execute('VACUUM')
+    return dict(connection.execute(
+        "SELECT name, SUM(pgsize) FROM dbstat WHERE name NOT LIKE 'sqlite_%' GROUP BY name"
+    ))
+
+
+def queries_per_second(connection, query, parameters, repeat, rounds=5):
+    """Best of `rounds` timings of running query once per parameter tuple, `repeat` times over."""
+    for args in parameters:
+        connection.execute(query, args).fetchall()  # Warm the page cache
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for args in parameters:
+                connection.execute(query, args).fetchall()
+        best = min(best, time.perf_counter() - started)
+    return repeat * len(parameters) / best
+
+
+def measure(path, repeat):
+    connection = sqlite3.connect(path)
+    try:
+        sizes = object_sizes(connection)
+        owners = [row for row in connection.execute('SELECT id FROM users')]
+        ids = [row[0] for row in connection.execute('SELECT id FROM time_allocations')]
+        lookups = [(key,) for key in random.Random(0).sample(ids, min(len(ids), 1000))]
+        return {
+            'sizes': sizes,
+            'file': os.path.getsize(path),
+            'join': queries_per_second(connection, JOIN_QUERY, owners, repeat),
+            'lookup': queries_per_second(connection, LOOKUP_QUERY, lookups, max(1, repeat // 4)),
+        }
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', choices=SIZES, default='large', help='Synthetic dataset size per user')
+    parser.add_argument('--users', type=int, default=10, help='Users, each with their own dataset')
+    parser.add_argument('--repeat', type=int, default=40, help='Runs of the join query per user, per round')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='tt-keys-')
+    blob_path = os.path.join(directory, 'blob.db')
+    text_path = os.path.join(directory, 'text.db')
+    seed(blob_path, args.size, args.users)
+    shutil.copyfile(blob_path, text_path)
+    rewrite_keys_as_text(text_path)
+
+    text, blob = measure(text_path, args.repeat), measure(blob_path, args.repeat)
+    with sqlite3.connect(blob_path) as connection:
+        allocations = connection.execute('SELECT COUNT(*) FROM time_allocations').fetchone()[0]
+    print(f'{args.users} users, {allocations} allocations')
+
+    def change(before, after):
+        return f'{(after - before) * 100 / before:+.0f}%' if before else ''
+
+    print(f"{'table or index':<44} {'text KiB':>9} {'blob KiB':>9} {'change':>7}")
+    for name in sorted(text['sizes'], key=lambda name: -text['sizes'][name]):
+        before, after = text['sizes'][name], blob['sizes'].get(name, 0)
+        print(f'{name:<44} {before / 1024:>9.0f} {after / 1024:>9.0f} {change(before, after):>7}')
+    print(f"{'database file':<44} {text['file'] / 1024:>9.0f} {blob['file'] / 1024:>9.0f} "
+          f"{change(text['file'], blob['file']):>7}")
+    print()
+    print(f"{'query':<44} {'text q/s':>9} {'blob q/s':>9} {'change':>7}")
+    for label, key in [('allocations joined to projects and clients', 'join'), ('allocation by primary key', 'lookup')]:
+        print(f'{label:<44} {text[key]:>9.0f} {blob[key]:>9.0f} {change(text[key], blob[key]):>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Measure rate limit storage cost per request and cross-process accuracy.
+
+Usage:
+    python -m benchmarks.limiter_storage [--hits 5000] [--workers 4]
+
+For memory:// and the sqlite:// file storage, reports the mean and p99 cost
+of one fixed-window hit (what Flask-Limiter's default limits do on every
+request, twice) and of moving and sliding window hits. Then `workers`
+processes race for a shared limit of 100 per minute: with shared storage
+exactly 100 hits are allowed in total, while memory:// allows 100 each.
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import tempfile
+import time
+
+from limits import RateLimitItemPerMinute
+from limits.storage import storage_from_string
+from limits.strategies import (
+    FixedWindowRateLimiter, MovingWindowRateLimiter, SlidingWindowCounterRateLimiter
+)
+
+import backend.utils.limiter_storage  # noqa: F401 - registers sqlite://
+
+STRATEGIES = {
+    'fixed-window': FixedWindowRateLimiter,
+    'moving-window': MovingWindowRateLimiter,
+    'sliding-window': SlidingWindowCounterRateLimiter,
+}
+SHARED_LIMIT = RateLimitItemPerMinute(100)
+
+
+def time_hits(uri, strategy, hits):
+    """Return per-hit latencies in microseconds, over many distinct keys."""
+    limiter = STRATEGIES[strategy](storage_from_string(uri))
+    item = RateLimitItemPerMinute(1000)
+    latencies = []
+    for i in range(hits):
+        started = time.perf_counter()
+        limiter.hit(item, 'bench', str(i % 500))
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    return latencies
+
+
+def race(args):
+    uri, attempts = args
+    limiter = MovingWindowRateLimiter(storage_from_string(uri))
+    return sum(limiter.hit(SHARED_LIMIT, 'race') for _ in range(attempts))
+
+
+def run(hits, workers):
+    directory = tempfile.mkdtemp(prefix='tt-limits-')
+    uris = {
+        'memory': 'memory://',
+        'sqlite': 'sqlite:///' + os.path.join(directory, 'limits.db'),
+    }
+
+    print(f"{'storage':<8} {'strategy':<15} {'mean us':>9} {'p99 us':>9}")
+    for name, uri in uris.items():
+        for strategy in STRATEGIES:
+            latencies = sorted(time_hits(uri, strategy, hits))
+            p99 = latencies[max(0, math.ceil(0.99 * len(latencies)) - 1)]
+            print(f'{name:<8} {strategy:<15} {sum(latencies) / len(latencies):>9.1f} {p99:>9.1f}')
+
+    print(f'\n{workers} processes x 100 attempts against a shared limit of 100/minute:')
+    for name, uri in uris.items():
+        if name == 'sqlite':
+            uri = 'sqlite:///' + os.path.join(directory, 'race.db')
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            allowed = sum(pool.map(race, [(uri, 100)] * workers))
+        print(f'{name:<8} allowed {allowed}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--hits', type=int, default=5000, help='Hits timed per storage and strategy')
+    parser.add_argument('--workers', type=int, default=4, help='Processes in the shared-limit race')
+    args = parser.parse_args()
+    run(args.hits, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Show that the project and allocation list endpoints run a fixed number of queries.
+
+Usage:
+    python -m benchmarks.list_queries [--sizes 10,100,500]
+
+Seeds N projects (spread over N/5 clients) with one allocation each on the
+same date, then reports SQL statements and wall time for GET /api/projects
+and GET /api/allocations?date=.
+"""
+import argparse
+import time
+from datetime import date
+from decimal import Decimal
+
+from benchmarks.harness import authenticated_client, count_queries, create_benchmark_app, owner_context
+
+ALLOCATION_DATE = date(2026, 1, 5)
+
+
+def seed_projects(app, count):
+    """Insert `count` projects with one allocation each on ALLOCATION_DATE."""
+    from backend.extensions import db
+    from backend.models import Client, Project, TimeAllocation
+
+    with owner_context(app):
+        clients = [
+            Client(name=f'Client {i}', currency='EUR', default_hourly_rate=Decimal('90'))
+            for i in range(max(1, count // 5))
+        ]
+        db.session.add_all(clients)
+        for i in range(count):
+            project = Project(client=clients[i % len(clients)], name=f'Project {i}')
+            db.session.add(project)
+            db.session.add(TimeAllocation(date=ALLOCATION_DATE, project=project, hours=Decimal('0.25')))
+        db.session.commit()
+
+
+def measure(app, client, path):
+    with count_queries(app) as counter:
+        started = time.perf_counter()
+        response = client.get(path)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return counter.count, elapsed_ms
+
+
+def run(sizes):
+    endpoints = ['/api/projects', f'/api/allocations?date={ALLOCATION_DATE.isoformat()}']
+    print(f"{'rows':>6} {'endpoint':<32} {'queries':>8} {'ms':>8}")
+    for size in sizes:
+        app = create_benchmark_app()
+        seed_projects(app, size)
+        client = authenticated_client(app)
+        for path in endpoints:
+            queries, elapsed_ms = measure(app, client, path)
+            print(f'{size:>6} {path:<32} {queries:>8} {elapsed_ms:>8.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,500', help='Comma-separated project counts')
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(',')])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Measure authenticated request latency while logins flood a gunicorn worker.
+
+Usage:
+    python -m benchmarks.login_flood [--flooders 8] [--probes 100] [--threads 2]
+
+Starts gunicorn (one worker, `threads` threads) on a scratch SQLite database
+and measures GET /api/sessions latency with no load, then while `flooders`
+threads send wrong passwords from distinct 127.x source addresses. The flood
+runs three times: with PASSWORD_VERIFY_WORKERS equal to the thread count
+(every thread may be hashing, as with inline bcrypt), with a single
+verification slot and no queue (excess logins get 429 without hashing), and
+with the defaults (a single slot and a queue).
+"""
+import argparse
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.harness import (
+    BENCHMARK_PASSWORD, create_benchmark_app, free_port, http_request as request, start_gunicorn
+)
+
+
+def start_server(port, database_url, env_overrides, threads):
+    env = {
+        'DATABASE_URL': database_url,
+        'SECRET_KEY': 'benchmark',
+        'RATELIMIT_STORAGE_URI': 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='tt-flood-'), 'limits.db'),
+        'METRICS_ENABLED': 'false',
+        **env_overrides
+    }
+    return start_gunicorn(port, env, threads=threads)
+
+
+def probe(port, cookie, count):
+    """Sequential authenticated requests; returns latencies in ms."""
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        status, _ = request(port, 'GET', '/api/sessions?date=2026-01-05', headers={'Cookie': cookie})
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert status == 200, status
+    return sorted(latencies)
+
+
+def flood(port, stop, statuses, index):
+    attempt = 0
+    while not stop.is_set():
+        attempt += 1
+        # A new source address per attempt stays under the per-IP limits, like a distributed attack
+        source = f'127.{index + 1}.{attempt // 250 % 250}.{attempt % 250 + 1}'
+        status, _ = request(port, 'POST', '/api/auth/login', body={'password': 'wrong'}, source=source)
+        statuses.append(status)
+
+
+def percentile(ordered, fraction):
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_case(label, database_url, env_overrides, threads, flooders, probes):
+    port = free_port()
+    server = start_server(port, database_url, env_overrides, threads)
+    try:
+        status, cookie = request(port, 'POST', '/api/auth/login', body={'password': BENCHMARK_PASSWORD}, source='127.0.0.2')
+        assert status == 200, status
+        cookie = cookie.split(';', 1)[0]
+
+        idle = probe(port, cookie, probes)
+
+        stop, statuses = threading.Event(), []
+        workers = [threading.Thread(target=flood, args=(port, stop, statuses, i)) for i in range(flooders)]
+        for worker in workers:
+            worker.start()
+        time.sleep(1)
+        loaded = probe(port, cookie, probes)
+        stop.set()
+        for worker in workers:
+            worker.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    rejected = sum(1 for status in statuses if status == 429)
+    print(f'{label:<34} {percentile(idle, 0.5):>8.1f} {percentile(loaded, 0.5):>10.1f} '
+          f'{percentile(loaded, 0.95):>10.1f} {len(statuses):>7} {rejected:>6}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--flooders', type=int, default=8, help='Concurrent login threads')
+    parser.add_argument('--probes', type=int, default=100, help='Authenticated requests per phase')
+    parser.add_argument('--threads', type=int, default=2, help='gunicorn threads')
+    args = parser.parse_args()
+
+    if sys.platform != 'linux':
+        parser.error('needs Linux, which routes all of 127.0.0.0/8 to loopback')
+
+    database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='tt-flood-'), 'flood.db')
+    # Real bcrypt cost: the flood has to be as expensive as in production
+    create_benchmark_app(database_url, bcrypt_rounds=12)
+
+    print(f"{'configuration':<34} {'idle p50':>8} {'flood p50':>10} {'flood p95':>10} {'logins':>7} {'429s':>6}")
+    run_case(f'{args.threads} verify slots (inline-like)', database_url,
+             {'PASSWORD_VERIFY_WORKERS': str(args.threads), 'PASSWORD_VERIFY_QUEUE_SIZE': '0'},
+             args.threads, args.flooders, args.probes)
+    run_case('1 verify slot, no queue', database_url,
+             {'PASSWORD_VERIFY_WORKERS': '1', 'PASSWORD_VERIFY_QUEUE_SIZE': '0'},
+             args.threads, args.flooders, args.probes)
+    run_case('1 verify slot, queue (default)', database_url, {}, args.threads, args.flooders, args.probes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Measure API throughput on SQLite with and without the SQLite engine profile.
+
+Usage:
+    python -m benchmarks.sqlite_profile [--workers 4] [--threads 2] [--clients 8] [--duration 10]
+
+Seeds a synthetic dataset, then starts gunicorn (`workers` x `threads`,
+as in render.yaml) twice on copies of it: with SQLITE_PROFILE_ENABLED=false
+and a rollback journal (the previous defaults), and with the profile (WAL,
+synchronous=NORMAL, busy_timeout, write serialization). `clients` threads
+send a mix of reads and writes (clock a session, then allocate hours to it)
+for `duration` seconds. Reports requests per second, latency percentiles and
+failed requests; without the profile, concurrent writers can fail with
+"database is locked".
+"""
+import argparse
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from benchmarks.data import SIZES, generate
+from benchmarks.harness import BENCHMARK_PASSWORD, create_benchmark_app, free_port, http_request, start_gunicorn
+
+WRITE_DATES_START = date(2030, 1, 1)
+
+
+class Results:
+    """Latencies and failures collected by all client threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.failures = 0
+
+    def record(self, started, ok):
+        elapsed = (time.perf_counter() - started) * 1000
+        with self.lock:
+            self.latencies.append(elapsed)
+            self.failures += not ok
+
+
+def run_client(port, cookie, dataset, write_ratio, index, stop, results):
+    rng = random.Random(index)
+    headers = {'Cookie': cookie}
+    sent = 0
+    days = (dataset.end - dataset.start).days
+
+    def send(method, path, body=None):
+        nonlocal sent
+        sent += 1
+        # Rotate source addresses so the per-IP default limits never kick in
+        source = f'127.{index + 1}.{sent // 250 % 250}.{sent % 250 + 1}'
+        started = time.perf_counter()
+        try:
+            status, _ = http_request(port, method, path, body=body, headers=headers, source=source)
+        except OSError:
+            status = None
+        results.record(started, status is not None and status < 400)
+        return status
+
+    writes = 0
+    while not stop.is_set():
+        if rng.random() < write_ratio:
+            # A date no other thread writes to, so every write is valid
+            day = (WRITE_DATES_START + timedelta(days=index * 10000 + writes)).isoformat()
+            writes += 1
+            if send('POST', '/api/sessions', {
+                'date': day, 'start_time': f'{day}T09:00:00', 'end_time': f'{day}T17:00:00'
+            }) == 201:
+                send('POST', '/api/allocations', {
+                    'date': day, 'project_id': rng.choice(dataset.project_ids), 'hours': 2
+                })
+        else:
+            day = (dataset.start + timedelta(days=rng.randrange(days))).isoformat()
+            path = rng.choice([
+                f'/api/allocations?date={day}',
+                f'/api/sessions?date={day}',
+                f'/api/calendar?month={day[:7]}',
+            ])
+            send('GET', path)
+
+
+def percentile(ordered, fraction):
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_case(label, database_path, profile, args, dataset):
+    if not profile:
+        # journal_mode=WAL persists in the file; go back to the rollback journal
+        with sqlite3.connect(database_path) as connection:
+            connection.execute('PRAGMA journal_mode=DELETE')
+
+    port = free_port()
+    server = start_gunicorn(port, {
+        'DATABASE_URL': 'sqlite:///' + database_path,
+        'SECRET_KEY': 'benchmark',
+        'RATELIMIT_STORAGE_URI': 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='tt-sqlite-'), 'limits.db'),
+        'METRICS_ENABLED': 'false',
+        'SQLITE_PROFILE_ENABLED': 'true' if profile else 'false',
+    }, workers=args.workers, threads=args.threads)
+    try:
+        status, cookie = http_request(port, 'POST', '/api/auth/login', body={'password': BENCHMARK_PASSWORD})
+        assert status == 200, status
+        cookie = cookie.split(';', 1)[0]
+
+        stop, results = threading.Event(), Results()
+        clients = [
+            threading.Thread(target=run_client, args=(port, cookie, dataset, args.write_ratio, i, stop, results))
+            for i in range(args.clients)
+        ]
+        started = time.perf_counter()
+        for client in clients:
+            client.start()
+        time.sleep(args.duration)
+        stop.set()
+        for client in clients:
+            client.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(results.latencies)
+    print(f'{label:<22} {len(latencies) / elapsed:>8.1f} {percentile(latencies, 0.5):>8.1f} '
+          f'{percentile(latencies, 0.95):>8.1f} {percentile(latencies, 0.99):>8.1f} {results.failures:>8}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=2, help='gunicorn threads per worker')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent client threads')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of load per configuration')
+    parser.add_argument('--write-ratio', type=float, default=0.3, help='Fraction of iterations that write')
+    parser.add_argument('--size', choices=SIZES, default='small', help='Synthetic dataset size')
+    parser.add_argument('--directory', help='Where to put the databases (default: a temp dir); '
+                                            'use the production volume to include its fsync cost')
+    args = parser.parse_args()
+
+    if sys.platform != 'linux':
+        parser.error('needs Linux, which routes all of 127.0.0.0/8 to loopback')
+
+    directory = tempfile.mkdtemp(prefix='tt-sqlite-', dir=args.directory)
+    seed_path = os.path.join(directory, 'seed.db')
+    app = create_benchmark_app('sqlite:///' + seed_path)
+    dataset = generate(app, SIZES[args.size])
+    with app.app_context():
+        from backend.extensions import db
+        db.engine.dispose()
+
+    print(f"{'configuration':<22} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'failed':>8}")
+    for label, profile in [('default engine', False), ('sqlite profile', True)]:
+        database_path = os.path.join(directory, f'{"profile" if profile else "default"}.db')
+        with sqlite3.connect(seed_path) as source, sqlite3.connect(database_path) as target:
+            source.backup(target)
+        run_case(label, database_path, profile, args, dataset)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Measure /api/stream fan-out and API latency with many open streams.
+
+Usage:
+    python -m benchmarks.stream_fanout [--streams 50] [--workers 2] [--threads 2] [--events 20]
+
+Starts gunicorn twice on a scratch SQLite database, with gthread workers
+(`workers` x `threads`) and with gevent workers. Each run opens `streams`
+SSE connections, measures GET /api/sessions latency while they are open,
+then creates `events` work sessions and reports how many streams connected,
+how many events reached every connected stream, and the delivery latency
+from the write's response to each stream. With gthread every open stream
+holds a thread, so streams beyond workers x threads never connect and API
+requests queue behind them.
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import signal
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from benchmarks.harness import BENCHMARK_PASSWORD, create_benchmark_app, free_port, http_request, start_gunicorn
+
+CONNECT_TIMEOUT_SECONDS = 5
+PROBE_TIMEOUT_SECONDS = 2
+
+
+class StreamReader(threading.Thread):
+    """Reads one SSE stream, recording when each session.created event arrives."""
+
+    def __init__(self, port, cookie):
+        super().__init__(daemon=True)
+        self.port, self.cookie = port, cookie
+        self.connected = threading.Event()
+        self.arrivals = []
+        self.connection = None
+
+    def run(self):
+        self.connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=CONNECT_TIMEOUT_SECONDS)
+        try:
+            self.connection.request('GET', '/api/stream', headers={'Cookie': self.cookie})
+            response = self.connection.getresponse()
+            self.connection.sock.settimeout(None)
+            for line in response.fp:
+                if line.startswith(b'event: ready'):
+                    self.connected.set()
+                elif line.startswith(b'event: session.created'):
+                    self.arrivals.append(time.perf_counter())
+        except OSError:
+            pass
+
+    def close(self):
+        try:
+            self.connection.sock.shutdown(2)
+        except (AttributeError, OSError):
+            pass
+
+
+def timed_request(port, method, path, headers, body=None):
+    """Milliseconds for one request, or inf if it is not answered in time."""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=PROBE_TIMEOUT_SECONDS)
+    started = time.perf_counter()
+    try:
+        connection.request(method, path, body=json.dumps(body) if body is not None else None,
+                           headers={'Content-Type': 'application/json', **headers})
+        response = connection.getresponse()
+        response.read()
+        return (time.perf_counter() - started) * 1000 if response.status < 300 else float('inf')
+    except OSError:
+        return float('inf')
+    finally:
+        connection.close()
+
+
+def percentile(ordered, fraction):
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)] if ordered else float('nan')
+
+
+def run_case(label, worker_class, database_url, first_day, args):
+    port = free_port()
+    directory = tempfile.mkdtemp(prefix='tt-stream-')
+    server = start_gunicorn(port, {
+        'DATABASE_URL': database_url,
+        'SECRET_KEY': 'benchmark',
+        'RATELIMIT_STORAGE_URI': 'sqlite:///' + os.path.join(directory, 'limits.db'),
+        'EVENT_CHANNEL_URI': 'sqlite:///' + os.path.join(directory, 'events.db'),
+        'METRICS_ENABLED': 'false',
+        'STREAM_ENABLED': 'true',
+    }, workers=args.workers, threads=args.threads, worker_class=worker_class)
+    readers = []
+    try:
+        status, cookie = http_request(port, 'POST', '/api/auth/login', body={'password': BENCHMARK_PASSWORD})
+        assert status == 200, status
+        cookie = cookie.split(';', 1)[0]
+        headers = {'Cookie': cookie}
+
+        readers = [StreamReader(port, cookie) for _ in range(args.streams)]
+        for reader in readers:
+            reader.start()
+        deadline = time.monotonic() + CONNECT_TIMEOUT_SECONDS
+        for reader in readers:
+            reader.connected.wait(max(0.0, deadline - time.monotonic()))
+        connected = [reader for reader in readers if reader.connected.is_set()]
+
+        probes = sorted(timed_request(port, 'GET', '/api/sessions?date=2030-01-01', headers) for _ in range(10))
+
+        sent = []
+        for i in range(args.events):
+            day = (first_day + timedelta(days=i)).isoformat()
+            elapsed = timed_request(port, 'POST', '/api/sessions', headers, body={
+                'date': day, 'start_time': f'{day}T09:00:00', 'end_time': f'{day}T10:00:00'
+            })
+            if elapsed == float('inf'):
+                # Every thread is held by a stream; later events could not be matched up
+                break
+            sent.append(time.perf_counter())
+            time.sleep(0.05)
+        time.sleep(1)
+    finally:
+        for reader in readers:
+            reader.close()
+        # Quick shutdown: a graceful one would wait for the open streams
+        server.send_signal(signal.SIGINT)
+        server.wait()
+
+    delays = sorted(
+        (arrival - sent_at) * 1000
+        for reader in connected for arrival, sent_at in zip(reader.arrivals, sent)
+    )
+    complete = sum(1 for reader in connected if sent and len(reader.arrivals) == len(sent))
+    print(f'{label:<10} {len(connected):>9}/{args.streams:<4} {percentile(probes, 0.5):>9.1f} '
+          f'{percentile(probes, 0.95):>9.1f} {complete:>5}/{len(sent):<3} {percentile(delays, 0.5):>9.1f} {percentile(delays, 0.95):>9.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--streams', type=int, default=50, help='Open SSE connections')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=2, help='Threads per gthread worker')
+    parser.add_argument('--events', type=int, default=20, help='Writes to publish')
+    args = parser.parse_args()
+
+    database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='tt-stream-'), 'stream.db')
+    create_benchmark_app(database_url)
+
+    print(f"{'worker':<10} {'connected':>14} {'api p50':>9} {'api p95':>9} {'complete':>9} "
+          f"{'event p50':>9} {'event p95':>9}")
+    run_case('gthread', 'gthread', database_url, date(2030, 1, 1), args)
+    # Writes queued behind gthread's streams may land late, so each run uses its own days
+    run_case('gevent', 'gevent', database_url, date(2031, 1, 1), args)
+
+
+if __name__ == '__main__':
+    main()
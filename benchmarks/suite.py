@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Benchmark every API endpoint against synthetic data and write JSON results.
+
+Usage:
+    python -m benchmarks.suite [--sizes small,medium] [--databases sqlite,postgresql]
+                               [--postgres-url URL] [--repeat 20] [--output results.json]
+
+For each database and data size (see benchmarks.data.SIZES) a fresh database
+is seeded, then every scenario is run `repeat` times through the Flask test
+client after one discarded warm-up run. Each result reports p50/p95 latency,
+the median and maximum SQL statement count, and the peak Python memory
+allocated during one traced run. Compare two result files with
+benchmarks.compare.
+
+PostgreSQL runs need --postgres-url (or BENCHMARK_POSTGRES_URL) pointing at a
+scratch database: every table in it is dropped and recreated.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from benchmarks.data import SIZES, generate
+from benchmarks.harness import (
+    BENCHMARK_PASSWORD, authenticated_client, count_queries, create_benchmark_app, log_in
+)
+
+
+Scenario = namedtuple('Scenario', ['endpoint', 'name', 'request', 'setup', 'teardown', 'expect'])
+
+SCENARIOS = []
+
+
+def scenario(endpoint, name=None, setup=None, teardown=None, expect=200):
+    """Register a request builder, called as request(ctx, state) -> (method, path, kwargs)."""
+    def register(request):
+        SCENARIOS.append(Scenario(endpoint, name or endpoint, request, setup, teardown, expect))
+        return request
+    return register
+
+
+class Context:
+    """A seeded app, an authenticated client and the dataset it holds."""
+
+    def __init__(self, app, dataset):
+        self.app = app
+        self.dataset = dataset
+        self.client = authenticated_client(app)
+        self._next_free_date = dataset.end + timedelta(days=1)
+        self._sequence = 0
+
+    def free_date(self):
+        """A date after the dataset with nothing on it yet."""
+        day = self._next_free_date
+        self._next_free_date += timedelta(days=1)
+        return day
+
+    def sequence(self):
+        self._sequence += 1
+        return self._sequence
+
+    def call(self, method, path, **kwargs):
+        """Run an untimed setup/teardown request and return its JSON body."""
+        response = self.client.open(path, method=method, **kwargs)
+        assert response.status_code < 300, (method, path, response.get_data(as_text=True)[:500])
+        return response.get_json(silent=True)
+
+
+# Setup and teardown helpers
+
+def new_client(ctx):
+    return ctx.call('POST', '/api/clients', json={
+        'name': f'Bench client {ctx.sequence()}', 'currency': 'CHF', 'default_hourly_rate': 100
+    })['client']['id']
+
+
+def new_project(ctx):
+    return ctx.call('POST', '/api/projects', json={
+        'client_id': ctx.dataset.client_ids[0], 'name': f'Bench project {ctx.sequence()}'
+    })['project']['id']
+
+
+def new_session(ctx):
+    day = ctx.free_date().isoformat()
+    session = ctx.call('POST', '/api/sessions', json={
+        'date': day, 'start_time': f'{day}T09:00:00', 'end_time': f'{day}T17:00:00'
+    })['session']
+    return {'id': session['id'], 'date': day}
+
+
+def new_allocation(ctx):
+    day = new_session(ctx)['date']
+    return ctx.call('POST', '/api/allocations', json={
+        'date': day, 'project_id': ctx.dataset.project_ids[0], 'hours': 1
+    })['allocation']['id']
+
+
+def clock_in_state(ctx):
+    day = ctx.free_date().isoformat()
+    ctx.call('POST', '/api/sessions/clock-in', json={'time': f'{day}T09:00:00'})
+    return day
+
+
+def delete_created(kind, path):
+    """Teardown deleting the object a create request returned under `kind`."""
+    def teardown(ctx, state, response):
+        ctx.call('DELETE', f"{path}/{response.get_json()[kind]['id']}")
+    return teardown
+
+
+def reauthenticate(ctx, state, response):
+    log_in(ctx.client, ctx.app)
+
+
+# Auth
+
+@scenario('auth.login', teardown=reauthenticate)
+def login(ctx, state):
+    # A fresh address per attempt keeps the per-IP login rate limit out of the way
+    attempt = ctx.sequence()
+    return 'POST', '/api/auth/login', {
+        'json': {'password': BENCHMARK_PASSWORD},
+        'environ_base': {'REMOTE_ADDR': f'10.{attempt // 65536 % 256}.{attempt // 256 % 256}.{attempt % 256}'}
+    }
+
+
+@scenario('auth.logout', teardown=reauthenticate)
+def logout(ctx, state):
+    return 'POST', '/api/auth/logout', {}
+
+
+@scenario('auth.me')
+def me(ctx, state):
+    return 'GET', '/api/auth/me', {}
+
+
+# Clients and projects
+
+@scenario('clients.get_clients')
+def get_clients(ctx, state):
+    return 'GET', '/api/clients?include_archived=true', {}
+
+
+@scenario('clients.get_client')
+def get_client(ctx, state):
+    return 'GET', f'/api/clients/{ctx.dataset.client_ids[0]}', {}
+
+
+@scenario('clients.create_client', expect=201, teardown=delete_created('client', '/api/clients'))
+def create_client(ctx, state):
+    return 'POST', '/api/clients', {'json': {
+        'name': f'Bench client {ctx.sequence()}', 'currency': 'EUR', 'default_hourly_rate': 90
+    }}
+
+
+@scenario('clients.update_client')
+def update_client(ctx, state):
+    return 'PUT', f'/api/clients/{ctx.dataset.client_ids[0]}', {'json': {'short_name': f'C{ctx.sequence()}'}}
+
+
+@scenario('clients.archive_client',
+          teardown=lambda ctx, state, response: ctx.call('PUT', f'/api/clients/{ctx.dataset.client_ids[0]}/restore'))
+def archive_client(ctx, state):
+    return 'PUT', f'/api/clients/{ctx.dataset.client_ids[0]}/archive', {}
+
+
+@scenario('clients.restore_client',
+          setup=lambda ctx: ctx.call('PUT', f'/api/clients/{ctx.dataset.client_ids[0]}/archive'))
+def restore_client(ctx, state):
+    return 'PUT', f'/api/clients/{ctx.dataset.client_ids[0]}/restore', {}
+
+
+@scenario('clients.delete_client', setup=new_client, expect=204)
+def delete_client(ctx, client_id):
+    return 'DELETE', f'/api/clients/{client_id}', {}
+
+
+@scenario('projects.get_projects')
+def get_projects(ctx, state):
+    return 'GET', '/api/projects?include_archived=true', {}
+
+
+@scenario('projects.get_project')
+def get_project(ctx, state):
+    return 'GET', f'/api/projects/{ctx.dataset.project_ids[0]}', {}
+
+
+@scenario('projects.create_project', expect=201, teardown=delete_created('project', '/api/projects'))
+def create_project(ctx, state):
+    return 'POST', '/api/projects', {'json': {
+        'client_id': ctx.dataset.client_ids[0], 'name': f'Bench project {ctx.sequence()}'
+    }}
+
+
+@scenario('projects.update_project')
+def update_project(ctx, state):
+    return 'PUT', f'/api/projects/{ctx.dataset.project_ids[0]}', {'json': {'short_name': f'P{ctx.sequence()}'}}
+
+
+@scenario('projects.archive_project',
+          teardown=lambda ctx, state, response: ctx.call('PUT', f'/api/projects/{ctx.dataset.project_ids[0]}/restore'))
+def archive_project(ctx, state):
+    return 'PUT', f'/api/projects/{ctx.dataset.project_ids[0]}/archive', {}
+
+
+@scenario('projects.restore_project',
+          setup=lambda ctx: ctx.call('PUT', f'/api/projects/{ctx.dataset.project_ids[0]}/archive'))
+def restore_project(ctx, state):
+    return 'PUT', f'/api/projects/{ctx.dataset.project_ids[0]}/restore', {}
+
+
+@scenario('projects.delete_project', setup=new_project, expect=204)
+def delete_project(ctx, project_id):
+    return 'DELETE', f'/api/projects/{project_id}', {}
+
+
+# Sessions
+
+@scenario('sessions.get_sessions')
+def get_sessions(ctx, state):
+    return 'GET', f'/api/sessions?date={ctx.dataset.busiest_date.isoformat()}', {}
+
+
+@scenario('sessions.create_session', expect=201, teardown=delete_created('session', '/api/sessions'))
+def create_session(ctx, state):
+    day = ctx.free_date().isoformat()
+    return 'POST', '/api/sessions', {'json': {
+        'date': day, 'start_time': f'{day}T09:00:00', 'end_time': f'{day}T12:00:00'
+    }}
+
+
+@scenario('sessions.update_session', setup=new_session,
+          teardown=lambda ctx, session, response: ctx.call('DELETE', f"/api/sessions/{session['id']}"))
+def update_session(ctx, session):
+    return 'PUT', f"/api/sessions/{session['id']}", {'json': {'end_time': f"{session['date']}T18:00:00"}}
+
+
+@scenario('sessions.delete_session', setup=new_session, expect=204)
+def delete_session(ctx, session):
+    return 'DELETE', f"/api/sessions/{session['id']}", {}
+
+
+def clock_out_and_delete(ctx, state, response):
+    session = response.get_json()['session']
+    if session['end_time'] is None:
+        ctx.call('POST', '/api/sessions/clock-out', json={'time': f"{session['date']}T17:00:00"})
+    ctx.call('DELETE', f"/api/sessions/{session['id']}")
+
+
+@scenario('sessions.clock_in', expect=201, teardown=clock_out_and_delete)
+def clock_in(ctx, state):
+    return 'POST', '/api/sessions/clock-in', {'json': {'time': f'{ctx.free_date().isoformat()}T09:00:00'}}
+
+
+@scenario('sessions.clock_out', setup=clock_in_state, teardown=clock_out_and_delete)
+def clock_out(ctx, day):
+    return 'POST', '/api/sessions/clock-out', {'json': {'time': f'{day}T17:00:00'}}
+
+
+# Allocations
+
+@scenario('allocations.get_allocations')
+def get_allocations(ctx, state):
+    return 'GET', f'/api/allocations?date={ctx.dataset.busiest_date.isoformat()}', {}
+
+
+@scenario('allocations.create_allocation', setup=lambda ctx: new_session(ctx)['date'], expect=201,
+          teardown=delete_created('allocation', '/api/allocations'))
+def create_allocation(ctx, day):
+    return 'POST', '/api/allocations', {'json': {
+        'date': day, 'project_id': ctx.dataset.project_ids[0], 'hours': 1.5
+    }}
+
+
+def delete_batch(ctx, state, response):
+    for allocation in response.get_json()['allocations']:
+        ctx.call('DELETE', f"/api/allocations/{allocation['id']}")
+
+
+@scenario('allocations.create_allocations_batch', setup=lambda ctx: new_session(ctx)['date'], expect=201,
+          teardown=delete_batch)
+def create_allocations_batch(ctx, day):
+    project_ids = ctx.dataset.project_ids
+    return 'POST', '/api/allocations/batch', {'json': {'allocations': [
+        {'date': day, 'project_id': project_ids[i % len(project_ids)], 'hours': 0.5}
+        for i in range(10)
+    ]}}
+
+
+@scenario('allocations.update_allocation', setup=new_allocation,
+          teardown=lambda ctx, allocation_id, response: ctx.call('DELETE', f'/api/allocations/{allocation_id}'))
+def update_allocation(ctx, allocation_id):
+    return 'PUT', f'/api/allocations/{allocation_id}', {'json': {'hours': 2}}
+
+
+@scenario('allocations.delete_allocation', setup=new_allocation, expect=204)
+def delete_allocation(ctx, allocation_id):
+    return 'DELETE', f'/api/allocations/{allocation_id}', {}
+
+
+# Calendar and reports
+
+@scenario('calendar.get_calendar')
+def get_calendar(ctx, state):
+    return 'GET', f"/api/calendar?month={ctx.dataset.end.strftime('%Y-%m')}", {}
+
+
+@scenario('reports.get_monthly_summary')
+def get_monthly_summary(ctx, state):
+    return 'GET', f'/api/reports/monthly-summary?year={ctx.dataset.end.year}&month={ctx.dataset.end.month}', {}
+
+
+@scenario('reports.get_monthly_summary', name='reports.get_monthly_summary[12 months]')
+def get_monthly_summary_range(ctx, state):
+    start = ctx.dataset.end.replace(year=ctx.dataset.end.year - 1) + timedelta(days=1)
+    return 'GET', (
+        f"/api/reports/monthly-summary?start_month={start.strftime('%Y-%m')}"
+        f"&end_month={ctx.dataset.end.strftime('%Y-%m')}"
+    ), {}
+
+
+@scenario('reports.get_daily_hours')
+def get_daily_hours(ctx, state):
+    start = ctx.dataset.end - timedelta(days=30)
+    return 'GET', f'/api/reports/daily-hours?start_date={start.isoformat()}&end_date={ctx.dataset.end.isoformat()}', {}
+
+
+@scenario('reports.get_daily_summary')
+def get_daily_summary(ctx, state):
+    return 'GET', f'/api/reports/daily-summary?date={ctx.dataset.busiest_date.isoformat()}', {}
+
+
+@scenario('reports.get_summary', name='reports.get_summary[all time]')
+def get_summary(ctx, state):
+    return 'GET', f'/api/reports/summary?start_date={ctx.dataset.start.isoformat()}&end_date={ctx.dataset.end.isoformat()}', {}
+
+
+# Exports and imports
+
+@scenario('exports.export_allocations', name='exports.export_allocations[csv, all time]')
+def export_allocations(ctx, state):
+    return 'GET', (
+        f'/api/exports/allocations?format=csv'
+        f'&start_date={ctx.dataset.start.isoformat()}&end_date={ctx.dataset.end.isoformat()}'
+    ), {}
+
+
+@scenario('exports.export_sessions', name='exports.export_sessions[ndjson, all time]')
+def export_sessions(ctx, state):
+    return 'GET', (
+        f'/api/exports/sessions?format=ndjson'
+        f'&start_date={ctx.dataset.start.isoformat()}&end_date={ctx.dataset.end.isoformat()}'
+    ), {}
+
+
+IMPORT_ROWS = 200
+
+
+@scenario('imports.import_timesheet', name='imports.import_timesheet[toggl dry run]')
+def import_timesheet(ctx, state):
+    lines = ['Client,Project,Description,Start date,Start time,End date,End time']
+    day = ctx.dataset.end
+    for _ in range(IMPORT_ROWS):
+        day += timedelta(days=1)
+        lines.append(f'Client 000,Project 0000,Work,{day},09:00:00,{day},12:30:00')
+    return 'POST', '/api/imports?format=toggl&dry_run=true', {
+        'data': {'file': (io.BytesIO('\n'.join(lines).encode()), 'toggl.csv')},
+        'content_type': 'multipart/form-data'
+    }
+
+
+# Other
+
+@scenario('metrics.get_metrics')
+def get_metrics(ctx, state):
+    return 'GET', '/metrics', {}
+
+
+@scenario('serve_react')
+def serve_react(ctx, state):
+    return 'GET', '/', {}
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_once(ctx, entry):
+    """Run one scenario request; return (seconds, queries, response)."""
+    state = entry.setup(ctx) if entry.setup else None
+    method, path, kwargs = entry.request(ctx, state)
+    with count_queries(ctx.app) as counter:
+        started = time.perf_counter()
+        response = ctx.client.open(path, method=method, **kwargs)
+        response.get_data()  # Drain streamed bodies inside the timing
+        elapsed = time.perf_counter() - started
+    assert response.status_code == entry.expect, (
+        entry.name, response.status_code, response.get_data(as_text=True)[:500]
+    )
+    if entry.teardown:
+        entry.teardown(ctx, state, response)
+    return elapsed, counter.count, response
+
+
+def measure(ctx, entry, repeat):
+    run_once(ctx, entry)  # Warm-up run, discarded
+
+    latencies, queries = [], []
+    for _ in range(repeat):
+        elapsed, count, _ = run_once(ctx, entry)
+        latencies.append(elapsed * 1000)
+        queries.append(count)
+
+    tracemalloc.start()
+    try:
+        run_once(ctx, entry)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'endpoint': entry.endpoint,
+        'scenario': entry.name,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'queries': statistics.median_low(queries),
+        'queries_max': max(queries),
+        'peak_kib': round(peak / 1024, 1)
+    }
+
+
+def available_scenarios(app):
+    """Scenarios whose endpoint exists here, and endpoints without a scenario."""
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules()}
+    if app.extensions['static_assets'].index is None:
+        endpoints.discard('serve_react')  # No frontend build to serve
+    entries = [entry for entry in SCENARIOS if entry.endpoint in endpoints]
+    uncovered = sorted(endpoints - {entry.endpoint for entry in entries})
+    return entries, uncovered
+
+
+def run_database(database, database_url, size_name, repeat, seed):
+    # Real bcrypt cost, so auth.login measures what production pays
+    app = create_benchmark_app(database_url, bcrypt_rounds=12)
+
+    seed_started = time.perf_counter()
+    dataset = generate(app, SIZES[size_name], seed=seed)
+    print(f"[{database}/{size_name}] seeded {dataset.counts} in {time.perf_counter() - seed_started:.1f}s",
+          file=sys.stderr)
+
+    ctx = Context(app, dataset)
+    entries, uncovered = available_scenarios(app)
+    if uncovered:
+        print(f"[{database}/{size_name}] no scenario for: {', '.join(uncovered)}", file=sys.stderr)
+
+    results = []
+    for entry in entries:
+        result = measure(ctx, entry, repeat)
+        results.append(result)
+        print(f"{database:<10} {size_name:<7} {entry.name:<48} {result['p50_ms']:>9.2f} "
+              f"{result['p95_ms']:>9.2f} {result['queries']:>5} {result['peak_kib']:>9.1f}")
+
+    return {
+        'database': database,
+        'size': size_name,
+        'rows': dataset.counts,
+        'uncovered': uncovered,
+        'results': results
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='small,medium', help=f"Comma-separated sizes from: {', '.join(SIZES)}")
+    parser.add_argument('--databases', default='sqlite', help='Comma-separated: sqlite, postgresql')
+    parser.add_argument('--postgres-url', default=os.environ.get('BENCHMARK_POSTGRES_URL'),
+                        help='Scratch PostgreSQL database URL (its tables are dropped)')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per scenario')
+    parser.add_argument('--seed', type=int, default=0, help='Data generator seed')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    sizes = args.sizes.split(',')
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown size: {', '.join(unknown)}")
+
+    databases = args.databases.split(',')
+    for database in databases:
+        if database not in ('sqlite', 'postgresql'):
+            parser.error(f'unknown database: {database}')
+        if database == 'postgresql' and not args.postgres_url:
+            parser.error('postgresql needs --postgres-url or BENCHMARK_POSTGRES_URL')
+
+    print(f"{'database':<10} {'size':<7} {'scenario':<48} {'p50 ms':>9} {'p95 ms':>9} {'sql':>5} {'peak KiB':>9}")
+    runs = []
+    for database in databases:
+        for size_name in sizes:
+            database_url = args.postgres_url if database == 'postgresql' else None
+            runs.append(run_database(database, database_url, size_name, args.repeat, args.seed))
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'repeat': args.repeat,
+            'seed': args.seed
+        },
+        'runs': runs
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Wrote {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,8 +2,12 @@ import apiClient from './client'
 import type { AuthCheckResponse, AuthLoginResponse } from '../types'
 
 export const authApi = {
-  login: async (password: string): Promise<AuthLoginResponse> => {
-    const response = await apiClient.post<AuthLoginResponse>('/auth/login', { password })
+  login: async (username: string, password: string): Promise<AuthLoginResponse> => {
+    // Without a username the server logs in as its default user
+    const response = await apiClient.post<AuthLoginResponse>('/auth/login', {
+      username: username.trim() || undefined,
+      password,
+    })
     return response.data
   },
 
@@ -1,11 +1,14 @@
 import { createContext, useContext, useState, useEffect, ReactNode } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
 import { authApi } from '../api/auth'
-import type { AuthLoginResponse } from '../types'
+import type { AuthLoginResponse, AuthUser } from '../types'
 
 interface AuthContextType {
   isAuthenticated: boolean
   isLoading: boolean
-  login: (password: string) => Promise<AuthLoginResponse>
+  user: AuthUser | null
+  liveUpdates: boolean
+  login: (username: string, password: string) => Promise<AuthLoginResponse>
   logout: () => Promise<void>
 }
 
@@ -18,6 +21,9 @@ interface AuthProviderProps {
 export function AuthProvider({ children }: AuthProviderProps) {
   const [isAuthenticated, setIsAuthenticated] = useState(false)
   const [isLoading, setIsLoading] = useState(true)
+  const [user, setUser] = useState<AuthUser | null>(null)
+  const [liveUpdates, setLiveUpdates] = useState(false)
+  const queryClient = useQueryClient()
 
   useEffect(() => {
     checkAuthStatus()
@@ -27,27 +33,38 @@ export function AuthProvider({ children }: AuthProviderProps) {
     try {
       const data = await authApi.checkAuth()
       setIsAuthenticated(data.authenticated)
+      setUser(data.user)
+      setLiveUpdates(data.live_updates)
     } catch {
       setIsAuthenticated(false)
+      setUser(null)
     } finally {
       setIsLoading(false)
     }
   }
 
-  const login = async (password: string): Promise<AuthLoginResponse> => {
-    const data = await authApi.login(password)
+  const login = async (username: string, password: string): Promise<AuthLoginResponse> => {
+    const data = await authApi.login(username, password)
+    // Never show data cached for whoever was logged in before
+    queryClient.clear()
     setIsAuthenticated(true)
+    setUser(data.user)
+    setLiveUpdates(data.live_updates)
     return data
   }
 
   const logout = async (): Promise<void> => {
     await authApi.logout()
+    queryClient.clear()
     setIsAuthenticated(false)
+    setUser(null)
   }
 
   const value: AuthContextType = {
     isAuthenticated,
     isLoading,
+    user,
+    liveUpdates,
     login,
     logout,
   }
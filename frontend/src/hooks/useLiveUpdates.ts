@@ -0,0 +1,73 @@
+import { useEffect } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
+import { useAuth } from '../context/AuthContext'
+
+const LIVE_EVENTS = [
+  'session.started',
+  'session.stopped',
+  'session.created',
+  'session.updated',
+  'session.deleted',
+  'allocation.created',
+  'allocation.updated',
+  'allocation.deleted',
+]
+
+const POLL_INTERVAL_MS = 30000
+
+/**
+ * Keeps tracker queries fresh from the /api/stream Server-Sent Events feed,
+ * so changes made in another tab or device show up without a reload.
+ *
+ * Each event names the day it touched; only that day's sessions, allocations
+ * and daily summary are refetched. On reconnect everything is refetched,
+ * since events sent while disconnected may have been missed.
+ *
+ * When the server does not stream (its workers would pin a thread per open
+ * stream), visible tabs refetch every POLL_INTERVAL_MS instead.
+ */
+export function useLiveUpdates() {
+  const queryClient = useQueryClient()
+  const { liveUpdates } = useAuth()
+
+  useEffect(() => {
+    const refetchAll = () => {
+      queryClient.invalidateQueries({ queryKey: ['sessions'] })
+      queryClient.invalidateQueries({ queryKey: ['allocations'] })
+      queryClient.invalidateQueries({ queryKey: ['dailySummary'] })
+    }
+
+    if (!liveUpdates) {
+      const timer = window.setInterval(() => {
+        if (document.visibilityState === 'visible') {
+          refetchAll()
+        }
+      }, POLL_INTERVAL_MS)
+      return () => window.clearInterval(timer)
+    }
+
+    const source = new EventSource('/api/stream', { withCredentials: true })
+    // The page has just fetched; only reconnects need to catch up
+    let connected = false
+
+    const handleReady = () => {
+      if (!connected) {
+        connected = true
+        return
+      }
+      refetchAll()
+    }
+
+    const handleChange = (event: MessageEvent<string>) => {
+      const { date } = JSON.parse(event.data) as { date: string }
+      queryClient.invalidateQueries({ queryKey: ['sessions', date] })
+      queryClient.invalidateQueries({ queryKey: ['allocations', date] })
+      queryClient.invalidateQueries({ queryKey: ['dailySummary', date] })
+    }
+
+    source.addEventListener('ready', handleReady)
+    LIVE_EVENTS.forEach((name) => source.addEventListener(name, handleChange))
+
+    return () => source.close()
+  }, [queryClient, liveUpdates])
+}
@@ -5,6 +5,7 @@ import 'react-day-picker/style.css'
 import { useSessions, useClockIn, useClockOut } from '../hooks/useSessions'
 import { useAllocations } from '../hooks/useAllocations'
 import { useDailyTotals } from '../hooks/useDailyTotals'
+import { useLiveUpdates } from '../hooks/useLiveUpdates'
 import SessionsTable from '../components/tracker/SessionsTable'
 import AllocationsList from '../components/tracker/AllocationsList'
 import AddAllocationForm from '../components/tracker/AddAllocationForm'
@@ -36,6 +37,8 @@ export default function DailyTrackerPage() {
     activeSession
   } = useDailyTotals(sessionsData, allocationsData)
 
+  useLiveUpdates()
+
   const clockIn = useClockIn()
   const clockOut = useClockOut()
 
@@ -5,6 +5,7 @@ import Button from '../components/shared/Button'
 import Input from '../components/shared/Input'
 
 export default function LoginPage() {
+  const [username, setUsername] = useState('')
   const [password, setPassword] = useState('')
   const [error, setError] = useState('')
   const [isLoading, setIsLoading] = useState(false)
@@ -17,7 +18,7 @@ export default function LoginPage() {
     setIsLoading(true)
 
     try {
-      await login(password)
+      await login(username, password)
       navigate('/')
     } catch (err: unknown) {
       const error = err as { response?: { data?: { error?: string } } }
@@ -40,7 +41,14 @@ export default function LoginPage() {
           </p>
         </div>
         <form className="mt-8 space-y-6" onSubmit={handleSubmit}>
-          <div className="bg-white shadow-md rounded-lg p-6">
+          <div className="bg-white shadow-md rounded-lg p-6 space-y-4">
+            <Input
+              label="Username"
+              type="text"
+              value={username}
+              onChange={(e) => setUsername(e.target.value)}
+              placeholder="Leave empty for the default user"
+            />
             <Input
               label="Password"
               type="password"
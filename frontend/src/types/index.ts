@@ -95,12 +95,22 @@ export interface SessionResponse {
   session: WorkSession;
 }
 
+export interface AuthUser {
+  id: string;
+  username: string;
+}
+
 export interface AuthCheckResponse {
   authenticated: boolean;
+  user: AuthUser | null;
+  /** Whether the server streams /api/stream; otherwise the client polls */
+  live_updates: boolean;
 }
 
 export interface AuthLoginResponse {
   message: string;
+  user: AuthUser;
+  live_updates: boolean;
 }
 
 // ===========================================
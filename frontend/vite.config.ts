@@ -1,8 +1,43 @@
-import { defineConfig } from 'vite'
+import { readdirSync, readFileSync, writeFileSync } from 'node:fs'
+import { join, resolve } from 'node:path'
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib'
+import { defineConfig, type Plugin } from 'vite'
 import react from '@vitejs/plugin-react'
 
+const COMPRESSIBLE = /\.(js|mjs|css|html|svg|json|txt|map|webmanifest)$/
+const MIN_SIZE = 1024
+
+// Write .br and .gz next to each compressible build file; the backend serves
+// them to clients that accept them, so nothing is compressed per request
+function precompress(): Plugin {
+  let outDir = 'dist'
+  return {
+    name: 'precompress',
+    apply: 'build',
+    configResolved(config) {
+      outDir = resolve(config.root, config.build.outDir)
+    },
+    closeBundle() {
+      const files = readdirSync(outDir, { recursive: true, withFileTypes: true })
+        .filter((entry) => entry.isFile() && COMPRESSIBLE.test(entry.name))
+        .map((entry) => join(entry.parentPath ?? entry.path, entry.name))
+      for (const file of files) {
+        const content = readFileSync(file)
+        if (content.length < MIN_SIZE) continue
+        const variants: [string, Buffer][] = [
+          ['.br', brotliCompressSync(content, { params: { [constants.BROTLI_PARAM_QUALITY]: 11 } })],
+          ['.gz', gzipSync(content, { level: 9 })],
+        ]
+        for (const [suffix, compressed] of variants) {
+          if (compressed.length < content.length) writeFileSync(file + suffix, compressed)
+        }
+      }
+    },
+  }
+}
+
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), precompress()],
   server: {
     proxy: {
       '/api': {
@@ -0,0 +1,41 @@
+"""Add daily_project_hours rollup table
+
+Revision ID: 20261017090000
+Revises: 20260114104957
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017090000'
+down_revision = '20260114104957'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_project_hours',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('project_id', sa.String(length=36), nullable=False),
+    sa.Column('hours', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('date', 'project_id')
+    )
+    with op.batch_alter_table('daily_project_hours', schema=None) as batch_op:
+        batch_op.create_index('idx_daily_project_hours_project', ['project_id'], unique=False)
+
+    # Backfill from existing allocations
+    op.execute(
+        "INSERT INTO daily_project_hours (date, project_id, hours) "
+        "SELECT date, project_id, SUM(hours) FROM time_allocations GROUP BY date, project_id"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('daily_project_hours', schema=None) as batch_op:
+        batch_op.drop_index('idx_daily_project_hours_project')
+
+    op.drop_table('daily_project_hours')
@@ -0,0 +1,35 @@
+"""Add covering indexes for date-range reports
+
+Revision ID: 20261017100000
+Revises: 20261017090000
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017100000'
+down_revision = '20261017090000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (date, project_id, hours) has date as its leading column, so it replaces idx_allocations_date
+    with op.batch_alter_table('time_allocations', schema=None) as batch_op:
+        batch_op.create_index('idx_allocations_date_project_hours', ['date', 'project_id', 'hours'], unique=False)
+        batch_op.drop_index('idx_allocations_date')
+
+    with op.batch_alter_table('daily_project_hours', schema=None) as batch_op:
+        batch_op.create_index('idx_daily_project_hours_covering', ['date', 'project_id', 'hours'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('daily_project_hours', schema=None) as batch_op:
+        batch_op.drop_index('idx_daily_project_hours_covering')
+
+    with op.batch_alter_table('time_allocations', schema=None) as batch_op:
+        batch_op.create_index('idx_allocations_date', ['date'], unique=False)
+        batch_op.drop_index('idx_allocations_date_project_hours')
@@ -0,0 +1,39 @@
+"""Add session overlap index and exclusion constraint
+
+Revision ID: 20261017110000
+Revises: 20261017100000
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017110000'
+down_revision = '20261017100000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (date, start_time, end_time) has date as its leading column, so it replaces idx_sessions_date
+    with op.batch_alter_table('work_sessions', schema=None) as batch_op:
+        batch_op.create_index('idx_sessions_date_start_end', ['date', 'start_time', 'end_time'], unique=False)
+        batch_op.drop_index('idx_sessions_date')
+
+    # PostgreSQL rejects overlapping sessions itself; a NULL end_time is an unbounded range
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE work_sessions ADD CONSTRAINT excl_sessions_no_overlap "
+            "EXCLUDE USING gist (tsrange(start_time, end_time, '[)') WITH &&)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE work_sessions DROP CONSTRAINT excl_sessions_no_overlap")
+
+    with op.batch_alter_table('work_sessions', schema=None) as batch_op:
+        batch_op.create_index('idx_sessions_date', ['date'], unique=False)
+        batch_op.drop_index('idx_sessions_date_start_end')
@@ -0,0 +1,26 @@
+"""Add login_attempts time index for audit log retention
+
+Revision ID: 20261017120000
+Revises: 20261017110000
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017120000'
+down_revision = '20261017110000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('login_attempts', schema=None) as batch_op:
+        batch_op.create_index('idx_login_attempts_time', ['attempted_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('login_attempts', schema=None) as batch_op:
+        batch_op.drop_index('idx_login_attempts_time')
@@ -0,0 +1,30 @@
+"""Add catalog_version counter for the client/project catalog cache
+
+Revision ID: 20261017130000
+Revises: 20261017120000
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017130000'
+down_revision = '20261017120000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 0)")
+
+
+def downgrade():
+    op.drop_table('catalog_version')
@@ -0,0 +1,140 @@
+"""Add users and an owner_id tenant key on all user data
+
+Revision ID: 20261017140000
+Revises: 20261017130000
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+import os
+import uuid
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017140000'
+down_revision = '20261017130000'
+branch_labels = None
+depends_on = None
+
+# Owned tables and their composite index, old and new; new ones lead with owner_id
+OWNED_INDEXES = [
+    ('clients', 'idx_clients_active', ['is_active', 'is_archived'],
+     'idx_clients_owner_active'),
+    ('projects', 'idx_projects_active', ['is_active', 'is_archived'],
+     'idx_projects_owner_active'),
+    ('work_sessions', 'idx_sessions_date_start_end', ['date', 'start_time', 'end_time'],
+     'idx_sessions_owner_date_start_end'),
+    ('time_allocations', 'idx_allocations_date_project_hours', ['date', 'project_id', 'hours'],
+     'idx_allocations_owner_date_project_hours'),
+]
+
+
+def create_daily_project_hours(owned):
+    """Create the rollup table, keyed by (owner_id, date, project_id) when owned."""
+    key = ['owner_id', 'date', 'project_id'] if owned else ['date', 'project_id']
+    columns = [sa.Column('owner_id', sa.String(length=36), nullable=False)] if owned else []
+    foreign_keys = [sa.ForeignKeyConstraint(['owner_id'], ['users.id'], )] if owned else []
+    op.create_table('daily_project_hours',
+    *columns,
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('project_id', sa.String(length=36), nullable=False),
+    sa.Column('hours', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    *foreign_keys,
+    sa.PrimaryKeyConstraint(*key)
+    )
+    with op.batch_alter_table('daily_project_hours', schema=None) as batch_op:
+        batch_op.create_index('idx_daily_project_hours_project', ['project_id'], unique=False)
+        batch_op.create_index('idx_daily_project_hours_covering', key + ['hours'], unique=False)
+
+    group = ', '.join(key)
+    op.execute(
+        f"INSERT INTO daily_project_hours ({group}, hours) "
+        f"SELECT {group}, SUM(hours) FROM time_allocations GROUP BY {group}"
+    )
+
+
+def set_overlap_constraint(columns):
+    """Recreate the PostgreSQL exclusion constraint on work_sessions."""
+    op.execute("ALTER TABLE work_sessions DROP CONSTRAINT IF EXISTS excl_sessions_no_overlap")
+    op.execute(
+        "ALTER TABLE work_sessions ADD CONSTRAINT excl_sessions_no_overlap "
+        f"EXCLUDE USING gist ({columns})"
+    )
+
+
+def upgrade():
+    users = op.create_table('users',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('username', sa.String(length=80), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('username')
+    )
+
+    # Existing data belongs to the user that the single-password login used to be
+    owner_id = str(uuid.uuid4())
+    op.bulk_insert(users, [{
+        'id': owner_id,
+        'username': os.environ.get('DEFAULT_USERNAME', 'admin').strip().lower(),
+        'password_hash': os.environ.get('PASSWORD_HASH', ''),
+        'is_active': True,
+        'created_at': datetime.now(timezone.utc),
+    }])
+
+    for table, old_index, columns, new_index in OWNED_INDEXES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('owner_id', sa.String(length=36), nullable=True))
+        op.execute(sa.text(f"UPDATE {table} SET owner_id = :owner_id").bindparams(owner_id=owner_id))
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('owner_id', existing_type=sa.String(length=36), nullable=False)
+            batch_op.create_foreign_key(f'fk_{table}_owner_id', 'users', ['owner_id'], ['id'])
+            batch_op.create_index(new_index, ['owner_id'] + columns, unique=False)
+            batch_op.drop_index(old_index)
+
+    # The rollup's primary key gains owner_id; rebuild it from allocations
+    op.drop_table('daily_project_hours')
+    create_daily_project_hours(owned=True)
+
+    op.drop_table('catalog_version')
+    catalog_version = op.create_table('catalog_version',
+    sa.Column('owner_id', sa.String(length=36), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    op.bulk_insert(catalog_version, [{'owner_id': owner_id, 'version': 0}])
+
+    # Sessions of different users may overlap; owner_id equality in a gist index needs btree_gist
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        set_overlap_constraint("owner_id WITH =, tsrange(start_time, end_time, '[)') WITH &&")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        set_overlap_constraint("tsrange(start_time, end_time, '[)') WITH &&")
+
+    op.drop_table('catalog_version')
+    op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 0)")
+
+    op.drop_table('daily_project_hours')
+    create_daily_project_hours(owned=False)
+
+    for table, old_index, columns, new_index in reversed(OWNED_INDEXES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(old_index, columns, unique=False)
+            batch_op.drop_index(new_index)
+            batch_op.drop_constraint(f'fk_{table}_owner_id', type_='foreignkey')
+            batch_op.drop_column('owner_id')
+
+    op.drop_table('users')
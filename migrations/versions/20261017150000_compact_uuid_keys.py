@@ -0,0 +1,103 @@
+"""Store UUID keys as native uuid (PostgreSQL) or 16-byte blobs (SQLite)
+
+Revision ID: 20261017150000
+Revises: 20261017140000
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+import uuid
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017150000'
+down_revision = '20261017140000'
+branch_labels = None
+depends_on = None
+
+# Every UUID key and foreign key column, per table
+KEY_COLUMNS = {
+    'users': ['id'],
+    'clients': ['id', 'owner_id'],
+    'projects': ['id', 'client_id', 'owner_id'],
+    'work_sessions': ['id', 'owner_id'],
+    'time_allocations': ['id', 'project_id', 'owner_id'],
+    'daily_project_hours': ['owner_id', 'project_id'],
+    'catalog_version': ['owner_id'],
+    'login_attempts': ['id'],
+}
+
+OVERLAP_CONSTRAINT = (
+    "ALTER TABLE work_sessions ADD CONSTRAINT excl_sessions_no_overlap "
+    "EXCLUDE USING gist (owner_id WITH =, tsrange(start_time, end_time, '[)') WITH &&)"
+)
+
+
+def text_to_blob(value):
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode()
+    return uuid.UUID(value).bytes
+
+
+def blob_to_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return str(uuid.UUID(bytes=value))
+
+
+def convert_sqlite(function, new_type, old_type):
+    """Rewrite every key value with function, then change the declared column types."""
+    # Values first: SQLite stores whatever it is given, whatever the declared type
+    driver_connection = op.get_bind().connection.driver_connection
+    driver_connection.create_function('convert_key', 1, function, deterministic=True)
+    for table, columns in KEY_COLUMNS.items():
+        assignments = ', '.join(f'{column} = convert_key({column})' for column in columns)
+        op.execute(f'UPDATE {table} SET {assignments}')
+
+    for table, columns in KEY_COLUMNS.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, type_=new_type, existing_type=old_type)
+
+
+def convert_postgresql(target_type):
+    """ALTER every key column to target_type, dropping and restoring what depends on it."""
+    inspector = sa.inspect(op.get_bind())
+    foreign_keys = [
+        (table, foreign_key)
+        for table in KEY_COLUMNS
+        for foreign_key in inspector.get_foreign_keys(table)
+    ]
+    for table, foreign_key in foreign_keys:
+        op.drop_constraint(foreign_key['name'], table, type_='foreignkey')
+    op.execute("ALTER TABLE work_sessions DROP CONSTRAINT IF EXISTS excl_sessions_no_overlap")
+
+    for table, columns in KEY_COLUMNS.items():
+        alterations = ', '.join(
+            f'ALTER COLUMN {column} TYPE {target_type} USING {column}::{target_type}' for column in columns
+        )
+        op.execute(f'ALTER TABLE {table} {alterations}')
+
+    op.execute(OVERLAP_CONSTRAINT)
+    for table, foreign_key in foreign_keys:
+        op.create_foreign_key(
+            foreign_key['name'], table, foreign_key['referred_table'],
+            foreign_key['constrained_columns'], foreign_key['referred_columns']
+        )
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        convert_postgresql('uuid')
+    else:
+        convert_sqlite(text_to_blob, sa.LargeBinary(length=16), sa.String(length=36))
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        convert_postgresql('varchar(36)')
+    else:
+        convert_sqlite(blob_to_text, sa.String(length=36), sa.LargeBinary(length=16))
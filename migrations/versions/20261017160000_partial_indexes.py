@@ -0,0 +1,44 @@
+"""Add partial indexes for open sessions and non-archived clients and projects
+
+Revision ID: 20261017160000
+Revises: 20261017150000
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017160000'
+down_revision = '20261017150000'
+branch_labels = None
+depends_on = None
+
+OPEN_SESSION = sa.text('end_time IS NULL')
+UNARCHIVED = sa.column('is_archived', sa.Boolean) == sa.false()
+
+
+def upgrade():
+    # Fails if a user already has two open sessions; close one of them first
+    with op.batch_alter_table('work_sessions', schema=None) as batch_op:
+        batch_op.create_index(
+            'uq_sessions_owner_open', ['owner_id'], unique=True,
+            sqlite_where=OPEN_SESSION, postgresql_where=OPEN_SESSION
+        )
+
+    for table in ('clients', 'projects'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(
+                f'idx_{table}_owner_unarchived', ['owner_id', 'created_at'], unique=False,
+                sqlite_where=UNARCHIVED, postgresql_where=UNARCHIVED
+            )
+
+
+def downgrade():
+    for table in ('projects', 'clients'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(f'idx_{table}_owner_unarchived')
+
+    with op.batch_alter_table('work_sessions', schema=None) as batch_op:
+        batch_op.drop_index('uq_sessions_owner_open')
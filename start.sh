@@ -68,11 +68,33 @@ config[config_name].validate()
 print('Configuration validated successfully')
 "
 
-# Start gunicorn
+# Metrics are aggregated across workers through files in this directory,
+# which must start empty on every boot
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/time-tracker-metrics}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# Rate limit and login throttle counters are shared by all workers through
+# this file, unless RATELIMIT_STORAGE_URI points elsewhere (e.g. redis://)
+export RATELIMIT_STORAGE_URI=${RATELIMIT_STORAGE_URI:-sqlite:////tmp/time-tracker-ratelimit.db}
+
+# An open /api/stream would pin one of a gthread worker's THREADS threads, so
+# live updates stream only on gevent workers (which park them as greenlets,
+# see DEPLOYMENT.md for the SQLite caveat); otherwise the frontend polls.
+if [ "${WORKER_CLASS:-gthread}" = "gevent" ]; then
+    export STREAM_ENABLED=${STREAM_ENABLED:-true}
+else
+    export STREAM_ENABLED=${STREAM_ENABLED:-false}
+fi
+
+# Start gunicorn.
 echo "Starting gunicorn server..."
 exec gunicorn \
+    --config python:backend.gunicorn_conf \
     --bind 0.0.0.0:${PORT:-10000} \
     --workers ${WORKERS:-4} \
+    --worker-class ${WORKER_CLASS:-gthread} \
+    --worker-connections ${WORKER_CONNECTIONS:-100} \
     --threads ${THREADS:-2} \
     --timeout ${TIMEOUT:-120} \
     --access-logfile - \